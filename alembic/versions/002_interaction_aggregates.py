@@ -0,0 +1,40 @@
+"""Add interaction_aggregates table for O(1) interaction stats
+
+Revision ID: 002
+Revises: 001
+Create Date: 2026-10-17
+
+Existing users are aggregated lazily on their next log/stats call; run
+`python -m persona.backfill` (from src/) to aggregate everyone up front.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "002"
+down_revision: Union[str, None] = "001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "interaction_aggregates",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("user_id", sa.String(), nullable=False),
+        sa.Column("total_interactions", sa.Integer(), nullable=True, default=0),
+        sa.Column("scenario_counts", sa.JSON(), nullable=True),
+        sa.Column("emotion_counts", sa.JSON(), nullable=True),
+        sa.Column("mode_counts", sa.JSON(), nullable=True),
+        sa.Column("recent_response_lengths", sa.JSON(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("user_id"),
+    )
+    op.create_index("ix_interaction_aggregates_user_id", "interaction_aggregates", ["user_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_interaction_aggregates_user_id", table_name="interaction_aggregates")
+    op.drop_table("interaction_aggregates")
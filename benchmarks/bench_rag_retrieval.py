@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Benchmark: behavior library retrieval, disk scan vs preloaded index
+
+Compares the old per-call scan (glob + json.load of every library file)
+against the in-memory index used by rag.retriever today.
+
+Usage:
+    python benchmarks/bench_rag_retrieval.py
+"""
+
+import sys
+import os
+import json
+import time
+from pathlib import Path
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from rag import get_library, retrieve_behavior_knowledge, find_relevant_knowledge
+
+
+QUERIES = [
+    "office stress work",
+    "exam stress anxiety",
+    "bhai train late ho gayi frustration friend vent",
+    "My boss keeps giving me impossible deadlines frustration authority advice",
+    "totally unknown scenario xyz",
+]
+
+
+def legacy_retrieve(scenario: str, lib_path: Path) -> dict:
+    """The pre-index retriever: re-reads every JSON file on each call"""
+    scenario_keywords = set(scenario.lower().split())
+    best_match = None
+    best_score = 0
+
+    for json_file in lib_path.glob("*.json"):
+        try:
+            with open(json_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if isinstance(data, list) and len(data) > 0:
+                data = data[0]
+            file_scenario = json_file.stem.replace('_enhanced', '').replace('_', ' ')
+            file_keywords = set(file_scenario.split())
+            if 'scenario' in data:
+                file_keywords.update(data['scenario'].replace('_', ' ').split())
+            matches = len(scenario_keywords & file_keywords)
+            if any(keyword in json_file.stem.lower() for keyword in scenario_keywords):
+                matches += 2
+            if matches > best_score:
+                best_score = matches
+                best_match = data
+        except Exception:
+            continue
+
+    return best_match or {}
+
+
+def time_per_call(func, iterations: int) -> float:
+    """Average wall time per call in microseconds"""
+    start = time.perf_counter()
+    for i in range(iterations):
+        func(QUERIES[i % len(QUERIES)])
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def main():
+    print("=" * 70)
+    print("RAG Retrieval Benchmark")
+    print("=" * 70)
+    print()
+
+    start = time.perf_counter()
+    library = get_library()
+    load_ms = (time.perf_counter() - start) * 1000
+    print(f"Index load (once per process): {load_ms:.1f} ms")
+    print(f"   {len(library)} scenarios, {library.entry_count} entries")
+    print()
+
+    # Sanity check: both implementations agree on the winning scenario
+    for query in QUERIES:
+        old = legacy_retrieve(query, library.path).get('scenario')
+        new = retrieve_behavior_knowledge(query).get('scenario')
+        marker = "✅" if old == new else "⚠️ "
+        print(f"{marker} {query[:50]!r:54} legacy={old} index={new}")
+    print()
+
+    legacy_us = time_per_call(lambda q: legacy_retrieve(q, library.path), 20)
+    index_us = time_per_call(retrieve_behavior_knowledge, 20000)
+    relevant_us = time_per_call(lambda q: find_relevant_knowledge(q, {'primary_emotion': 'anxiety'}), 20000)
+
+    print(f"Legacy disk scan:             {legacy_us / 1000:10.2f} ms/call")
+    print(f"retrieve_behavior_knowledge:  {index_us:10.2f} µs/call")
+    print(f"find_relevant_knowledge:      {relevant_us:10.2f} µs/call")
+    print()
+    print(f"Speedup: {legacy_us / index_us:,.0f}x")
+
+
+if __name__ == "__main__":
+    main()
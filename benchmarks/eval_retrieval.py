@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+Retrieval evaluation on the behavior library
+
+Every library entry is a real user message labelled with its scenario,
+so the library doubles as a test set. This holds out a deterministic
+slice of the example texts, builds each engine from the remaining
+documents only, runs the held-out texts through it and reports:
+
+- top-1 and top-k accuracy (a hit if the prediction is any scenario the
+  text is filed under - some texts appear in several files)
+- no-answer rate (engine returned nothing)
+- per-scenario top-1 recall and the most frequent confusions
+- build time and per-query latency percentiles
+
+The split hashes each text, so it does not depend on file order, stays
+stable as the library grows, and puts identical texts on the same side.
+
+Usage:
+    python benchmarks/eval_retrieval.py                          # all engines
+    python benchmarks/eval_retrieval.py --engines bm25,ngram --k 5
+    python benchmarks/eval_retrieval.py --test-percent 10 --json eval.json
+"""
+
+import sys
+import os
+import json
+import time
+import hashlib
+import argparse
+from collections import Counter
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Sequence, Tuple
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from rag import BM25Index, KeywordIndex, get_library
+from telemetry.histogram import LatencyHistogram
+
+
+DEFAULT_TEST_PERCENT = 20
+DEFAULT_K = 3
+
+
+def _ngram_index(docs):
+    from rag.ngram import NgramIndex  # numpy
+    return NgramIndex(docs)
+
+
+# Engine name -> factory building a searchable index from (scenario, text) docs;
+# the index must provide search(query, k) -> [(scenario, score), ...]
+ENGINES: Dict[str, Callable[[List[Tuple[str, str]]], Any]] = {
+    "keyword": KeywordIndex.from_documents,
+    "bm25": BM25Index,
+    "ngram": _ngram_index,
+}
+
+
+def in_test_split(text: str, test_percent: int) -> bool:
+    """Deterministic hold-out: hash bucket of the text itself"""
+    bucket = int(hashlib.sha1(text.encode("utf-8")).hexdigest()[:8], 16) % 100
+    return bucket < test_percent
+
+
+def split_library(
+    library, test_percent: int = DEFAULT_TEST_PERCENT
+) -> Tuple[List[Tuple[str, str]], List[Tuple[str, FrozenSet[str]]]]:
+    """
+    Split the library's documents into training docs and held-out queries.
+
+    Returns:
+        (train docs as (scenario, text), queries as (text, gold scenarios));
+        descriptor docs always stay in training
+    """
+    gold: Dict[str, set] = {}
+    train = []
+    for scenario, text, is_example in library.documents():
+        if is_example and in_test_split(text, test_percent):
+            gold.setdefault(text, set()).add(scenario)
+        else:
+            train.append((scenario, text))
+    return train, [(text, frozenset(labels)) for text, labels in gold.items()]
+
+
+def evaluate_engine(
+    index, queries: Sequence[Tuple[str, FrozenSet[str]]], k: int = DEFAULT_K
+) -> Dict[str, Any]:
+    """
+    Run held-out queries through one built index.
+
+    Returns:
+        Accuracy, no-answer rate, latency percentiles (ms), per-scenario
+        recall and confusion counts (gold, predicted) for top-1 misses
+    """
+    latency = LatencyHistogram(window=max(len(queries), 1))
+    top1 = topk = no_answer = 0
+    support: Counter = Counter()
+    correct: Counter = Counter()
+    confusion: Counter = Counter()
+
+    for text, labels in queries:
+        start = time.perf_counter()
+        ranked = index.search(text, k)
+        latency.observe((time.perf_counter() - start) * 1000)
+
+        predicted = [scenario for scenario, _ in ranked]
+        support.update(labels)
+        if not predicted:
+            no_answer += 1
+        elif predicted[0] in labels:
+            top1 += 1
+            correct[predicted[0]] += 1
+        else:
+            for label in labels:
+                confusion[(label, predicted[0])] += 1
+        if labels.intersection(predicted):
+            topk += 1
+
+    n = max(len(queries), 1)
+    return {
+        "queries": len(queries),
+        "top1": round(top1 / n, 4),
+        f"top{k}": round(topk / n, 4),
+        "no_answer": round(no_answer / n, 4),
+        "latency_ms": latency.percentiles(50, 95, 99),
+        "per_scenario": {
+            scenario: {"support": count, "top1_recall": round(correct[scenario] / count, 4)}
+            for scenario, count in sorted(support.items())
+        },
+        "confusion": [[gold, predicted, count] for (gold, predicted), count in confusion.most_common()],
+    }
+
+
+def run_evaluation(
+    library,
+    engines: Sequence[str],
+    test_percent: int = DEFAULT_TEST_PERCENT,
+    k: int = DEFAULT_K,
+    limit: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Build every engine on the training split and evaluate it on the held-out texts.
+
+    Raises:
+        ValueError: If an engine name is not in ENGINES
+    """
+    unknown = [name for name in engines if name not in ENGINES]
+    if unknown:
+        raise ValueError(f"Unknown engine(s) {unknown}. Expected some of {list(ENGINES)}")
+
+    train, queries = split_library(library, test_percent)
+    if limit is not None:
+        queries = queries[:limit]
+
+    results = {}
+    for name in engines:
+        start = time.perf_counter()
+        index = ENGINES[name](train)
+        build_ms = (time.perf_counter() - start) * 1000
+        results[name] = {"build_ms": round(build_ms, 1), **evaluate_engine(index, queries, k)}
+
+    return {
+        "library_version": library.version,
+        "test_percent": test_percent,
+        "k": k,
+        "train_docs": len(train),
+        "queries": len(queries),
+        "engines": results,
+    }
+
+
+def print_report(report: Dict[str, Any], confusions: int = 10) -> None:
+    k = report["k"]
+    print("=" * 70)
+    print(f"Retrieval evaluation (library {report['library_version']}, "
+          f"{report['test_percent']}% held out)")
+    print("=" * 70)
+    print(f"{report['train_docs']} training docs, {report['queries']} held-out queries")
+    print()
+    print(f"{'engine':10} {'top1':>7} {f'top{k}':>7} {'none':>7} {'build':>9} "
+          f"{'p50':>9} {'p95':>9} {'p99':>9}")
+    for name, result in report["engines"].items():
+        lat = result["latency_ms"]
+        print(f"{name:10} {result['top1']:7.1%} {result[f'top{k}']:7.1%} {result['no_answer']:7.1%} "
+              f"{result['build_ms']:7.0f}ms {lat['p50']:7.3f}ms {lat['p95']:7.3f}ms {lat['p99']:7.3f}ms")
+
+    for name, result in report["engines"].items():
+        print()
+        print(f"--- {name}: weakest scenarios (top-1 recall) ---")
+        weakest = sorted(result["per_scenario"].items(),
+                         key=lambda item: (item[1]["top1_recall"], -item[1]["support"]))
+        for scenario, stats in weakest[:5]:
+            print(f"   {scenario:28} {stats['top1_recall']:6.1%}  (n={stats['support']})")
+        print(f"--- {name}: most frequent confusions ---")
+        for gold, predicted, count in result["confusion"][:confusions]:
+            print(f"   {gold:28} -> {predicted:28} {count:4}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Evaluate retrieval engines on held-out library texts")
+    parser.add_argument("--engines", default=",".join(ENGINES),
+                        help=f"Comma-separated engines (default: {','.join(ENGINES)})")
+    parser.add_argument("--test-percent", type=int, default=DEFAULT_TEST_PERCENT,
+                        help="Share of example texts held out (default: 20)")
+    parser.add_argument("--k", type=int, default=DEFAULT_K, help="Top-k accuracy cutoff (default: 3)")
+    parser.add_argument("--limit", type=int, help="Evaluate at most this many held-out texts")
+    parser.add_argument("--confusions", type=int, default=10, help="Confusion pairs shown per engine")
+    parser.add_argument("--json", metavar="PATH", help="Also write the full report as JSON")
+    args = parser.parse_args()
+
+    engines = [name.strip() for name in args.engines.split(",") if name.strip()]
+    try:
+        report = run_evaluation(get_library(), engines, args.test_percent, args.k, args.limit)
+    except ValueError as e:
+        raise SystemExit(str(e))
+
+    print_report(report, args.confusions)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"\nWrote {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+Fake OpenRouter: a local stand-in for the chat-completions API
+
+Speaks enough of the OpenAI chat-completions protocol for the Buddy
+pipeline (JSON and streamed completions) so it can be load-tested
+without spending API quota or depending on remote latency.
+
+Responses are recognised by their system prompt:
+- social analysis  -> SocialAnalysis JSON from the offline lexicon analyzer
+- behavior policy  -> BehaviorPolicy JSON from the policy rules
+- fused            -> {"analysis": ..., "policy": ...}
+- anything else    -> a canned Buddy reply (streamed word by word if asked)
+
+Every response waits for a sample from the configured latency
+distribution; streams wait for it before the first chunk and then
+--token-delay-ms between chunks.
+
+Usage:
+    python benchmarks/fake_openrouter.py --port 9000 --latency lognormal:800:0.4
+    OPENROUTER_BASE_URL=http://127.0.0.1:9000/api/v1 OPENROUTER_API_KEY=fake python main.py
+
+Latency specs (milliseconds):
+    fixed:MS                e.g. fixed:500
+    uniform:LOW:HIGH        e.g. uniform:200:1200
+    lognormal:MEDIAN:SIGMA  e.g. lognormal:800:0.4 (heavy right tail, like real LLMs)
+"""
+
+import sys
+import os
+import json
+import time
+import uuid
+import random
+import asyncio
+import argparse
+from typing import Callable, Optional
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+from extractors.lexicon import classify_social_context
+from extractors.fused import FUSED_HEADER
+from policy_engine.rules import decide_policy_by_rules
+
+
+CANNED_REPLY = (
+    "Arre yaar, that sounds rough. Take a breath first - you don't have to "
+    "sort all of it right now. Want to tell me what bugged you the most?"
+)
+
+
+def parse_latency(spec: str) -> Callable[[], float]:
+    """
+    Parse a latency spec into a sampler returning milliseconds.
+
+    Raises:
+        ValueError: If the spec is not fixed/uniform/lognormal with numbers
+    """
+    kind, _, rest = spec.partition(":")
+    try:
+        params = [float(p) for p in rest.split(":")] if rest else []
+    except ValueError:
+        raise ValueError(f"Invalid latency spec {spec!r}")
+
+    if kind == "fixed" and len(params) == 1:
+        return lambda: params[0]
+    if kind == "uniform" and len(params) == 2:
+        low, high = params
+        return lambda: random.uniform(low, high)
+    if kind == "lognormal" and len(params) == 2:
+        median, sigma = params
+        return lambda: median * random.lognormvariate(0, sigma)
+    raise ValueError(f"Invalid latency spec {spec!r} (use fixed:MS, uniform:LOW:HIGH or lognormal:MEDIAN:SIGMA)")
+
+
+def _classify_prompt(messages: list) -> str:
+    """Which pipeline stage a request comes from, by its system prompt"""
+    system = next((m.get("content") or "" for m in messages if m.get("role") == "system"), "")
+    if system.startswith(FUSED_HEADER[:40]):
+        return "fused"
+    if system.startswith("You analyze emotional and social context"):
+        return "analysis"
+    if system.startswith("You are deciding HOW an AI buddy should respond"):
+        return "policy"
+    return "compose"
+
+
+def _last_user_message(messages: list) -> str:
+    return next((m.get("content") or "" for m in reversed(messages) if m.get("role") == "user"), "")
+
+
+def _policy_context(analysis: dict) -> dict:
+    return {
+        "emotion": analysis["primary_emotion"],
+        "user_need": analysis["user_need"],
+        "relationship": analysis["relationship"],
+        "conflict_risk": analysis["conflict_risk"],
+        "intensity": analysis["intensity"],
+    }
+
+
+def canned_content(kind: str, user_message: str) -> str:
+    """Response body for one stage; JSON stages are derived from the message"""
+    if kind == "analysis":
+        return classify_social_context(user_message).analysis.model_dump_json()
+    if kind == "policy":
+        try:
+            context = json.loads(user_message.split("\n", 1)[1])
+        except (IndexError, ValueError):
+            context = {}
+        return decide_policy_by_rules(context).policy.model_dump_json()
+    if kind == "fused":
+        analysis = classify_social_context(user_message).analysis.model_dump()
+        policy = decide_policy_by_rules(_policy_context(analysis)).policy.model_dump()
+        return json.dumps({"analysis": analysis, "policy": policy})
+    return CANNED_REPLY
+
+
+def _completion(model: str, content: str) -> dict:
+    return {
+        "id": f"chatcmpl-{uuid.uuid4().hex[:24]}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [{
+            "index": 0,
+            "message": {"role": "assistant", "content": content},
+            "finish_reason": "stop",
+        }],
+        "usage": {"prompt_tokens": 0, "completion_tokens": len(content.split()), "total_tokens": len(content.split())},
+    }
+
+
+def _chunk(completion_id: str, model: str, delta: dict, finish_reason: Optional[str] = None) -> str:
+    payload = {
+        "id": completion_id,
+        "object": "chat.completion.chunk",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+    }
+    return f"data: {json.dumps(payload)}\n\n"
+
+
+def create_app(latency: str = "fixed:0", token_delay_ms: float = 0.0, error_rate: float = 0.0) -> FastAPI:
+    """
+    Build the fake API app.
+
+    Args:
+        latency: Latency spec for each completion (see module docstring)
+        token_delay_ms: Delay between streamed chunks
+        error_rate: Fraction of requests answered with HTTP 500
+    """
+    sample_latency = parse_latency(latency)
+    app = FastAPI(title="Fake OpenRouter")
+    app.state.requests = {"analysis": 0, "policy": 0, "fused": 0, "compose": 0}
+
+    async def chat_completions(request: Request):
+        body = await request.json()
+        messages = body.get("messages") or []
+        model = body.get("model", "fake-model")
+        kind = _classify_prompt(messages)
+        app.state.requests[kind] += 1
+
+        await asyncio.sleep(max(0.0, sample_latency()) / 1000)
+
+        if error_rate and random.random() < error_rate:
+            raise HTTPException(status_code=500, detail="injected failure")
+
+        content = canned_content(kind, _last_user_message(messages))
+        if not body.get("stream"):
+            return JSONResponse(_completion(model, content))
+
+        async def events():
+            completion_id = f"chatcmpl-{uuid.uuid4().hex[:24]}"
+            yield _chunk(completion_id, model, {"role": "assistant", "content": ""})
+            words = content.split(" ")
+            for i, word in enumerate(words):
+                if i and token_delay_ms:
+                    await asyncio.sleep(token_delay_ms / 1000)
+                yield _chunk(completion_id, model, {"content": word if i == 0 else " " + word})
+            yield _chunk(completion_id, model, {}, finish_reason="stop")
+            yield "data: [DONE]\n\n"
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    # Accept both the OpenRouter path and a bare OpenAI-style base URL
+    for path in ("/api/v1/chat/completions", "/v1/chat/completions", "/chat/completions"):
+        app.add_api_route(path, chat_completions, methods=["POST"])
+
+    @app.get("/stats")
+    async def stats():
+        """Completions served per stage"""
+        return app.state.requests
+
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local fake OpenRouter chat-completions server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9000)
+    parser.add_argument("--latency", default="lognormal:800:0.4", help="Completion latency spec in ms")
+    parser.add_argument("--token-delay-ms", type=float, default=15.0, help="Delay between streamed chunks")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests failing with 500")
+    args = parser.parse_args()
+
+    parse_latency(args.latency)  # Fail fast on a bad spec
+
+    import uvicorn
+
+    print("=" * 70)
+    print("Fake OpenRouter")
+    print("=" * 70)
+    print(f"   Base URL: http://{args.host}:{args.port}/api/v1")
+    print(f"   Latency: {args.latency}, token delay {args.token_delay_ms} ms, error rate {args.error_rate}")
+    print("=" * 70)
+
+    uvicorn.run(
+        create_app(args.latency, args.token_delay_ms, args.error_rate),
+        host=args.host,
+        port=args.port,
+        log_level="warning"
+    )
+
+
+if __name__ == "__main__":
+    main()
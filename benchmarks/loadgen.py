@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Load generator for the Buddy API
+
+Drives POST /chat and/or POST /chat/whatsapp at a fixed target rate
+(open loop: requests start on schedule whether or not earlier ones have
+finished, so a slow server shows up as latency instead of a lower send
+rate) and reports throughput plus p50/p95/p99 latency per endpoint and
+per pipeline stage (from the response `timings`).
+
+Usage:
+    # Terminal 1: fake model API
+    python benchmarks/fake_openrouter.py --port 9000
+    # Terminal 2: the app, pointed at it
+    OPENROUTER_BASE_URL=http://127.0.0.1:9000/api/v1 OPENROUTER_API_KEY=fake uvicorn main:app --port 8000
+    # Terminal 3
+    python benchmarks/loadgen.py --url http://127.0.0.1:8000 --rps 20 --duration 30 --endpoint mixed
+"""
+
+import sys
+import os
+import json
+import time
+import asyncio
+import argparse
+from typing import Dict, List, Optional, Tuple
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import httpx
+
+from telemetry.histogram import LatencyHistogram
+
+
+MESSAGES = [
+    "bhai train late ho gayi, 2 ghante se platform pe baitha hoon",
+    "My boss keeps giving me impossible deadlines and I can't say no",
+    "exam kal hai aur kuch yaad nahi ho raha, bahut tension hai",
+    "Got the job offer!! can't believe it yaar",
+    "so bored waiting at the airport, flight delayed again",
+    "should I take the Bangalore offer or stay in Pune with family?",
+    "my friend ignored my messages all week, kinda hurt tbh",
+    "landlord is refusing to return the deposit, kya karun",
+]
+
+WHATSAPP_CHAT = """12/01/24, 9:15 pm - Rahul: bro where are you
+12/01/24, 9:16 pm - Me: stuck in traffic yaar
+12/01/24, 9:20 pm - Rahul: everyone is waiting, again late?
+12/01/24, 9:21 pm - Me: I left on time, this jam is insane"""
+
+ENDPOINTS = ("chat", "whatsapp", "mixed")
+
+
+def build_request(endpoint: str, i: int) -> Tuple[str, dict]:
+    """Path and JSON body for the i-th request"""
+    user_id = f"load_user_{i % 50}"
+    if endpoint == "mixed":
+        endpoint = "whatsapp" if i % 5 == 4 else "chat"
+    if endpoint == "whatsapp":
+        return "/chat/whatsapp", {"user_id": user_id, "chat_text": WHATSAPP_CHAT}
+    return "/chat", {"user_id": user_id, "message": MESSAGES[i % len(MESSAGES)]}
+
+
+class Results:
+    """Latency histograms and counters for one run"""
+
+    def __init__(self, window: int):
+        self.window = window
+        self.latency: Dict[str, LatencyHistogram] = {}
+        self.stages: Dict[str, LatencyHistogram] = {}
+        self.status: Dict[str, int] = {}
+        self.fallbacks = 0
+
+    def _hist(self, table: Dict[str, LatencyHistogram], name: str) -> LatencyHistogram:
+        if name not in table:
+            table[name] = LatencyHistogram(window=self.window)
+        return table[name]
+
+    def record(self, path: str, status: str, elapsed_ms: float, body: Optional[dict]) -> None:
+        self.status[status] = self.status.get(status, 0) + 1
+        self._hist(self.latency, path).observe(elapsed_ms)
+        if body:
+            if body.get("error"):
+                self.fallbacks += 1
+            for stage, ms in (body.get("timings") or {}).items():
+                self._hist(self.stages, stage).observe(ms)
+
+
+async def _send(client: httpx.AsyncClient, path: str, body: dict, results: Results,
+                semaphore: asyncio.Semaphore) -> None:
+    # Clock starts before the concurrency cap, so client-side queueing counts as latency
+    start = time.perf_counter()
+    async with semaphore:
+        try:
+            response = await client.post(path, json=body)
+            status = str(response.status_code)
+            try:
+                payload = response.json()
+            except ValueError:
+                payload = None
+        except httpx.HTTPError as e:
+            status, payload = type(e).__name__, None
+        results.record(path, status, (time.perf_counter() - start) * 1000, payload)
+
+
+async def run(url: str, rps: float, duration: float, endpoint: str, max_in_flight: int,
+              timeout: float) -> Tuple[Results, float, int]:
+    """
+    Send requests at `rps` for `duration` seconds, then wait for stragglers.
+
+    Returns:
+        (results, wall seconds until the last response, requests sent)
+    """
+    total = max(1, int(rps * duration))
+    results = Results(window=total)
+    semaphore = asyncio.Semaphore(max_in_flight)
+    limits = httpx.Limits(max_connections=max_in_flight, max_keepalive_connections=max_in_flight)
+
+    async with httpx.AsyncClient(base_url=url, timeout=timeout, limits=limits) as client:
+        start = time.perf_counter()
+        tasks: List[asyncio.Task] = []
+        for i in range(total):
+            delay = start + i / rps - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            path, body = build_request(endpoint, i)
+            tasks.append(asyncio.create_task(_send(client, path, body, results, semaphore)))
+        await asyncio.gather(*tasks)
+        elapsed = time.perf_counter() - start
+
+    return results, elapsed, total
+
+
+def report(results: Results, elapsed: float, sent: int, rps: float) -> dict:
+    """Print the summary table and return it as a dict"""
+    ok = results.status.get("200", 0)
+    summary = {
+        "sent": sent,
+        "target_rps": rps,
+        "wall_s": round(elapsed, 2),
+        "throughput_rps": round(ok / elapsed, 2) if elapsed else 0.0,
+        "status": dict(sorted(results.status.items())),
+        "fallback_replies": results.fallbacks,
+        "endpoints": {path: h.snapshot() for path, h in sorted(results.latency.items())},
+        "stages": {stage: h.snapshot() for stage, h in sorted(results.stages.items())},
+    }
+
+    print("=" * 70)
+    print("Load Test Results")
+    print("=" * 70)
+    print(f"Sent {sent} requests at {rps:g} rps target in {elapsed:.1f}s "
+          f"-> {summary['throughput_rps']} successful rps")
+    print(f"Status: {summary['status']}   fallback replies: {results.fallbacks}")
+    print()
+    print(f"{'':24} {'count':>6} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+    for title, table in (("Endpoint", summary["endpoints"]), ("Stage (server timings)", summary["stages"])):
+        print(title)
+        for name, snap in table.items():
+            print(f"  {name:22} {snap['count']:>6} {snap['p50_ms']:>9.1f} {snap['p95_ms']:>9.1f} "
+                  f"{snap['p99_ms']:>9.1f} {snap['max_ms']:>9.1f}")
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Open-loop load generator for /chat and /chat/whatsapp")
+    parser.add_argument("--url", default="http://127.0.0.1:8000", help="Buddy API base URL")
+    parser.add_argument("--rps", type=float, default=10.0, help="Target requests per second")
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds to send for")
+    parser.add_argument("--endpoint", choices=ENDPOINTS, default="chat",
+                        help="chat, whatsapp, or mixed (1 in 5 whatsapp)")
+    parser.add_argument("--max-in-flight", type=int, default=256, help="Concurrency cap")
+    parser.add_argument("--timeout", type=float, default=120.0, help="Per-request timeout in seconds")
+    parser.add_argument("--json", metavar="PATH", help="Also write the summary as JSON")
+    args = parser.parse_args()
+
+    if args.rps <= 0 or args.duration <= 0:
+        parser.error("--rps and --duration must be positive")
+
+    results, elapsed, sent = asyncio.run(
+        run(args.url, args.rps, args.duration, args.endpoint, args.max_in_flight, args.timeout)
+    )
+    summary = report(results, elapsed, sent, args.rps)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2)
+        print(f"\nSaved summary to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,452 @@
+#!/usr/bin/env python3
+"""
+Microbenchmarks for the non-LLM hot paths
+
+Times the code that runs on every request besides the model calls:
+RAG retrieval, WhatsApp parsing (small, 1 MB and 50 MB exports),
+composer prompt assembly and the persona database functions (against a
+throwaway local SQLite database unless BENCH_DATABASE_URL is set).
+
+Each benchmark is calibrated to run for at least --min-time seconds per
+repeat; the median of --repeat repeats is reported per call. Results
+can be saved as a baseline and later checked against it: any benchmark
+slower than baseline * (1 + threshold) fails the run (exit code 1).
+
+Baselines are machine-specific - save one on the machine that checks it.
+
+Usage:
+    python benchmarks/microbench.py                      # run and print
+    python benchmarks/microbench.py --save               # store baselines.json
+    python benchmarks/microbench.py --check              # fail on regression
+    python benchmarks/microbench.py --check --threshold 0.5 --filter whatsapp
+    python benchmarks/microbench.py --skip-large         # no 50 MB export
+
+Configuration (environment variables):
+    BENCH_DATABASE_URL   Database for the persona benchmarks (default: temp SQLite)
+    BENCH_THRESHOLD      Default allowed slowdown for --check (default: 0.25)
+"""
+
+import sys
+import os
+import json
+import time
+import random
+import argparse
+import platform
+import statistics
+import tempfile
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+
+BASELINE_PATH = Path(__file__).parent / "baselines.json"
+DEFAULT_THRESHOLD = float(os.getenv("BENCH_THRESHOLD", "0.25"))
+
+# name -> (setup, large); setup() returns the zero-argument callable to time
+BENCHMARKS: Dict[str, Tuple[Callable[[], Callable[[], Any]], bool]] = {}
+
+
+def benchmark(name: str, large: bool = False):
+    """Register a benchmark setup function under `name`"""
+    def register(setup: Callable[[], Callable[[], Any]]):
+        BENCHMARKS[name] = (setup, large)
+        return setup
+    return register
+
+
+# ---------------------------------------------------------------------------
+# Fixtures
+# ---------------------------------------------------------------------------
+
+_SENDERS = ["Rahul", "Priya", "+91 98765 43210", "Mom", "Manager"]
+_LINES = [
+    "bhai train late ho gayi phir se",
+    "kal ka plan cancel? seriously yaar",
+    "I told you the deadline was Friday",
+    "haan theek hai, will call you later",
+    "image omitted",
+    "Can we talk about the project tomorrow morning?",
+    "lol 😂😂",
+    "Messages and calls are end-to-end encrypted",
+]
+
+
+def make_whatsapp_export(size_bytes: int, seed: int = 7) -> str:
+    """Deterministic Android/iOS-style export of roughly `size_bytes`"""
+    rng = random.Random(seed)
+    parts: List[str] = []
+    total = 0
+    while total < size_bytes:
+        day, hour, minute = rng.randint(1, 28), rng.randint(0, 23), rng.randint(0, 59)
+        sender = rng.choice(_SENDERS)
+        if rng.random() < 0.5:
+            line = f"{day:02d}/01/2024, {hour:02d}:{minute:02d} - {sender}: {rng.choice(_LINES)}"
+        else:
+            line = f"[{day}/1/24, {hour % 12 + 1}:{minute:02d}:00 PM] {sender}: {rng.choice(_LINES)}"
+        if rng.random() < 0.1:
+            line += "\n" + rng.choice(_LINES)  # Multi-line message
+        parts.append(line)
+        total += len(line) + 1
+    return "\n".join(parts)
+
+
+ANALYSIS = {
+    "primary_emotion": "frustration",
+    "intensity": 7,
+    "user_need": "vent",
+    "relationship": "authority",
+    "conflict_risk": "medium",
+}
+
+POLICY = {
+    "mode": "diplomatic_advisor",
+    "tone": "respectful_formal",
+    "humor_level": 0,
+    "message_length": "medium",
+    "initiative": "medium",
+    "give_action_steps": True,
+    "ask_followup_question": True,
+}
+
+QUERY = "My boss keeps giving me impossible deadlines and yells in meetings"
+
+
+# ---------------------------------------------------------------------------
+# Benchmarks
+# ---------------------------------------------------------------------------
+
+@benchmark("rag.retrieve_behavior_knowledge")
+def _bench_retrieve():
+    from rag import get_library, retrieve_behavior_knowledge
+    get_library()
+    return lambda: retrieve_behavior_knowledge("workplace conflict boss deadline")
+
+
+@benchmark("rag.find_relevant_knowledge")
+def _bench_find_relevant():
+    from rag import get_library, find_relevant_knowledge
+    get_library()
+    return lambda: find_relevant_knowledge(QUERY, ANALYSIS)
+
+
+@benchmark("rag.find_relevant_knowledge_miss")
+def _bench_find_relevant_miss():
+    from rag import get_knowledge_cache, get_library, find_relevant_knowledge
+    get_library()
+    # Cycling through more distinct queries than the cache holds: every call misses.
+    # Digits are x-separated so elongation collapse ("111" -> "1") keeps them distinct.
+    queries = [f"{QUERY} q{'x'.join(str(i))}" for i in range(get_knowledge_cache().maxsize + 1)]
+    state = {"i": 0}
+
+    def run():
+        state["i"] = (state["i"] + 1) % len(queries)
+        return find_relevant_knowledge(queries[state["i"]], ANALYSIS)
+    return run
+
+
+@benchmark("rag.bm25_search")
+def _bench_bm25():
+    from rag import get_library
+    index = get_library().bm25
+    return lambda: index.search(QUERY, k=3)
+
+
+@benchmark("rag.keyword_search")
+def _bench_keyword():
+    from rag import search_scenarios
+    return lambda: search_scenarios(QUERY, k=3, engine="keyword")
+
+
+@benchmark("rag.ngram_search")
+def _bench_ngram():
+    from rag import get_library
+    index = get_library().ngram
+    return lambda: index.search(QUERY, k=3)
+
+
+@benchmark("rag.ngram_search_batch32")
+def _bench_ngram_batch():
+    from rag import get_library
+    index = get_library().ngram
+    queries = [f"{QUERY} {i}" for i in range(32)]
+    return lambda: index.search_many(queries, k=3)
+
+
+@benchmark("rag.retrieve_scenarios_k5")
+def _bench_retrieve_top_k():
+    from rag import get_library, retrieve_scenarios
+    get_library()
+    return lambda: retrieve_scenarios(QUERY, k=5)
+
+
+@benchmark("whatsapp.parse_small")
+def _bench_parse_small():
+    from whatsapp import parse_whatsapp_chat
+    export = make_whatsapp_export(2_000)
+    return lambda: parse_whatsapp_chat(export)
+
+
+@benchmark("whatsapp.parse_1mb")
+def _bench_parse_1mb():
+    from whatsapp import parse_whatsapp_chat
+    export = make_whatsapp_export(1_000_000)
+    return lambda: parse_whatsapp_chat(export)
+
+
+@benchmark("whatsapp.parse_50mb", large=True)
+def _bench_parse_50mb():
+    from whatsapp import parse_whatsapp_chat
+    export = make_whatsapp_export(50_000_000)
+    return lambda: parse_whatsapp_chat(export)
+
+
+@benchmark("whatsapp.extract_last_10_1mb")
+def _bench_extract_last():
+    from whatsapp import extract_last_n_messages
+    export = make_whatsapp_export(1_000_000)
+    return lambda: extract_last_n_messages(export, 10)
+
+
+@benchmark("composer.build_messages")
+def _bench_build_messages():
+    from rag import find_relevant_knowledge
+    from composer.generator import _build_messages
+    knowledge = find_relevant_knowledge(QUERY, ANALYSIS)
+    memory = {
+        "learned_patterns": ["avoids_confrontation", "needs_validation", "prefers_short_replies"],
+        "memory_summary": "Works in Bangalore, stressed about a strict manager.",
+        "interaction_count": 42,
+    }
+    meta = {"city": "Bangalore", "place": "office", "time": "evening"}
+    return lambda: _build_messages(QUERY, ANALYSIS, POLICY, knowledge, None, memory, meta)
+
+
+_db_ready = False
+
+
+def _persona_db():
+    """Connect the persona module to BENCH_DATABASE_URL or a temp SQLite file (once)"""
+    global _db_ready
+    from persona import PostgresDB
+    from persona.models import Base
+    if not _db_ready:
+        url = os.getenv("BENCH_DATABASE_URL")
+        if not url:
+            path = Path(tempfile.mkdtemp(prefix="buddy-bench-")) / "bench.db"
+            url = f"sqlite:///{path}"
+        PostgresDB.close()
+        if PostgresDB.connect(url) is None:
+            raise RuntimeError(f"cannot connect to {url}")
+        Base.metadata.create_all(PostgresDB._engine)
+        _db_ready = True
+
+
+def _seed_user(user_id: str, interactions: int = 50) -> None:
+    from persona import load_user_context, log_interaction, update_user_traits
+    load_user_context(user_id)
+    for i in range(interactions):
+        update_user_traits(user_id, ANALYSIS, POLICY)
+        log_interaction(user_id, "workplace_conflict", ANALYSIS["primary_emotion"], POLICY["mode"],
+                        {"response_length": "medium", "humor_level": 0, "source": "text"})
+
+
+@benchmark("persona.load_user_context")
+def _bench_load_context():
+    from persona import load_user_context
+    _persona_db()
+    _seed_user("bench_load")
+    return lambda: load_user_context("bench_load")
+
+
+@benchmark("persona.update_user_traits")
+def _bench_update_traits():
+    from persona import update_user_traits
+    _persona_db()
+    _seed_user("bench_traits", interactions=1)
+    return lambda: update_user_traits("bench_traits", ANALYSIS, POLICY)
+
+
+@benchmark("persona.log_interaction")
+def _bench_log_interaction():
+    from persona import log_interaction
+    _persona_db()
+    _seed_user("bench_log", interactions=1)
+    metadata = {"response_length": "medium", "humor_level": 0, "source": "text"}
+    return lambda: log_interaction("bench_log", "workplace_conflict", "frustration", "diplomatic_advisor", metadata)
+
+
+@benchmark("persona.get_interaction_stats")
+def _bench_stats():
+    from persona import get_interaction_stats
+    _persona_db()
+    _seed_user("bench_stats")
+    return lambda: get_interaction_stats("bench_stats")
+
+
+# ---------------------------------------------------------------------------
+# Runner
+# ---------------------------------------------------------------------------
+
+def measure(func: Callable[[], Any], min_time: float = 0.2, repeat: int = 5) -> Dict[str, float]:
+    """
+    Time `func` per call.
+
+    The loop count is doubled until one repeat takes at least `min_time`
+    seconds, then `repeat` repeats are run.
+
+    Returns:
+        {"median_us", "min_us", "loops"}
+    """
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            func()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time or loops >= 1 << 20:
+            break
+        loops *= 2
+
+    samples = [elapsed / loops]
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(loops):
+            func()
+        samples.append((time.perf_counter() - start) / loops)
+
+    return {
+        "median_us": round(statistics.median(samples) * 1e6, 3),
+        "min_us": round(min(samples) * 1e6, 3),
+        "loops": loops,
+    }
+
+
+def run_benchmarks(names: List[str], min_time: float, repeat: int) -> Dict[str, Dict[str, float]]:
+    """Set up and measure each benchmark; a failing setup is reported and skipped"""
+    results = {}
+    for name in names:
+        setup, _ = BENCHMARKS[name]
+        try:
+            func = setup()
+        except Exception as e:
+            print(f"⚠️  {name}: setup failed ({e}), skipped")
+            continue
+        results[name] = measure(func, min_time, repeat)
+        print(f"   {name:36} {_format_us(results[name]['median_us']):>12}  ({results[name]['loops']} loops)")
+    return results
+
+
+def compare(results: Dict[str, Dict[str, float]], baseline: Dict[str, float],
+            threshold: float) -> List[Tuple[str, Optional[float], float, str]]:
+    """
+    Compare medians with baseline medians.
+
+    Returns:
+        (name, baseline_us, current_us, status) rows; status is "ok",
+        "faster", "REGRESSION" or "new"
+    """
+    rows = []
+    for name, result in results.items():
+        current = result["median_us"]
+        base = baseline.get(name)
+        if base is None:
+            status = "new"
+        elif current > base * (1 + threshold):
+            status = "REGRESSION"
+        elif current < base * (1 - threshold):
+            status = "faster"
+        else:
+            status = "ok"
+        rows.append((name, base, current, status))
+    return rows
+
+
+def _format_us(us: float) -> str:
+    if us >= 1e6:
+        return f"{us / 1e6:.2f} s"
+    if us >= 1e3:
+        return f"{us / 1e3:.2f} ms"
+    return f"{us:.2f} µs"
+
+
+def load_baseline(path: Path) -> Dict[str, float]:
+    if not path.exists():
+        return {}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f).get("results", {})
+
+
+def save_baseline(path: Path, results: Dict[str, Dict[str, float]]) -> None:
+    """Merge medians into the baseline file (benchmarks not run keep their old value)"""
+    merged = load_baseline(path)
+    merged.update({name: result["median_us"] for name, result in results.items()})
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({
+            "machine": f"{platform.system()} {platform.machine()} / {platform.processor() or 'unknown cpu'}",
+            "python": platform.python_version(),
+            "results": dict(sorted(merged.items())),
+        }, f, indent=2)
+        f.write("\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Microbenchmarks for the non-LLM hot paths")
+    parser.add_argument("--filter", default="", help="Only run benchmarks whose name contains this")
+    parser.add_argument("--skip-large", action="store_true", help="Skip the 50 MB WhatsApp export")
+    parser.add_argument("--min-time", type=float, default=0.2, help="Min seconds per repeat")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument("--save", action="store_true", help="Store results as the new baseline")
+    parser.add_argument("--check", action="store_true", help="Exit 1 if any benchmark regressed")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Allowed slowdown as a fraction (0.25 = 25%%)")
+    parser.add_argument("--json", metavar="PATH", help="Also write raw results as JSON")
+    args = parser.parse_args()
+
+    names = [
+        name for name, (_, large) in BENCHMARKS.items()
+        if args.filter in name and not (large and args.skip_large)
+    ]
+
+    print("=" * 70)
+    print(f"Microbenchmarks ({len(names)})")
+    print("=" * 70)
+    results = run_benchmarks(names, args.min_time, args.repeat)
+    print()
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+
+    if args.save:
+        save_baseline(args.baseline, results)
+        print(f"Saved baseline to {args.baseline}")
+        return
+
+    baseline = load_baseline(args.baseline)
+    if not baseline:
+        print(f"No baseline at {args.baseline} (run with --save to create one)")
+        sys.exit(1 if args.check else 0)
+
+    rows = compare(results, baseline, args.threshold)
+    print(f"{'benchmark':36} {'baseline':>12} {'current':>12} {'change':>8}  status")
+    for name, base, current, status in rows:
+        change = f"{(current / base - 1) * 100:+.0f}%" if base else ""
+        base_text = _format_us(base) if base else "-"
+        print(f"{name:36} {base_text:>12} {_format_us(current):>12} {change:>8}  {status}")
+
+    regressions = [row for row in rows if row[3] == "REGRESSION"]
+    if regressions:
+        print()
+        print(f"❌ {len(regressions)} regression(s) beyond {args.threshold:.0%}")
+        if args.check:
+            sys.exit(1)
+    else:
+        print()
+        print(f"✅ No regressions beyond {args.threshold:.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,7 +6,10 @@ Production-ready API server for Buddy AI chatbot.
 
 import sys
 import os
-from fastapi import FastAPI
+import time
+import asyncio
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from dotenv import load_dotenv
 
@@ -18,6 +21,58 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
 # Import router
 from api.chat_router import router as chat_router
+from api.metrics_router import router as metrics_router
+from rag import get_library, get_rag_engine, get_top_k
+from llm import aclose_llm_clients, get_prompt_registry
+from extractors import get_cascade_stats, get_social_analysis_mode
+from policy_engine import get_policy_mode
+from telemetry.metrics import HTTP_REQUESTS, HTTP_DURATION
+from telemetry.logging import get_logger, log_context, new_request_id, shutdown_logging
+
+
+logger = get_logger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Warm up process-wide state before serving the first request"""
+    # Parse behavior_library once so /chat never reads it from disk
+    library = get_library()
+    logger.info("behavior library loaded", extra={
+        "stage": "startup", "scenarios": len(library), "entries": library.entry_count, "version": library.version,
+    })
+    # Build the BM25 text index now rather than on the first /chat
+    logger.info("bm25 index built", extra={
+        "stage": "startup", "docs": library.bm25.doc_count, "terms": library.bm25.vocabulary_size,
+    })
+    # Resolving the env-selected modes here reports bad values at startup
+    if get_rag_engine() == "ngram":
+        logger.info("ngram index built", extra={
+            "stage": "startup", "docs": library.ngram.doc_count, "weights": library.ngram.nnz,
+        })
+    get_top_k()
+    get_social_analysis_mode()
+    get_policy_mode()
+    # Prompts are registered (read from disk) when their modules import
+    logger.info("prompts loaded", extra={"stage": "startup", "prompts": get_prompt_registry().versions()})
+    yield
+    # Finish queued trait/interaction writes before exiting
+    await asyncio.to_thread(_drain_background_writes)
+    # Release pooled OpenRouter connections
+    await aclose_llm_clients()
+    # Flush queued log lines
+    shutdown_logging()
+
+
+def _drain_background_writes():
+    """Drain the persona write queue if the persona module ever started it"""
+    try:
+        from persona import shutdown_background_writer
+    except Exception:
+        return  # Database dependencies unavailable - nothing was queued
+    if not shutdown_background_writer(timeout=10.0):
+        logger.warning("background writes still pending at shutdown", extra={"stage": "shutdown"})
+
 
 # Create FastAPI app
 app = FastAPI(
@@ -25,7 +80,8 @@ app = FastAPI(
     description="Culturally intelligent AI companion with adaptive learning",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    lifespan=lifespan
 )
 
 # Enable CORS for all origins (for frontend development)
@@ -37,8 +93,38 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+
+
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    """Count requests and time them (until response headers) per route template"""
+    start = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        route = request.scope.get("route")
+        # Templates ("/chat/learning/{user_id}") keep label cardinality bounded
+        path = getattr(route, "path", "unmatched")
+        HTTP_REQUESTS.inc(request.method, path, status)
+        HTTP_DURATION.observe(request.method, path, value_ms=(time.perf_counter() - start) * 1000)
+
+
+@app.middleware("http")
+async def bind_request_id(request: Request, call_next):
+    """Tag every log line of the request with X-Request-ID (generated if absent) and echo it back"""
+    request_id = request.headers.get("x-request-id", "")[:64] or new_request_id()
+    with log_context(request_id=request_id):
+        response = await call_next(request)
+    response.headers["X-Request-ID"] = request_id
+    return response
+
+
 # Include routers
 app.include_router(chat_router)
+app.include_router(metrics_router)
 
 
 @app.get("/")
@@ -51,9 +137,11 @@ async def root():
         "message": "Buddy AI is running! Visit /docs for API documentation.",
         "endpoints": {
             "chat": "POST /chat",
+            "chat_stream": "POST /chat/stream",
             "whatsapp": "POST /chat/whatsapp",
             "learning": "GET /chat/learning/{user_id}",
-            "health": "GET /chat/health"
+            "health": "GET /chat/health",
+            "metrics": "GET /metrics"
         }
     }
 
@@ -70,7 +158,10 @@ async def health():
         "status": "healthy",
         "api_key_configured": api_key_configured,
         "database_configured": db_configured,
-        "learning_enabled": db_configured
+        "learning_enabled": db_configured,
+        "library_version": get_library().version,
+        "analysis_mode": get_social_analysis_mode(),
+        "analysis_cascade": get_cascade_stats().as_dict()
     }
 
 
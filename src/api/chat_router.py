@@ -1,15 +1,19 @@
 """
 Chat Router for Buddy AI
 
-Exposes 3 clean endpoints:
+Exposes 4 clean endpoints:
 - POST /chat - Normal conversation
+- POST /chat/stream - Normal conversation, reply streamed as Server-Sent Events
 - POST /chat/whatsapp - WhatsApp import
 - GET /chat/learning/{user_id} - Learning insights
 """
 
 import sys
 import os
-from fastapi import APIRouter, HTTPException
+import json
+import asyncio
+from fastapi import APIRouter, HTTPException, Response
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from typing import Optional, List, Dict, Any
 
@@ -17,7 +21,8 @@ from typing import Optional, List, Dict, Any
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
 # Import orchestrator
-from orchestrator import buddy_chat
+from orchestrator import abuddy_chat, abuddy_chat_stream
+from telemetry import format_server_timing, get_stage_histograms
 
 # Import stats function
 try:
@@ -48,6 +53,7 @@ class ChatResponse(BaseModel):
     relationship: str
     learning: Optional[str] = None
     error: Optional[str] = None
+    timings: Optional[Dict[str, float]] = None  # Per-stage ms, plus "total"
 
 
 class LearningResponse(BaseModel):
@@ -64,7 +70,7 @@ router = APIRouter(prefix="/chat", tags=["chat"])
 
 
 @router.post("", response_model=ChatResponse)
-async def chat(request: ChatRequest):
+async def chat(request: ChatRequest, response: Response):
     """
     Main chat endpoint for normal conversation.
 
@@ -85,16 +91,20 @@ async def chat(request: ChatRequest):
             "reply": "...",
             "mode": "chill_companion",
             "emotion": "frustration",
-            "learning": "Buddy learned you prefer short replies"
+            "learning": "Buddy learned you prefer short replies",
+            "timings": {"analysis": 812.4, "policy": 640.2, ..., "total": 2310.5}
         }
+
+    Stage timings are also sent as a Server-Timing header.
     """
     try:
-        result = buddy_chat(
+        result = await abuddy_chat(
             user_id=request.user_id,
             user_input=request.message,
             source="text",
             meta=request.meta  # Pass context metadata
         )
+        _set_server_timing(response, result.get("timings"))
         return ChatResponse(**result)
 
     except Exception as e:
@@ -110,8 +120,69 @@ async def chat(request: ChatRequest):
         )
 
 
+@router.post("/stream")
+async def chat_stream(request: ChatRequest):
+    """
+    Streaming chat endpoint (Server-Sent Events).
+
+    Same request body as POST /chat. Analysis, policy and RAG run first,
+    then the reply is streamed token by token as it is generated.
+
+    Events:
+        event: meta      data: {"mode": ..., "emotion": ..., "intensity": ..., "relationship": ...}
+        event: token     data: {"text": "..."}            (repeated)
+        event: learning  data: {"learning": "..." | null}
+        event: done      data: {"timings": {...}}
+
+    If the pipeline fails before the reply starts, a single `error` event
+    is sent with the same fallback fields POST /chat would return.
+    """
+
+    async def event_stream():
+        try:
+            async for event, data in abuddy_chat_stream(
+                user_id=request.user_id,
+                user_input=request.message,
+                source="text",
+                meta=request.meta
+            ):
+                yield _sse(event, data)
+        except Exception as e:
+            # Never crash - headers are already sent, so report in-band
+            yield _sse("error", {
+                "reply": "Hey, I'm here for you. What's going on?",
+                "mode": "chill_companion",
+                "emotion": "neutral",
+                "intensity": 5,
+                "relationship": "friend",
+                "learning": None,
+                "error": str(e)
+            })
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",  # Disable proxy buffering (nginx)
+        }
+    )
+
+
+def _set_server_timing(response: Response, timings: Optional[Dict[str, float]]) -> None:
+    """Expose pipeline stage timings as a Server-Timing header"""
+    header = format_server_timing(timings)
+    if header:
+        response.headers["Server-Timing"] = header
+
+
+def _sse(event: str, data: Dict[str, Any]) -> str:
+    """Format one Server-Sent Event"""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
 @router.post("/whatsapp", response_model=ChatResponse)
-async def chat_whatsapp(request: WhatsAppChatRequest):
+async def chat_whatsapp(request: WhatsAppChatRequest, response: Response):
     """
     WhatsApp chat import endpoint.
 
@@ -131,12 +202,13 @@ async def chat_whatsapp(request: WhatsAppChatRequest):
     Returns same format as normal chat endpoint.
     """
     try:
-        result = buddy_chat(
+        result = await abuddy_chat(
             user_id=request.user_id,
             user_input=request.chat_text,
             source="whatsapp",
             meta=request.meta  # Pass context metadata
         )
+        _set_server_timing(response, result.get("timings"))
         return ChatResponse(**result)
 
     except Exception as e:
@@ -187,7 +259,8 @@ async def get_learning_insights(user_id: str):
             )
 
         try:
-            stats = get_interaction_stats(user_id)
+            with get_stage_histograms().time("stats"):
+                stats = await asyncio.to_thread(get_interaction_stats, user_id)
         except Exception as e:
             # Database error - return graceful response
             print(f"Database error in get_interaction_stats: {e}")
@@ -203,7 +276,7 @@ async def get_learning_insights(user_id: str):
         # Get traits
         try:
             from persona import get_user_traits
-            traits = get_user_traits(user_id)
+            traits = await asyncio.to_thread(get_user_traits, user_id)
         except Exception as e:
             print(f"Error getting traits: {e}")
             traits = []
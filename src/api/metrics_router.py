@@ -0,0 +1,95 @@
+"""
+Metrics Router for Buddy AI
+
+Exposes GET /metrics in the Prometheus text format:
+- HTTP request counts and latency per route (recorded by the middleware in main.py)
+- Per-pipeline-stage latency histograms
+- LLM call counts, latency, errors and fallbacks per stage and model
+- DB connection pool gauges
+- Cache hit ratios, social analysis cascade counters and per-tier latency
+
+Everything is read from in-process state; no network calls.
+"""
+
+import sys
+import os
+from typing import Iterable
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+# Setup path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from cache import live_caches
+from extractors import get_cascade_stats
+from telemetry.metrics import MetricFamily, get_metrics_registry, render_metrics
+
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+router = APIRouter(tags=["metrics"])
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Prometheus scrape endpoint"""
+    return PlainTextResponse(render_metrics(), media_type=CONTENT_TYPE)
+
+
+def collect_db_pool() -> Iterable[MetricFamily]:
+    """Connection pool gauges, once the persona DB engine exists"""
+    try:
+        from persona import PostgresDB
+    except Exception:
+        return []  # Database dependencies unavailable
+
+    engine = PostgresDB._engine
+    pool = getattr(engine, "pool", None)
+    if pool is None:
+        return []
+
+    families = []
+    for name, method, help in (
+        ("buddy_db_pool_size", "size", "Configured pool size"),
+        ("buddy_db_pool_checked_out", "checkedout", "Connections currently checked out"),
+        ("buddy_db_pool_checked_in", "checkedin", "Idle connections in the pool"),
+        ("buddy_db_pool_overflow", "overflow", "Connections opened beyond pool_size"),
+    ):
+        getter = getattr(pool, method, None)
+        if getter is not None:
+            families.append((name, "gauge", help, [({}, getter())]))
+    return families
+
+
+def collect_caches() -> Iterable[MetricFamily]:
+    """Hit/miss/eviction counters and hit ratio for every live LRUCache"""
+    stats = [cache.stats() for cache in live_caches()]
+    if not stats:
+        return []
+    return [
+        ("buddy_cache_hits_total", "counter", "Cache hits", [({"cache": s.name}, s.hits) for s in stats]),
+        ("buddy_cache_misses_total", "counter", "Cache misses", [({"cache": s.name}, s.misses) for s in stats]),
+        ("buddy_cache_evictions_total", "counter", "LRU evictions", [({"cache": s.name}, s.evictions) for s in stats]),
+        ("buddy_cache_expirations_total", "counter", "TTL expirations", [({"cache": s.name}, s.expirations) for s in stats]),
+        ("buddy_cache_entries", "gauge", "Entries currently cached", [({"cache": s.name}, s.size) for s in stats]),
+        ("buddy_cache_hit_ratio", "gauge", "Hits / lookups since start", [({"cache": s.name}, round(s.hit_ratio, 4)) for s in stats]),
+    ]
+
+
+def collect_analysis_cascade() -> Iterable[MetricFamily]:
+    """Local vs LLM social analysis counters"""
+    stats = get_cascade_stats().as_dict()
+    return [
+        ("buddy_analysis_requests_total", "counter", "Messages seen by the local analyzer tier",
+         [({}, stats["requests"])]),
+        ("buddy_analysis_served_local_total", "counter", "Messages answered by the local analyzer",
+         [({}, stats["served_local"])]),
+        ("buddy_analysis_escalations_total", "counter", "Messages escalated to the LLM analyzer",
+         [({"reason": reason}, count) for reason, count in stats["escalations"].items()]),
+    ]
+
+
+_registry = get_metrics_registry()
+_registry.register_collector(collect_db_pool)
+_registry.register_collector(collect_caches)
+_registry.register_collector(collect_analysis_cascade)
@@ -0,0 +1,5 @@
+"""Cache module - bounded in-process caches for hot lookups"""
+
+from .lru import CacheStats, LRUCache, live_caches
+
+__all__ = ["CacheStats", "LRUCache", "live_caches"]
@@ -0,0 +1,170 @@
+"""
+LRU Cache
+
+Thread-safe, bounded least-recently-used cache with an optional
+time-to-live. Tracks hits, misses, evictions and expirations so callers
+can report hit ratios.
+"""
+
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Hashable, List, Optional
+
+
+_MISSING = object()
+
+# Every live cache, so /metrics can report them without a registry call
+_live_caches: "weakref.WeakSet" = weakref.WeakSet()
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    """Point-in-time counters for one cache"""
+
+    name: str
+    size: int
+    maxsize: int
+    hits: int
+    misses: int
+    evictions: int
+    expirations: int
+
+    @property
+    def hit_ratio(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "size": self.size,
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "hit_ratio": round(self.hit_ratio, 4),
+        }
+
+
+class LRUCache:
+    """
+    Bounded LRU map with optional per-entry TTL.
+
+    A maxsize of 0 disables the cache: every get misses and set is a no-op.
+
+    Example:
+        >>> cache = LRUCache(maxsize=256, ttl=3600, name="policy")
+        >>> cache.set(("anxiety", "vent"), policy)
+        >>> cache.get(("anxiety", "vent"))  # policy
+        >>> cache.stats().hit_ratio  # 1.0
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 1024,
+        ttl: Optional[float] = None,
+        name: str = "cache",
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if maxsize < 0:
+            raise ValueError("maxsize must be >= 0")
+        self.maxsize = maxsize
+        self.ttl = ttl if ttl and ttl > 0 else None
+        self.name = name
+        self._clock = clock
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        _live_caches.add(self)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Cached value for `key`, or `default` on a miss or expired entry"""
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is _MISSING:
+                self.misses += 1
+                return default
+            value, expires_at = entry
+            if expires_at is not None and self._clock() >= expires_at:
+                del self._data[key]
+                self.expirations += 1
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store `value`, evicting the least recently used entry when full"""
+        if self.maxsize == 0:
+            return
+        expires_at = self._clock() + self.ttl if self.ttl else None
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+            self._data[key] = (value, expires_at)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_set(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """
+        Cached value for `key`, computing and storing it on a miss.
+
+        Exceptions from `compute` propagate and nothing is cached.
+        """
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = compute()
+            self.set(key, value)
+        return value
+
+    def invalidate(self, key: Hashable) -> bool:
+        """Drop `key`; returns True if it was cached"""
+        with self._lock:
+            return self._data.pop(key, _MISSING) is not _MISSING
+
+    def clear(self) -> None:
+        """
+        Drop every entry.
+
+        The counters are kept: /metrics exports them as monotonic
+        Prometheus counters (see reset_stats).
+        """
+        with self._lock:
+            self._data.clear()
+
+    def reset_stats(self) -> None:
+        """Zero the hit/miss/eviction/expiration counters (tests only)"""
+        with self._lock:
+            self.hits = self.misses = self.evictions = self.expirations = 0
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(
+                name=self.name,
+                size=len(self._data),
+                maxsize=self.maxsize,
+                hits=self.hits,
+                misses=self.misses,
+                evictions=self.evictions,
+                expirations=self.expirations,
+            )
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._data
+
+
+def live_caches() -> List[LRUCache]:
+    """Every LRUCache instance that is still alive, sorted by name"""
+    return sorted(list(_live_caches), key=lambda cache: cache.name)
@@ -1,6 +1,20 @@
 """Response Composer module for final response generation"""
 
-from .generator import generate_buddy_reply, generate_reply
+from .generator import (
+    generate_buddy_reply,
+    generate_reply,
+    agenerate_buddy_reply,
+    agenerate_reply,
+    astream_buddy_reply,
+    astream_reply,
+)
 
-__all__ = ["generate_buddy_reply", "generate_reply"]
+__all__ = [
+    "generate_buddy_reply",
+    "generate_reply",
+    "agenerate_buddy_reply",
+    "agenerate_reply",
+    "astream_buddy_reply",
+    "astream_reply",
+]
 
@@ -5,11 +5,20 @@ Combines all signals, policy, and RAG knowledge to generate
 the final Buddy response using Claude.
 """
 
-import os
 import json
 from pathlib import Path
-from typing import Optional, Dict, Any
-from openai import OpenAI
+from typing import Optional, Dict, Any, AsyncIterator
+from llm import DEFAULT_MODEL, get_llm_client, get_async_llm_client, get_prompt, register_prompt
+from telemetry.logging import get_logger
+from telemetry.metrics import track_llm_call, record_llm_fallback
+
+
+logger = get_logger(__name__)
+
+
+# System prompt is read once at import and served from memory
+PROMPT_NAME = "response"
+register_prompt(PROMPT_NAME, Path(__file__).parent / "response_prompt.txt")
 
 
 def generate_buddy_reply(
@@ -60,21 +69,144 @@ def generate_buddy_reply(
         >>> print(reply)  # Context-aware response about Bangalore
     """
 
-    # Get API key
-    api_key = os.getenv("OPENROUTER_API_KEY")
-    if not api_key:
-        raise ValueError("OPENROUTER_API_KEY not found in environment")
+    # Shared pooled client
+    client = get_llm_client()
+    messages = _build_messages(user_input, analysis, policy, rag_knowledge, persona, memory, meta)
 
-    # Initialize client
-    client = OpenAI(
-        base_url="https://openrouter.ai/api/v1",
-        api_key=api_key,
-    )
+    try:
+        # Call API
+        with track_llm_call("compose", DEFAULT_MODEL):
+            response = client.chat.completions.create(
+                model=DEFAULT_MODEL,
+                messages=messages,
+                extra_body={"reasoning": {"enabled": True}}
+            )
+
+        # Extract response
+        response_text = response.choices[0].message.content.strip()
+
+        return response_text
+
+    except Exception as e:
+        return _fallback_reply(e)
+
+
+async def agenerate_buddy_reply(
+    user_input: str,
+    analysis: Optional[Dict] = None,
+    policy: Optional[Dict] = None,
+    rag_knowledge: Optional[Dict] = None,
+    persona: Optional[Dict] = None,
+    memory: Optional[Dict] = None,
+    meta: Optional[Dict] = None
+) -> str:
+    """
+    Async counterpart of generate_buddy_reply().
+
+    Takes the same arguments and builds the same prompt, but awaits the
+    async OpenRouter client instead of blocking the calling thread.
+
+    Returns:
+        Generated response text
+
+    Raises:
+        ValueError: If OPENROUTER_API_KEY is not set
+    """
+    client = get_async_llm_client()
+    messages = _build_messages(user_input, analysis, policy, rag_knowledge, persona, memory, meta)
+
+    try:
+        with track_llm_call("compose", DEFAULT_MODEL):
+            response = await client.chat.completions.create(
+                model=DEFAULT_MODEL,
+                messages=messages,
+                extra_body={"reasoning": {"enabled": True}}
+            )
+        return response.choices[0].message.content.strip()
+
+    except Exception as e:
+        return _fallback_reply(e)
+
+
+async def astream_buddy_reply(
+    user_input: str,
+    analysis: Optional[Dict] = None,
+    policy: Optional[Dict] = None,
+    rag_knowledge: Optional[Dict] = None,
+    persona: Optional[Dict] = None,
+    memory: Optional[Dict] = None,
+    meta: Optional[Dict] = None
+) -> AsyncIterator[str]:
+    """
+    Stream the Buddy reply as text chunks as the model produces them.
 
-    # Load system prompt
-    prompt_path = Path(__file__).parent / "response_prompt.txt"
-    with open(prompt_path, 'r') as f:
-        system_prompt = f.read()
+    Builds the same prompt as generate_buddy_reply(). Reasoning tokens
+    are not forwarded, only reply content. If the call fails before any
+    content arrived, the fallback reply is yielded instead; a failure
+    mid-stream just ends the stream.
+
+    Yields:
+        Reply text chunks
+
+    Raises:
+        ValueError: If OPENROUTER_API_KEY is not set
+    """
+    client = get_async_llm_client()
+    messages = _build_messages(user_input, analysis, policy, rag_knowledge, persona, memory, meta)
+
+    sent_any = False
+    try:
+        with track_llm_call("compose_stream", DEFAULT_MODEL):
+            stream = await client.chat.completions.create(
+                model=DEFAULT_MODEL,
+                messages=messages,
+                stream=True,
+                extra_body={"reasoning": {"enabled": True}}
+            )
+            async for chunk in stream:
+                if not chunk.choices:
+                    continue
+                content = chunk.choices[0].delta.content
+                if not content:
+                    continue
+                # Match the .strip() of the non-streaming path at the start
+                if not sent_any:
+                    content = content.lstrip()
+                    if not content:
+                        continue
+                sent_any = True
+                yield content
+
+    except Exception as e:
+        if not sent_any:
+            yield _fallback_reply(e)
+        else:
+            logger.warning("reply stream interrupted: %s", e, extra={"stage": "compose"})
+
+
+def _fallback_reply(error: Exception) -> str:
+    """Safe reply used when the model call fails"""
+    logger.warning("failed to generate response (%s), using fallback", error, extra={"stage": "compose"})
+    record_llm_fallback("compose")
+    return "Hey, I'm here for you. What's going on?"
+
+
+def _build_messages(
+    user_input: str,
+    analysis: Optional[Dict],
+    policy: Optional[Dict],
+    rag_knowledge: Optional[Dict],
+    persona: Optional[Dict],
+    memory: Optional[Dict],
+    meta: Optional[Dict]
+) -> list:
+    """
+    Assemble system prompt and full context for the composer call.
+
+    Returns:
+        Chat messages list (system + user)
+    """
+    system_prompt = get_prompt(PROMPT_NAME)
 
     # Build context for Claude
     context_parts = [
@@ -154,17 +286,25 @@ def generate_buddy_reply(
         if 'scenario' in rag_knowledge:
             context_parts.append(f"Scenario: {rag_knowledge['scenario']}")
 
+        if rag_knowledge.get('related_scenarios'):
+            context_parts.append(f"Also Relevant: {', '.join(rag_knowledge['related_scenarios'])}")
+
         if 'typical_emotions' in rag_knowledge:
             context_parts.append(f"Typical Emotions: {', '.join(rag_knowledge['typical_emotions'])}")
 
         if 'do' in rag_knowledge:
             context_parts.append("\nDO:")
-            for item in rag_knowledge['do'][:3]:  # Top 3
+            for item in rag_knowledge['do'][:5]:  # Top 5, blended across matched scenarios
                 context_parts.append(f"  - {item}")
 
         if 'dont' in rag_knowledge:
             context_parts.append("\nDON'T:")
-            for item in rag_knowledge['dont'][:3]:  # Top 3
+            for item in rag_knowledge['dont'][:5]:  # Top 5
+                context_parts.append(f"  - {item}")
+
+        if rag_knowledge.get('action_suggestions'):
+            context_parts.append("\nACTION IDEAS:")
+            for item in rag_knowledge['action_suggestions'][:5]:
                 context_parts.append(f"  - {item}")
 
         if 'tone' in rag_knowledge:
@@ -186,26 +326,10 @@ def generate_buddy_reply(
 
     full_context = "\n".join(context_parts)
 
-    try:
-        # Call API
-        response = client.chat.completions.create(
-            model="nvidia/nemotron-3-super-120b-a12b:free",
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": full_context}
-            ],
-            extra_body={"reasoning": {"enabled": True}}
-        )
-
-        # Extract response
-        response_text = response.choices[0].message.content.strip()
-
-        return response_text
-
-    except Exception as e:
-        # Fallback response
-        print(f"Warning: Failed to generate response ({e}). Using fallback.")
-        return "Hey, I'm here for you. What's going on?"
+    return [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": full_context}
+    ]
 
 
 def generate_reply(
@@ -233,26 +357,73 @@ def generate_reply(
         Generated response text
     """
 
-    # Convert Pydantic models to dicts if needed
-    analysis_dict = None
-    if analysis:
-        if hasattr(analysis, 'model_dump'):
-            analysis_dict = analysis.model_dump()
-        else:
-            analysis_dict = analysis
+    return generate_buddy_reply(
+        user_input=user_input,
+        analysis=_as_dict(analysis),
+        policy=_as_dict(policy),
+        rag_knowledge=rag_knowledge,
+        memory=memory,
+        meta=meta
+    )
 
-    policy_dict = None
-    if policy:
-        if hasattr(policy, 'model_dump'):
-            policy_dict = policy.model_dump()
-        else:
-            policy_dict = policy
 
-    return generate_buddy_reply(
+async def agenerate_reply(
+    user_input: str,
+    analysis: Optional[Any] = None,
+    policy: Optional[Any] = None,
+    rag_knowledge: Optional[Dict] = None,
+    memory: Optional[Dict] = None,
+    meta: Optional[Dict] = None
+) -> str:
+    """
+    Async counterpart of generate_reply().
+
+    Accepts Pydantic models or dicts and converts them automatically.
+
+    Returns:
+        Generated response text
+    """
+    return await agenerate_buddy_reply(
         user_input=user_input,
-        analysis=analysis_dict,
-        policy=policy_dict,
+        analysis=_as_dict(analysis),
+        policy=_as_dict(policy),
         rag_knowledge=rag_knowledge,
         memory=memory,
         meta=meta
     )
+
+
+async def astream_reply(
+    user_input: str,
+    analysis: Optional[Any] = None,
+    policy: Optional[Any] = None,
+    rag_knowledge: Optional[Dict] = None,
+    memory: Optional[Dict] = None,
+    meta: Optional[Dict] = None
+) -> AsyncIterator[str]:
+    """
+    Streaming counterpart of generate_reply().
+
+    Accepts Pydantic models or dicts and converts them automatically.
+
+    Yields:
+        Reply text chunks
+    """
+    async for chunk in astream_buddy_reply(
+        user_input=user_input,
+        analysis=_as_dict(analysis),
+        policy=_as_dict(policy),
+        rag_knowledge=rag_knowledge,
+        memory=memory,
+        meta=meta
+    ):
+        yield chunk
+
+
+def _as_dict(value: Optional[Any]) -> Optional[Dict]:
+    """Convert a Pydantic model to a dict, pass dicts (and None) through"""
+    if not value:
+        return None
+    if hasattr(value, 'model_dump'):
+        return value.model_dump()
+    return value
@@ -1,7 +1,30 @@
 """Extractors module for social and emotional signal analysis"""
 
 from .models import SocialAnalysis
-from .analyzer import analyze_social_context
-
-__all__ = ["SocialAnalysis", "analyze_social_context"]
+from .analyzer import analyze_social_context, aanalyze_social_context
+from .lexicon import LexiconResult, classify_social_context
+from .cascade import (
+    SOCIAL_ANALYSIS_MODES,
+    CascadeStats,
+    get_cascade_stats,
+    get_social_analysis_mode,
+    select_social_analysis,
+    aselect_social_analysis,
+)
+from .fused import analyze_and_decide, aanalyze_and_decide
 
+__all__ = [
+    "SocialAnalysis",
+    "analyze_social_context",
+    "aanalyze_social_context",
+    "LexiconResult",
+    "classify_social_context",
+    "SOCIAL_ANALYSIS_MODES",
+    "CascadeStats",
+    "get_cascade_stats",
+    "get_social_analysis_mode",
+    "select_social_analysis",
+    "aselect_social_analysis",
+    "analyze_and_decide",
+    "aanalyze_and_decide",
+]
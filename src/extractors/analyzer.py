@@ -4,13 +4,22 @@ Social Context Analyzer
 Extracts emotional and relationship signals from user text.
 """
 
-import os
 import json
 from pathlib import Path
-from openai import OpenAI
+from llm import DEFAULT_MODEL, get_llm_client, get_async_llm_client, get_prompt, register_prompt
+from telemetry.logging import get_logger
+from telemetry.metrics import track_llm_call, record_llm_fallback
 from .models import SocialAnalysis
 
 
+logger = get_logger(__name__)
+
+
+# System prompt is read once at import and served from memory
+PROMPT_NAME = "social_analysis"
+register_prompt(PROMPT_NAME, Path(__file__).parent / "social_analysis_prompt.txt")
+
+
 def analyze_social_context(text: str) -> SocialAnalysis:
     """
     Analyze emotional and social context of a message.
@@ -38,55 +47,92 @@ def analyze_social_context(text: str) -> SocialAnalysis:
         >>> print(analysis.relationship)     # "authority"
         >>> print(analysis.conflict_risk)    # "high"
     """
-    # Get API key
-    api_key = os.getenv("OPENROUTER_API_KEY")
-    if not api_key:
-        raise ValueError("OPENROUTER_API_KEY not found in environment")
-
-    # Initialize client
-    client = OpenAI(
-        base_url="https://openrouter.ai/api/v1",
-        api_key=api_key,
-    )
-
-    # Load system prompt
-    prompt_path = Path(__file__).parent / "social_analysis_prompt.txt"
-    with open(prompt_path, "r") as f:
-        system_prompt = f.read()
+    # Shared pooled client
+    client = get_llm_client()
+    messages = _build_messages(text)
 
     try:
         # Call API
-        response = client.chat.completions.create(
-            model="nvidia/nemotron-3-super-120b-a12b:free",
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": text}
-            ],
-            extra_body={"reasoning": {"enabled": True}}
-        )
-
-        # Parse response
-        response_text = response.choices[0].message.content.strip()
-
-        # Handle markdown code blocks
-        if response_text.startswith("```"):
-            lines = response_text.split("\n")
-            # Remove first line (```json or ```) and last line (```)
-            response_text = "\n".join(lines[1:-1])
-
-        # Parse JSON
-        analysis_dict = json.loads(response_text)
-
-        # Create and validate SocialAnalysis
-        return SocialAnalysis(**analysis_dict)
+        with track_llm_call("analysis", DEFAULT_MODEL):
+            response = client.chat.completions.create(
+                model=DEFAULT_MODEL,
+                messages=messages,
+                extra_body={"reasoning": {"enabled": True}}
+            )
+        return _parse_analysis(response.choices[0].message.content)
 
     except Exception as e:
-        # Fallback to neutral safe default
-        print(f"Warning: Failed to analyze social context ({e}). Using neutral fallback.")
-        return SocialAnalysis(
-            primary_emotion="neutral",
-            intensity=5,
-            user_need="advice",
-            relationship="unknown",
-            conflict_risk="low"
-        )
+        return _fallback_analysis(e)
+
+
+async def aanalyze_social_context(text: str) -> SocialAnalysis:
+    """
+    Async counterpart of analyze_social_context().
+
+    Uses the async OpenRouter client so the event loop keeps serving
+    other requests while the model is thinking.
+
+    Args:
+        text: User's message to analyze
+
+    Returns:
+        SocialAnalysis object with structured signals
+
+    Raises:
+        ValueError: If OPENROUTER_API_KEY is not set
+    """
+    client = get_async_llm_client()
+    messages = _build_messages(text)
+
+    try:
+        with track_llm_call("analysis", DEFAULT_MODEL):
+            response = await client.chat.completions.create(
+                model=DEFAULT_MODEL,
+                messages=messages,
+                extra_body={"reasoning": {"enabled": True}}
+            )
+        return _parse_analysis(response.choices[0].message.content)
+
+    except Exception as e:
+        return _fallback_analysis(e)
+
+
+def _build_messages(text: str) -> list:
+    """Chat messages for the analysis call"""
+    system_prompt = get_prompt(PROMPT_NAME)
+
+    return [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": text}
+    ]
+
+
+def _parse_analysis(response_text: str) -> SocialAnalysis:
+    """Parse the model's JSON reply into a validated SocialAnalysis"""
+    response_text = response_text.strip()
+
+    # Handle markdown code blocks
+    if response_text.startswith("```"):
+        lines = response_text.split("\n")
+        # Remove first line (```json or ```) and last line (```)
+        response_text = "\n".join(lines[1:-1])
+
+    # Parse JSON
+    analysis_dict = json.loads(response_text)
+
+    # Create and validate SocialAnalysis
+    return SocialAnalysis(**analysis_dict)
+
+
+def _fallback_analysis(error: Exception) -> SocialAnalysis:
+    """Neutral safe default used when the model call or parsing fails"""
+    logger.warning("failed to analyze social context (%s), using neutral fallback", error,
+                   extra={"stage": "analysis"})
+    record_llm_fallback("analysis")
+    return SocialAnalysis(
+        primary_emotion="neutral",
+        intensity=5,
+        user_need="advice",
+        relationship="unknown",
+        conflict_risk="low"
+    )
@@ -0,0 +1,192 @@
+"""
+Social Analysis Cascade
+
+Chooses how each message's SocialAnalysis is produced:
+
+    llm       OpenRouter model only (previous behaviour)
+    local     Lexicon analyzer only (no network call)
+    cascade   Lexicon analyzer first; escalate to the model when its
+              confidence is below the threshold or the message is long
+
+Per-tier counts and latencies are kept in CascadeStats (and the tier
+latency histogram behind /metrics) so the threshold can be tuned against
+the escalation rate.
+
+Configuration (environment variables):
+    SOCIAL_ANALYSIS_MODE            llm, local or cascade (default: llm)
+    SOCIAL_ANALYSIS_MIN_CONFIDENCE  Escalate below this (default: 0.7)
+    SOCIAL_ANALYSIS_MAX_LOCAL_CHARS Escalate longer messages (default: 280)
+"""
+
+import os
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+from telemetry.logging import get_logger, warn_once
+from telemetry.metrics import ANALYSIS_TIER_DURATION
+from . import analyzer
+from .lexicon import LexiconResult, classify_social_context
+from .models import SocialAnalysis
+
+
+logger = get_logger(__name__)
+
+
+SOCIAL_ANALYSIS_MODES = ("llm", "local", "cascade")
+DEFAULT_SOCIAL_ANALYSIS_MODE = "llm"
+
+# Confidence histogram bucket width (10 buckets over 0-1)
+_CONFIDENCE_BUCKETS = 10
+
+
+class CascadeStats:
+    """Thread-safe counters and latency totals for the analysis tiers"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.requests = 0
+            self.served_local = 0
+            self.escalations: Dict[str, int] = {"low_confidence": 0, "too_long": 0}
+            self._latency_ms: Dict[str, float] = {"local": 0.0, "llm": 0.0}
+            self._latency_max_ms: Dict[str, float] = {"local": 0.0, "llm": 0.0}
+            self._calls: Dict[str, int] = {"local": 0, "llm": 0}
+            self.confidence_histogram = [0] * _CONFIDENCE_BUCKETS
+
+    def record_tier(self, tier: str, elapsed_ms: float) -> None:
+        with self._lock:
+            self._calls[tier] += 1
+            self._latency_ms[tier] += elapsed_ms
+            self._latency_max_ms[tier] = max(self._latency_max_ms[tier], elapsed_ms)
+        ANALYSIS_TIER_DURATION.observe(tier, value_ms=elapsed_ms)
+
+    def record_decision(self, confidence: float, escalation: Optional[str]) -> None:
+        with self._lock:
+            self.requests += 1
+            bucket = min(int(confidence * _CONFIDENCE_BUCKETS), _CONFIDENCE_BUCKETS - 1)
+            self.confidence_histogram[bucket] += 1
+            if escalation is None:
+                self.served_local += 1
+            else:
+                self.escalations[escalation] += 1
+
+    @property
+    def escalation_rate(self) -> float:
+        return (self.requests - self.served_local) / self.requests if self.requests else 0.0
+
+    def as_dict(self) -> Dict:
+        with self._lock:
+            tiers = {
+                tier: {
+                    "calls": self._calls[tier],
+                    "avg_ms": round(self._latency_ms[tier] / self._calls[tier], 3) if self._calls[tier] else 0.0,
+                    "max_ms": round(self._latency_max_ms[tier], 3),
+                }
+                for tier in self._calls
+            }
+            return {
+                "requests": self.requests,
+                "served_local": self.served_local,
+                "escalations": dict(self.escalations),
+                "escalation_rate": round(self.escalation_rate, 4),
+                "tiers": tiers,
+                "confidence_histogram": list(self.confidence_histogram),
+            }
+
+
+_stats = CascadeStats()
+
+
+def get_cascade_stats() -> CascadeStats:
+    """Get the process-wide cascade statistics"""
+    return _stats
+
+
+def get_social_analysis_mode() -> str:
+    """Analysis mode from SOCIAL_ANALYSIS_MODE, falling back to llm on unknown values"""
+    mode = os.getenv("SOCIAL_ANALYSIS_MODE", DEFAULT_SOCIAL_ANALYSIS_MODE).strip().lower()
+    if mode not in SOCIAL_ANALYSIS_MODES:
+        warn_once(logger, ("SOCIAL_ANALYSIS_MODE", mode), "unknown SOCIAL_ANALYSIS_MODE %r, using %s",
+                  mode, DEFAULT_SOCIAL_ANALYSIS_MODE, extra={"stage": "analysis"})
+        return DEFAULT_SOCIAL_ANALYSIS_MODE
+    return mode
+
+
+def _resolve_mode(mode: Optional[str]) -> str:
+    if mode is None:
+        return get_social_analysis_mode()
+    if mode not in SOCIAL_ANALYSIS_MODES:
+        raise ValueError(f"Unknown social analysis mode '{mode}', expected one of {SOCIAL_ANALYSIS_MODES}")
+    return mode
+
+
+def _run_local(text: str, mode: str) -> Tuple[LexiconResult, Optional[str]]:
+    """Local tier: returns the result and why it must escalate (None to serve it)"""
+    start = time.perf_counter()
+    result = classify_social_context(text)
+    _stats.record_tier("local", (time.perf_counter() - start) * 1000)
+
+    escalation = None
+    if mode == "cascade":
+        if len(text) > int(os.getenv("SOCIAL_ANALYSIS_MAX_LOCAL_CHARS", "280")):
+            escalation = "too_long"
+        elif result.confidence < float(os.getenv("SOCIAL_ANALYSIS_MIN_CONFIDENCE", "0.7")):
+            escalation = "low_confidence"
+    _stats.record_decision(result.confidence, escalation)
+    return result, escalation
+
+
+def select_social_analysis(text: str, mode: Optional[str] = None) -> SocialAnalysis:
+    """
+    Analyze a message using the configured analysis mode.
+
+    Args:
+        text: User's message to analyze
+        mode: Override for SOCIAL_ANALYSIS_MODE
+
+    Returns:
+        SocialAnalysis object with structured signals
+
+    Raises:
+        ValueError: If `mode` is unknown, or OPENROUTER_API_KEY is not set
+            when the model is called
+    """
+    mode = _resolve_mode(mode)
+    if mode != "llm":
+        result, escalation = _run_local(text, mode)
+        if escalation is None:
+            return result.analysis
+
+    start = time.perf_counter()
+    try:
+        return analyzer.analyze_social_context(text)
+    finally:
+        _stats.record_tier("llm", (time.perf_counter() - start) * 1000)
+
+
+async def aselect_social_analysis(text: str, mode: Optional[str] = None) -> SocialAnalysis:
+    """
+    Async counterpart of select_social_analysis().
+
+    Args:
+        text: User's message to analyze
+        mode: Override for SOCIAL_ANALYSIS_MODE
+
+    Returns:
+        SocialAnalysis object with structured signals
+    """
+    mode = _resolve_mode(mode)
+    if mode != "llm":
+        result, escalation = _run_local(text, mode)
+        if escalation is None:
+            return result.analysis
+
+    start = time.perf_counter()
+    try:
+        return await analyzer.aanalyze_social_context(text)
+    finally:
+        _stats.record_tier("llm", (time.perf_counter() - start) * 1000)
@@ -0,0 +1,121 @@
+"""
+Fused Analysis + Policy Extractor
+
+Returns both the SocialAnalysis and the BehaviorPolicy from a single
+structured completion instead of two serialized model calls. The system
+prompt is assembled from the two registered stage prompts, so edits to
+either prompt apply here too.
+
+Unlike the staged functions this module does not fall back to defaults:
+it raises on any API or validation error so the caller can fall back to
+the staged calls.
+"""
+
+import json
+from typing import Tuple
+
+from llm import DEFAULT_MODEL, get_llm_client, get_async_llm_client, get_prompt
+from policy_engine import BehaviorPolicy
+from telemetry.metrics import track_llm_call
+from .analyzer import PROMPT_NAME as ANALYSIS_PROMPT_NAME
+from .models import SocialAnalysis
+
+
+POLICY_PROMPT_NAME = "behavior_policy"
+
+FUSED_HEADER = """You do two jobs in ONE pass over the user's message:
+
+PART 1 - analyze the emotional and social context (rules below).
+PART 2 - decide the behavior policy for the reply, using your PART 1
+analysis as the context (rules below).
+
+The output instructions inside each part describe the shape of that
+part's object only. Return ONE JSON object and nothing else:
+
+{
+  "analysis": { ...PART 1 fields... },
+  "policy": { ...PART 2 fields... }
+}
+"""
+
+
+def _build_messages(text: str) -> list:
+    """Chat messages for the fused call"""
+    system_prompt = "\n\n".join([
+        FUSED_HEADER,
+        "=== PART 1: SOCIAL ANALYSIS ===",
+        get_prompt(ANALYSIS_PROMPT_NAME),
+        "=== PART 2: BEHAVIOR POLICY ===",
+        get_prompt(POLICY_PROMPT_NAME),
+    ])
+    return [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": text}
+    ]
+
+
+def _parse_fused(response_text: str) -> Tuple[SocialAnalysis, BehaviorPolicy]:
+    """Parse and validate the combined JSON object"""
+    response_text = response_text.strip()
+
+    # Handle markdown code blocks
+    if response_text.startswith("```"):
+        lines = response_text.split("\n")
+        response_text = "\n".join(lines[1:-1])
+
+    data = json.loads(response_text)
+    return SocialAnalysis(**data["analysis"]), BehaviorPolicy(**data["policy"])
+
+
+def analyze_and_decide(text: str) -> Tuple[SocialAnalysis, BehaviorPolicy]:
+    """
+    Analyze a message and decide the behavior policy in one model call.
+
+    Args:
+        text: User's message to analyze
+
+    Returns:
+        (SocialAnalysis, BehaviorPolicy) tuple
+
+    Raises:
+        ValueError: If OPENROUTER_API_KEY is not set
+        Exception: Any API, JSON or validation error (no fallback here)
+
+    Example:
+        >>> analysis, policy = analyze_and_decide("Boss yelled at me, need help")
+        >>> print(analysis.relationship, policy.mode)  # authority diplomatic_advisor
+    """
+    client = get_llm_client()
+    with track_llm_call("analysis_policy", DEFAULT_MODEL):
+        response = client.chat.completions.create(
+            model=DEFAULT_MODEL,
+            messages=_build_messages(text),
+            response_format={ "type": "json_object" },
+            extra_body={"reasoning": {"enabled": True}}
+        )
+    return _parse_fused(response.choices[0].message.content)
+
+
+async def aanalyze_and_decide(text: str) -> Tuple[SocialAnalysis, BehaviorPolicy]:
+    """
+    Async counterpart of analyze_and_decide().
+
+    Args:
+        text: User's message to analyze
+
+    Returns:
+        (SocialAnalysis, BehaviorPolicy) tuple
+
+    Raises:
+        ValueError: If OPENROUTER_API_KEY is not set
+        Exception: Any API, JSON or validation error (no fallback here)
+    """
+    client = get_async_llm_client()
+    with track_llm_call("analysis_policy", DEFAULT_MODEL):
+        response = await client.chat.completions.create(
+            model=DEFAULT_MODEL,
+            messages=_build_messages(text),
+            response_format={ "type": "json_object" },
+            extra_body={"reasoning": {"enabled": True}}
+        )
+    return _parse_fused(response.choices[0].message.content)
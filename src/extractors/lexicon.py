@@ -0,0 +1,394 @@
+"""
+Lexicon Social Analyzer
+
+Offline Hinglish/English classifier that fills the SocialAnalysis fields
+from word lists instead of a model call. Handles negation ("khush nahi",
+"not worried"), intensifiers and downtoners ("bahut", "so", "thoda"),
+elongation ("sooo"), exclamation marks, ALL CAPS and emoji.
+
+Returns the analysis together with a 0-1 confidence score so callers can
+decide whether to trust it or escalate to the LLM analyzer.
+"""
+
+import re
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from .models import SocialAnalysis
+
+
+@dataclass(frozen=True)
+class LexiconResult:
+    """Local analysis plus how much to trust it"""
+
+    analysis: SocialAnalysis
+    confidence: float
+    evidence: Tuple[str, ...]   # "category:label:term" for every hit
+
+
+# ---------------------------------------------------------------------------
+# Lexicons: label -> {term: weight}. Multi-word terms are matched as phrases.
+# ---------------------------------------------------------------------------
+
+EMOTION_LEXICON: Dict[str, Dict[str, float]] = {
+    "frustration": {
+        "frustrated": 1.5, "frustrating": 1.5, "annoyed": 1.2, "annoying": 1.2,
+        "irritated": 1.2, "irritating": 1.2, "ugh": 1.0, "stuck": 0.8, "late": 0.8,
+        "delay": 0.8, "delayed": 0.8, "again": 0.5, "pareshan": 1.2, "tang": 1.0,
+        "bakwas": 1.0, "pak gaya": 1.5, "pak gayi": 1.5, "phir se": 0.8,
+        "hadd hai": 1.5, "dimag kharab": 1.5, "fed up": 1.5, "tired of": 1.2,
+        "sick of": 1.2, "chut gayi": 1.0, "chut gaya": 1.0, "missed": 0.6,
+    },
+    "anger": {
+        "angry": 1.5, "pissed": 1.5, "furious": 2.0, "mad": 1.0, "hate": 1.2,
+        "gussa": 1.5, "yelled": 1.2, "shouted": 1.2, "chillaya": 1.2,
+        "daanta": 1.2, "daant": 1.0, "rage": 1.8, "disrespect": 1.2,
+        "insulted": 1.5, "pissed off": 2.0, "fed up": 0.5, "unfair": 0.8,
+        "fight": 0.8, "jhagda": 1.0, "ladai": 1.0, "argument": 0.8,
+    },
+    "sadness": {
+        "sad": 1.5, "upset": 1.2, "hurt": 1.2, "lonely": 1.5, "alone": 1.0,
+        "cry": 1.5, "crying": 1.5, "rona": 1.5, "ro raha": 1.5, "ro rahi": 1.5,
+        "dukhi": 1.5, "udaas": 1.5, "akela": 1.2, "akeli": 1.2, "heartbroken": 2.0,
+        "depressed": 2.0, "disappointed": 1.2, "miss": 0.8, "broke up": 1.5,
+        "dil toot": 2.0, "low": 0.6, "down": 0.6, "failed": 1.0, "rejected": 1.2,
+    },
+    "anxiety": {
+        "anxious": 1.5, "anxiety": 1.5, "worried": 1.5, "worry": 1.2, "nervous": 1.5,
+        "scared": 1.2, "stress": 1.2, "stressed": 1.5, "tension": 1.2, "tensed": 1.5,
+        "darr": 1.2, "dar": 0.8, "ghabrahat": 1.5, "panic": 1.8, "exam": 0.8,
+        "exams": 0.8, "deadline": 0.8, "deadlines": 0.8, "interview": 0.8,
+        "results": 0.6, "kya hoga": 1.5, "overthinking": 1.2, "afraid": 1.2,
+    },
+    "confusion": {
+        "confused": 1.5, "confusing": 1.2, "unsure": 1.2, "lost": 0.8,
+        "dilemma": 1.5, "samajh nahi": 1.5, "pata nahi": 1.0, "don't know": 1.0,
+        "dont know": 1.0, "kya karu": 1.0, "kya karun": 1.0, "no idea": 1.0,
+        "which one": 1.0, "not sure": 1.2,
+    },
+    "boredom": {
+        "bored": 1.8, "boring": 1.5, "bore": 1.5, "waiting": 1.0, "wait": 0.6,
+        "timepass": 1.5, "time pass": 1.5, "idle": 1.0, "khali": 1.0,
+        "nothing to do": 1.8, "kuch nahi kar": 1.2, "free hoon": 1.0,
+    },
+    "happy": {
+        "happy": 1.5, "excited": 1.5, "great": 1.0, "awesome": 1.2, "amazing": 1.2,
+        "yay": 1.5, "khush": 1.5, "maza": 1.2, "mazaa": 1.2, "mast": 1.0,
+        "badhiya": 1.2, "promoted": 1.5, "promotion": 1.2, "passed": 1.0,
+        "selected": 1.2, "love it": 1.2, "finally": 0.5, "good news": 1.5,
+    },
+}
+
+EMOJI_LEXICON: Dict[str, Tuple[str, float]] = {
+    "😡": ("anger", 1.5), "🤬": ("anger", 2.0), "😠": ("anger", 1.5),
+    "😤": ("frustration", 1.5), "🙄": ("frustration", 1.0), "😩": ("frustration", 1.2),
+    "😢": ("sadness", 1.5), "😭": ("sadness", 1.5), "💔": ("sadness", 1.5), "😞": ("sadness", 1.2),
+    "😔": ("sadness", 1.2),
+    "😰": ("anxiety", 1.5), "😟": ("anxiety", 1.2), "😨": ("anxiety", 1.2), "😬": ("anxiety", 1.0),
+    "🤔": ("confusion", 1.0), "😕": ("confusion", 1.0),
+    "🥱": ("boredom", 1.5), "😴": ("boredom", 1.0),
+    "😊": ("happy", 1.2), "😀": ("happy", 1.2), "😁": ("happy", 1.2), "🎉": ("happy", 1.5),
+    "❤": ("happy", 0.8), "🥳": ("happy", 1.5),
+}
+
+NEED_LEXICON: Dict[str, Dict[str, float]] = {
+    "advice": {
+        "what should i do": 2.0, "kya karu": 1.5, "kya karun": 1.5, "kya karna chahiye": 2.0,
+        "how do i": 1.5, "how to": 1.2, "how can i": 1.5, "kaise": 1.0, "help": 1.0,
+        "suggest": 1.2, "advice": 1.5, "tips": 1.2, "batao": 1.0,
+    },
+    "decision_help": {
+        "should i": 1.5, "or should": 1.5, "ya phir": 1.5, "choose": 1.2, "decide": 1.5,
+        "decision": 1.2, "which one": 1.5, "karu ya": 1.5, "option": 0.8, "options": 0.8,
+        "offer": 0.6, "between": 0.8,
+    },
+    "reassurance": {
+        "will it be ok": 2.0, "will it be okay": 2.0, "is it okay": 1.5, "is it normal": 1.5,
+        "hoga na": 1.5, "sab theek": 1.5, "theek ho jayega": 1.5, "normal hai": 1.2,
+        "am i going to": 1.2,
+    },
+    "distraction": {
+        "bored": 1.5, "timepass": 1.5, "time pass": 1.5, "something fun": 1.5, "joke": 1.2,
+        "distract": 1.5, "baat karo": 1.2, "entertain": 1.2, "waiting": 0.8,
+    },
+    "validation": {
+        "am i wrong": 2.0, "was i wrong": 2.0, "was i right": 2.0, "am i right": 2.0,
+        "right na": 1.5, "galat": 1.0, "sahi tha": 1.5, "justified": 1.5,
+        "overreacting": 1.5, "unfair": 0.8, "meri galti": 1.5,
+    },
+    "vent": {
+        "can't believe": 1.2, "cant believe": 1.2, "why does": 0.8, "always": 0.6,
+        "every time": 1.0, "har baar": 1.0, "hadd hai": 1.0, "so annoying": 1.2,
+        "need to vent": 2.0, "just saying": 1.0, "ugh": 0.8,
+    },
+}
+
+RELATIONSHIP_LEXICON: Dict[str, Dict[str, float]] = {
+    "authority": {
+        "boss": 2.0, "manager": 2.0, "sir": 1.2, "ma'am": 1.2, "maam": 1.2,
+        "teacher": 1.5, "professor": 1.5, "prof": 1.2, "hod": 1.5, "principal": 1.5,
+        "senior": 1.2, "team lead": 1.5, "tl": 1.0, "supervisor": 1.5, "ceo": 1.5,
+        "client": 1.0, "mentor": 1.0, "office": 0.6,
+    },
+    "friend": {
+        "friend": 1.5, "friends": 1.5, "dost": 1.5, "doston": 1.2, "roommate": 1.5,
+        "classmate": 1.2, "colleague": 1.0, "bestie": 1.5, "best friend": 2.0,
+    },
+    "family": {
+        "mom": 1.5, "mummy": 1.5, "maa": 1.2, "papa": 1.5, "dad": 1.5, "father": 1.5,
+        "mother": 1.5, "parents": 1.5, "sister": 1.5, "behen": 1.5, "didi": 1.5,
+        "brother": 1.2, "bhaiya": 1.2, "chacha": 1.5, "relatives": 1.5,
+        "rishtedaar": 1.5, "gharwale": 1.5, "ghar wale": 1.5, "family": 1.2,
+    },
+    "romantic": {
+        "girlfriend": 2.0, "gf": 1.5, "boyfriend": 2.0, "bf": 1.5, "partner": 1.2,
+        "crush": 1.5, "wife": 2.0, "husband": 2.0, "date": 0.8, "ex": 1.0, "bae": 1.5,
+    },
+    "service_person": {
+        "waiter": 2.0, "delivery": 1.2, "customer care": 2.0, "customer service": 2.0,
+        "support": 0.8, "driver": 1.5, "auto wala": 1.5, "autowala": 1.5, "uber": 1.0,
+        "ola": 1.0, "swiggy": 1.0, "zomato": 1.0, "cashier": 1.5, "shopkeeper": 1.5,
+        "dukaandar": 1.5, "receptionist": 1.5, "landlord": 1.2, "tt": 1.0, "conductor": 1.5,
+    },
+    "stranger": {
+        "stranger": 2.0, "random guy": 1.5, "random person": 1.5, "some guy": 1.2,
+        "someone": 0.6, "koi": 0.4, "aadmi": 0.8, "aunty": 0.8, "uncle": 0.8,
+    },
+}
+
+CONFLICT_TERMS = {
+    "fight", "fought", "argue", "argument", "yelled", "shouted", "chillaya",
+    "ladai", "jhagda", "confront", "complaint", "complain", "insulted",
+    "threatened", "fired", "warning", "daanta",
+}
+
+NEGATORS = {"not", "no", "never", "dont", "don't", "didnt", "didn't", "isnt", "isn't",
+            "wasnt", "wasn't", "aint", "mat", "nahi", "nahin", "nai", "na"}
+# Hindi negators usually follow the word they negate ("khush nahi hoon")
+POST_NEGATORS = {"nahi", "nahin", "nai", "na"}
+
+INTENSIFIERS = {
+    "very": 1.5, "so": 1.4, "really": 1.4, "extremely": 1.8, "too": 1.3, "super": 1.5,
+    "totally": 1.5, "bahut": 1.5, "bohot": 1.5, "bht": 1.5, "itna": 1.4, "itni": 1.4,
+    "ekdum": 1.5, "bilkul": 1.4, "kaafi": 1.3, "bhot": 1.5, "damn": 1.3,
+}
+DOWNTONERS = {"thoda": 0.6, "little": 0.6, "bit": 0.6, "slightly": 0.5, "kinda": 0.7,
+              "somewhat": 0.7, "halka": 0.6}
+
+# Negated emotions either flip ("not happy" -> sadness) or are dropped
+NEGATION_FLIPS = {"happy": "sadness"}
+
+NEGATIVE_EMOTIONS = {"frustration", "anger", "sadness", "anxiety"}
+
+# Emotions that rarely reach strong intensity, with their cap
+LOW_AROUSAL_EMOTIONS = {"boredom": 6, "confusion": 7}
+
+_TOKEN_RE = re.compile(r"[a-z]+(?:'[a-z]+)?")
+_ELONGATION_RE = re.compile(r"(.)\1{2,}")
+
+
+def _split_lexicon(lexicon: Dict[str, Dict[str, float]]):
+    """Split a lexicon into single-word and phrase lookups"""
+    words: Dict[str, List[Tuple[str, float]]] = {}
+    phrases: Dict[str, List[Tuple[str, float]]] = {}
+    for label, terms in lexicon.items():
+        for term, weight in terms.items():
+            target = phrases if (" " in term or "'" in term) else words
+            target.setdefault(term, []).append((label, weight))
+    pattern = None
+    if phrases:
+        alternatives = sorted(phrases, key=len, reverse=True)
+        pattern = re.compile(r"(?<![a-z])(?:" + "|".join(re.escape(p) for p in alternatives) + r")(?![a-z])")
+    return words, phrases, pattern
+
+
+_EMOTION_WORDS, _EMOTION_PHRASES, _EMOTION_PHRASE_RE = _split_lexicon(EMOTION_LEXICON)
+_NEED_WORDS, _NEED_PHRASES, _NEED_PHRASE_RE = _split_lexicon(NEED_LEXICON)
+_RELATION_WORDS, _RELATION_PHRASES, _RELATION_PHRASE_RE = _split_lexicon(RELATIONSHIP_LEXICON)
+
+
+def _normalize_token(token: str, lookup: Dict) -> str:
+    """Map elongated spellings ("sooo", "bahuuut") onto lexicon entries"""
+    if token in lookup or not _ELONGATION_RE.search(token):
+        return token
+    doubled = _ELONGATION_RE.sub(r"\1\1", token)
+    if doubled in lookup:
+        return doubled
+    return _ELONGATION_RE.sub(r"\1", token)
+
+
+def _is_negated(tokens: List[str], i: int) -> bool:
+    if any(t in NEGATORS for t in tokens[max(0, i - 2):i]):
+        return True
+    return i + 1 < len(tokens) and tokens[i + 1] in POST_NEGATORS
+
+
+def _modifier(tokens: List[str], i: int) -> float:
+    """Product of intensifier/downtoner weights in the two preceding tokens"""
+    factor = 1.0
+    for t in tokens[max(0, i - 2):i]:
+        t = _normalize_token(t, INTENSIFIERS)
+        factor *= INTENSIFIERS.get(t, DOWNTONERS.get(t, 1.0))
+    return factor
+
+
+def _score_words(tokens: List[str], words: Dict, scores: Dict[str, float],
+                 evidence: List[str], category: str, use_modifiers: bool) -> Tuple[int, float]:
+    """Add single-word hits to `scores`; returns (negated hit count, strongest modifier)"""
+    negated = 0
+    strongest = 1.0
+    for i, raw in enumerate(tokens):
+        token = _normalize_token(raw, words)
+        hits = words.get(token)
+        if not hits:
+            continue
+        factor = 1.0
+        if use_modifiers:
+            factor = _modifier(tokens, i)
+            if token != raw:
+                factor *= 1.3  # elongation is emphasis
+            strongest = max(strongest, factor)
+            if _is_negated(tokens, i):
+                negated += 1
+                for label, weight in hits:
+                    flipped = NEGATION_FLIPS.get(label)
+                    if flipped:
+                        scores[flipped] = scores.get(flipped, 0.0) + weight * 0.8
+                        evidence.append(f"{category}:{flipped}:not {token}")
+                continue
+        for label, weight in hits:
+            scores[label] = scores.get(label, 0.0) + weight * factor
+            evidence.append(f"{category}:{label}:{token}")
+    return negated, strongest
+
+
+def _score_phrases(text: str, phrases: Dict, pattern: Optional[re.Pattern],
+                   scores: Dict[str, float], evidence: List[str], category: str) -> None:
+    if pattern is None:
+        return
+    for match in pattern.finditer(text):
+        phrase = match.group(0)
+        for label, weight in phrases[phrase]:
+            scores[label] = scores.get(label, 0.0) + weight
+            evidence.append(f"{category}:{label}:{phrase}")
+
+
+def _top_two(scores: Dict[str, float]) -> Tuple[Optional[str], float, float]:
+    if not scores:
+        return None, 0.0, 0.0
+    ranked = sorted(scores.items(), key=lambda kv: kv[1], reverse=True)
+    second = ranked[1][1] if len(ranked) > 1 else 0.0
+    return ranked[0][0], ranked[0][1], second
+
+
+def classify_social_context(text: str) -> LexiconResult:
+    """
+    Analyze a message locally, without any model call.
+
+    Args:
+        text: User's message (English, Hindi in Latin script, or a mix)
+
+    Returns:
+        LexiconResult with a SocialAnalysis, a 0-1 confidence and the
+        lexicon hits that produced it
+
+    Example:
+        >>> result = classify_social_context("bhai train late ho gayi 😤")
+        >>> result.analysis.primary_emotion  # "frustration"
+        >>> result.confidence                # ~0.7
+    """
+    lowered = text.lower()
+    tokens = _TOKEN_RE.findall(lowered)
+    evidence: List[str] = []
+
+    # Emotion
+    emotion_scores: Dict[str, float] = {}
+    negated, strongest = _score_words(tokens, _EMOTION_WORDS, emotion_scores, evidence, "emotion", True)
+    _score_phrases(lowered, _EMOTION_PHRASES, _EMOTION_PHRASE_RE, emotion_scores, evidence, "emotion")
+    for char in text:
+        hit = EMOJI_LEXICON.get(char)
+        if hit:
+            label, weight = hit
+            emotion_scores[label] = emotion_scores.get(label, 0.0) + weight
+            evidence.append(f"emotion:{label}:{char}")
+
+    emotion, top, second = _top_two(emotion_scores)
+    if emotion is None:
+        emotion = "neutral"
+
+    # Intensity: base from emotion strength, plus punctuation/caps/modifier emphasis
+    exclamations = text.count("!")
+    shouting = sum(1 for word in text.split() if len(word) >= 3 and word.isalpha() and word.isupper())
+    if emotion == "neutral":
+        intensity = 3
+    else:
+        intensity = 3 + round(min(top, 4.0))
+        intensity += (2 if exclamations >= 3 else 1 if exclamations else 0) + min(shouting, 2)
+        if strongest > 1.2:
+            intensity += 1
+        elif strongest < 1.0:
+            intensity -= 1
+        if emotion in LOW_AROUSAL_EMOTIONS:
+            intensity = min(intensity, LOW_AROUSAL_EMOTIONS[emotion])
+    intensity = max(1, min(10, intensity))
+
+    # User need
+    need_scores: Dict[str, float] = {}
+    _score_words(tokens, _NEED_WORDS, need_scores, evidence, "need", False)
+    _score_phrases(lowered, _NEED_PHRASES, _NEED_PHRASE_RE, need_scores, evidence, "need")
+    user_need, need_top, need_second = _top_two(need_scores)
+    need_explicit = user_need is not None
+    if not need_explicit:
+        if "?" in text:
+            user_need = "advice"
+        elif emotion in ("frustration", "anger", "sadness"):
+            user_need = "vent"
+        elif emotion == "anxiety":
+            user_need = "reassurance"
+        elif emotion == "boredom":
+            user_need = "distraction"
+        else:
+            user_need = "advice"
+
+    # Relationship
+    relation_scores: Dict[str, float] = {}
+    _score_words(tokens, _RELATION_WORDS, relation_scores, evidence, "relationship", False)
+    _score_phrases(lowered, _RELATION_PHRASES, _RELATION_PHRASE_RE, relation_scores, evidence, "relationship")
+    relationship, _, _ = _top_two(relation_scores)
+    relationship = relationship or "unknown"
+
+    # Conflict risk follows the prompt: boss/manager -> high
+    conflict = any(t in CONFLICT_TERMS for t in tokens)
+    if relationship == "authority":
+        conflict_risk = "high" if (conflict or emotion in NEGATIVE_EMOTIONS) else "medium"
+    elif conflict:
+        conflict_risk = "medium" if relationship in ("family", "romantic", "friend", "unknown") else "high"
+    elif emotion == "anger" and intensity >= 7:
+        conflict_risk = "medium"
+    else:
+        conflict_risk = "low"
+
+    # Confidence: emotion margin and strength, explicit need, known relationship
+    if emotion == "neutral":
+        emotion_conf = 0.25 if negated else 0.35
+    else:
+        share = top / (top + second)
+        strength = min(1.0, top / 2.0)
+        emotion_conf = 0.5 * share + 0.5 * strength
+    if need_explicit:
+        need_conf = 0.6 + 0.3 * (need_top - need_second) / need_top
+    else:
+        need_conf = 0.5
+    relation_conf = 0.9 if relation_scores else 0.6
+    confidence = 0.5 * emotion_conf + 0.3 * need_conf + 0.2 * relation_conf
+    if len(tokens) > 40:
+        confidence *= 0.85  # word lists miss context in long messages
+
+    analysis = SocialAnalysis(
+        primary_emotion=emotion,
+        intensity=intensity,
+        user_need=user_need,
+        relationship=relationship,
+        conflict_risk=conflict_risk,
+    )
+    return LexiconResult(analysis=analysis, confidence=round(confidence, 3), evidence=tuple(evidence))
@@ -0,0 +1,33 @@
+"""LLM module - shared OpenRouter clients and prompt registry for every pipeline stage"""
+
+from .client import (
+    DEFAULT_MODEL,
+    OPENROUTER_BASE_URL,
+    get_llm_client,
+    get_async_llm_client,
+    close_llm_clients,
+    aclose_llm_clients,
+)
+from .prompts import (
+    Prompt,
+    PromptRegistry,
+    get_prompt_registry,
+    register_prompt,
+    get_prompt,
+    get_prompt_version,
+)
+
+__all__ = [
+    "DEFAULT_MODEL",
+    "OPENROUTER_BASE_URL",
+    "get_llm_client",
+    "get_async_llm_client",
+    "close_llm_clients",
+    "aclose_llm_clients",
+    "Prompt",
+    "PromptRegistry",
+    "get_prompt_registry",
+    "register_prompt",
+    "get_prompt",
+    "get_prompt_version",
+]
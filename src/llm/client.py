@@ -0,0 +1,156 @@
+"""
+Shared OpenRouter Client
+
+One process-wide, keep-alive httpx connection pool behind every OpenAI
+client, so analysis, policy and composer calls reuse warm TLS
+connections instead of opening new ones per call.
+
+Configuration (environment variables):
+    OPENROUTER_BASE_URL         API base URL (default: https://openrouter.ai/api/v1)
+    OPENROUTER_MODEL            Model used by all stages
+    LLM_MAX_CONNECTIONS         Max open connections in the pool (default: 100)
+    LLM_MAX_KEEPALIVE           Max idle keep-alive connections (default: 20)
+    LLM_KEEPALIVE_EXPIRY        Seconds an idle connection is kept (default: 30)
+    LLM_TIMEOUT                 Overall request timeout in seconds (default: 60)
+    LLM_CONNECT_TIMEOUT         Connect timeout in seconds (default: 10)
+    LLM_MAX_RETRIES             Retries on transient errors (default: 2)
+"""
+
+import os
+import asyncio
+import threading
+import weakref
+from typing import Dict, Optional
+
+import httpx
+from openai import OpenAI, AsyncOpenAI
+
+
+OPENROUTER_BASE_URL = os.getenv("OPENROUTER_BASE_URL", "https://openrouter.ai/api/v1")
+DEFAULT_MODEL = os.getenv("OPENROUTER_MODEL", "nvidia/nemotron-3-super-120b-a12b:free")
+
+_lock = threading.Lock()
+_http_client: Optional[httpx.Client] = None
+_clients: Dict[str, OpenAI] = {}
+
+# httpx async pools are bound to the event loop that first used them,
+# so async clients are kept per loop (normally there is exactly one).
+_async_pools: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict]" = weakref.WeakKeyDictionary()
+
+
+def _limits() -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=int(os.getenv("LLM_MAX_CONNECTIONS", "100")),
+        max_keepalive_connections=int(os.getenv("LLM_MAX_KEEPALIVE", "20")),
+        keepalive_expiry=float(os.getenv("LLM_KEEPALIVE_EXPIRY", "30")),
+    )
+
+
+def _timeout() -> httpx.Timeout:
+    return httpx.Timeout(
+        float(os.getenv("LLM_TIMEOUT", "60")),
+        connect=float(os.getenv("LLM_CONNECT_TIMEOUT", "10")),
+    )
+
+
+def _max_retries() -> int:
+    return int(os.getenv("LLM_MAX_RETRIES", "2"))
+
+
+def _resolve_api_key(api_key: Optional[str]) -> str:
+    key = api_key or os.getenv("OPENROUTER_API_KEY")
+    if not key:
+        raise ValueError("OPENROUTER_API_KEY not found in environment")
+    return key
+
+
+def get_llm_client(api_key: Optional[str] = None) -> OpenAI:
+    """
+    Get the shared synchronous OpenRouter client.
+
+    Args:
+        api_key: Override key (defaults to OPENROUTER_API_KEY). Clients for
+            different keys still share one connection pool.
+
+    Returns:
+        OpenAI client backed by the process-wide httpx pool
+
+    Raises:
+        ValueError: If no API key is available
+    """
+    global _http_client
+    key = _resolve_api_key(api_key)
+
+    client = _clients.get(key)
+    if client is not None:
+        return client
+
+    with _lock:
+        if _http_client is None:
+            _http_client = httpx.Client(limits=_limits(), timeout=_timeout())
+        client = _clients.get(key)
+        if client is None:
+            client = OpenAI(
+                base_url=OPENROUTER_BASE_URL,
+                api_key=key,
+                http_client=_http_client,
+                max_retries=_max_retries(),
+            )
+            _clients[key] = client
+    return client
+
+
+def get_async_llm_client(api_key: Optional[str] = None) -> AsyncOpenAI:
+    """
+    Get the shared async OpenRouter client for the running event loop.
+
+    Must be called from inside a coroutine.
+
+    Args:
+        api_key: Override key (defaults to OPENROUTER_API_KEY)
+
+    Returns:
+        AsyncOpenAI client backed by this loop's httpx pool
+
+    Raises:
+        ValueError: If no API key is available
+    """
+    key = _resolve_api_key(api_key)
+    loop = asyncio.get_running_loop()
+
+    pool = _async_pools.get(loop)
+    if pool is None:
+        pool = {
+            "http_client": httpx.AsyncClient(limits=_limits(), timeout=_timeout()),
+            "clients": {},
+        }
+        _async_pools[loop] = pool
+
+    client = pool["clients"].get(key)
+    if client is None:
+        client = AsyncOpenAI(
+            base_url=OPENROUTER_BASE_URL,
+            api_key=key,
+            http_client=pool["http_client"],
+            max_retries=_max_retries(),
+        )
+        pool["clients"][key] = client
+    return client
+
+
+def close_llm_clients() -> None:
+    """Close the synchronous pool (call on shutdown)"""
+    global _http_client
+    with _lock:
+        if _http_client is not None:
+            _http_client.close()
+        _http_client = None
+        _clients.clear()
+
+
+async def aclose_llm_clients() -> None:
+    """Close the synchronous pool and the running loop's async pool"""
+    close_llm_clients()
+    pool = _async_pools.pop(asyncio.get_running_loop(), None)
+    if pool is not None:
+        await pool["http_client"].aclose()
@@ -0,0 +1,110 @@
+"""
+Prompt Registry
+
+System prompts are read from disk once, when their module registers
+them at import time, and served from memory afterwards. Each prompt
+carries a content hash so caches keyed on prompt content can tell
+when a prompt changed.
+
+Set PROMPT_HOT_RELOAD=1 in development to re-read a prompt whenever
+its file's mtime changes.
+"""
+
+import os
+import hashlib
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Optional
+
+
+@dataclass(frozen=True)
+class Prompt:
+    """One loaded prompt template"""
+
+    name: str
+    path: Path
+    text: str
+    version: str       # First 12 hex chars of the SHA-256 of `text`
+    mtime: float
+
+
+def _read_prompt(name: str, path: Path) -> Prompt:
+    with open(path, "r") as f:
+        text = f.read()
+    return Prompt(
+        name=name,
+        path=path,
+        text=text,
+        version=hashlib.sha256(text.encode("utf-8")).hexdigest()[:12],
+        mtime=path.stat().st_mtime,
+    )
+
+
+class PromptRegistry:
+    """Name -> Prompt map with optional mtime-based hot reload"""
+
+    def __init__(self, hot_reload: Optional[bool] = None):
+        if hot_reload is None:
+            hot_reload = os.getenv("PROMPT_HOT_RELOAD", "").lower() in ("1", "true", "yes")
+        self.hot_reload = hot_reload
+        self._prompts: Dict[str, Prompt] = {}
+        self._lock = threading.Lock()
+
+    def register(self, name: str, path: Path) -> Prompt:
+        """Load the prompt at `path` and serve it under `name`"""
+        prompt = _read_prompt(name, Path(path))
+        with self._lock:
+            self._prompts[name] = prompt
+        return prompt
+
+    def prompt(self, name: str) -> Prompt:
+        """
+        Get a registered prompt.
+
+        Raises:
+            KeyError: If no prompt is registered under `name`
+        """
+        prompt = self._prompts[name]
+        if self.hot_reload:
+            try:
+                if prompt.path.stat().st_mtime != prompt.mtime:
+                    prompt = self.register(name, prompt.path)
+            except OSError:
+                pass  # File vanished mid-edit; keep serving the last good copy
+        return prompt
+
+    def get(self, name: str) -> str:
+        """Prompt text for `name`"""
+        return self.prompt(name).text
+
+    def version(self, name: str) -> str:
+        """Content hash for `name`"""
+        return self.prompt(name).version
+
+    def versions(self) -> Dict[str, str]:
+        """Content hash of every registered prompt"""
+        return {name: self.version(name) for name in list(self._prompts)}
+
+
+_registry = PromptRegistry()
+
+
+def get_prompt_registry() -> PromptRegistry:
+    """Get the process-wide prompt registry"""
+    return _registry
+
+
+def register_prompt(name: str, path: Path) -> Prompt:
+    """Register a prompt file with the process-wide registry"""
+    return _registry.register(name, path)
+
+
+def get_prompt(name: str) -> str:
+    """Prompt text from the process-wide registry"""
+    return _registry.get(name)
+
+
+def get_prompt_version(name: str) -> str:
+    """Prompt content hash from the process-wide registry"""
+    return _registry.version(name)
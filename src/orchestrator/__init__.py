@@ -1,6 +1,6 @@
 """Orchestrator module - Main agent entry point"""
 
-from .buddy_agent import buddy_chat, buddy_chat_simple
+from .buddy_agent import buddy_chat, abuddy_chat, abuddy_chat_stream, buddy_chat_simple
 
-__all__ = ["buddy_chat", "buddy_chat_simple"]
+__all__ = ["buddy_chat", "abuddy_chat", "abuddy_chat_stream", "buddy_chat_simple"]
 
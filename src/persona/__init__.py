@@ -13,6 +13,8 @@ from .user_context import (
     log_interaction,
     get_interaction_stats
 )
+from .learning import derive_traits, merge_traits, describe_adaptations
+from .writer import BackgroundWriter, get_background_writer, shutdown_background_writer
 
 __all__ = [
     "PostgresDB",
@@ -26,5 +28,11 @@ __all__ = [
     "update_user_traits",
     "get_user_traits",
     "log_interaction",
-    "get_interaction_stats"
+    "get_interaction_stats",
+    "derive_traits",
+    "merge_traits",
+    "describe_adaptations",
+    "BackgroundWriter",
+    "get_background_writer",
+    "shutdown_background_writer"
 ]
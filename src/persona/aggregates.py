@@ -0,0 +1,163 @@
+"""
+Interaction Aggregates
+
+Incremental per-user counters (scenario / emotion / mode) plus a small
+ring of recent response lengths, kept in the interaction_aggregates
+table so interaction stats never need a full history scan.
+"""
+
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy.exc import IntegrityError
+
+from .learning import RECENT_RESPONSE_WINDOW
+from .models import Interaction, InteractionAggregate
+
+
+def new_aggregate(user_id: str) -> InteractionAggregate:
+    """Empty aggregate row for a user (not yet added to a session)"""
+    return InteractionAggregate(
+        user_id=user_id,
+        total_interactions=0,
+        scenario_counts={},
+        emotion_counts={},
+        mode_counts={},
+        recent_response_lengths=[],
+        updated_at=datetime.utcnow(),
+    )
+
+
+def apply_interaction(
+    aggregate: InteractionAggregate,
+    scenario: Optional[str],
+    emotion: Optional[str],
+    mode: Optional[str],
+    response_length: Optional[str],
+) -> None:
+    """
+    Fold one interaction into an aggregate.
+
+    JSON columns are reassigned (not mutated in place) so SQLAlchemy
+    notices the change.
+    """
+    aggregate.total_interactions = (aggregate.total_interactions or 0) + 1
+    aggregate.scenario_counts = _increment(aggregate.scenario_counts, scenario or "unknown")
+    aggregate.emotion_counts = _increment(aggregate.emotion_counts, emotion or "unknown")
+    aggregate.mode_counts = _increment(aggregate.mode_counts, mode or "unknown")
+
+    # Keep a slot even without a length, so the ring tracks the last N interactions
+    ring = list(aggregate.recent_response_lengths or []) + [response_length]
+    aggregate.recent_response_lengths = ring[-RECENT_RESPONSE_WINDOW:]
+    aggregate.updated_at = datetime.utcnow()
+
+
+def get_aggregate(user_id: str, session, for_update: bool = False) -> Optional[InteractionAggregate]:
+    """Fetch a user's aggregate row, optionally row-locked for an update"""
+    query = session.query(InteractionAggregate).filter_by(user_id=user_id)
+    if for_update:
+        query = query.with_for_update()
+    return query.first()
+
+
+def rebuild_aggregate(user_id: str, session) -> InteractionAggregate:
+    """
+    Recompute a user's aggregate from their full interaction history.
+
+    Used once per user (lazy backfill, or the backfill command); the row
+    is added to the session but not committed.
+    """
+    aggregate = get_aggregate(user_id, session, for_update=True)
+    if aggregate is None:
+        aggregate = new_aggregate(user_id)
+        session.add(aggregate)
+    else:
+        _reset(aggregate)
+
+    rows = (
+        session.query(
+            Interaction.scenario,
+            Interaction.emotion,
+            Interaction.mode,
+            Interaction.extra_metadata,
+        )
+        .filter_by(user_id=user_id)
+        .order_by(Interaction.timestamp, Interaction.id)
+        .yield_per(1000)
+    )
+    fold_rows(aggregate, rows)
+    return aggregate
+
+
+def lock_or_rebuild_aggregate(user_id: str, session) -> InteractionAggregate:
+    """
+    Row-locked aggregate for an update, rebuilt from history if missing.
+
+    A missing row cannot be locked, so two workers handling a user's
+    first interaction may both insert it. The loser's unique violation
+    rolls back its transaction and it locks the winner's row instead, so
+    call this before adding anything else to the session.
+    """
+    aggregate = get_aggregate(user_id, session, for_update=True)
+    if aggregate is not None:
+        return aggregate
+    try:
+        aggregate = rebuild_aggregate(user_id, session)
+        session.flush()
+        return aggregate
+    except IntegrityError:
+        session.rollback()
+        return get_aggregate(user_id, session, for_update=True) or rebuild_aggregate(user_id, session)
+
+
+def fold_rows(aggregate: InteractionAggregate, rows: Iterable) -> None:
+    """Fold (scenario, emotion, mode, metadata) rows, oldest first, into an aggregate"""
+    scenarios = dict(aggregate.scenario_counts or {})
+    emotions = dict(aggregate.emotion_counts or {})
+    modes = dict(aggregate.mode_counts or {})
+    ring = list(aggregate.recent_response_lengths or [])
+    total = aggregate.total_interactions or 0
+
+    # Accumulate locally, assign once - avoids copying the dicts per row
+    for scenario, emotion, mode, metadata in rows:
+        total += 1
+        scenarios[scenario or "unknown"] = scenarios.get(scenario or "unknown", 0) + 1
+        emotions[emotion or "unknown"] = emotions.get(emotion or "unknown", 0) + 1
+        modes[mode or "unknown"] = modes.get(mode or "unknown", 0) + 1
+        ring.append((metadata or {}).get("response_length"))
+        if len(ring) > RECENT_RESPONSE_WINDOW:
+            del ring[0]
+
+    aggregate.total_interactions = total
+    aggregate.scenario_counts = scenarios
+    aggregate.emotion_counts = emotions
+    aggregate.mode_counts = modes
+    aggregate.recent_response_lengths = ring
+    aggregate.updated_at = datetime.utcnow()
+
+
+def top_keys(counts: Optional[Dict[str, int]], n: int = 3) -> List[str]:
+    """Most frequent keys, ties broken by first appearance"""
+    ranked = sorted((counts or {}).items(), key=lambda x: x[1], reverse=True)
+    return [key for key, _ in ranked[:n]]
+
+
+def recent_lengths(aggregate: Optional[InteractionAggregate]) -> List[str]:
+    """Non-empty response lengths from the ring, oldest first"""
+    if aggregate is None:
+        return []
+    return [length for length in (aggregate.recent_response_lengths or []) if length]
+
+
+def _increment(counts: Optional[Dict[str, int]], key: str) -> Dict[str, int]:
+    updated = dict(counts or {})
+    updated[key] = updated.get(key, 0) + 1
+    return updated
+
+
+def _reset(aggregate: InteractionAggregate) -> None:
+    aggregate.total_interactions = 0
+    aggregate.scenario_counts = {}
+    aggregate.emotion_counts = {}
+    aggregate.mode_counts = {}
+    aggregate.recent_response_lengths = []
@@ -0,0 +1,76 @@
+"""
+Interaction Aggregates Backfill
+
+Rebuilds interaction_aggregates from the full interactions history.
+Safe to re-run: every processed user's aggregate is recomputed from
+scratch.
+
+Usage (from src/):
+    python -m persona.backfill                  # every user with interactions
+    python -m persona.backfill --user demo_user # specific users
+"""
+
+import argparse
+from typing import Iterable, Optional
+
+from .db import get_db_session
+from .models import Interaction
+from .aggregates import rebuild_aggregate
+
+
+def backfill_interaction_aggregates(
+    user_ids: Optional[Iterable[str]] = None,
+    commit_every: int = 100,
+) -> int:
+    """
+    Recompute aggregates for the given users (or everyone).
+
+    Args:
+        user_ids: Users to rebuild; None means every user with interactions
+        commit_every: Users per transaction
+
+    Returns:
+        Number of users backfilled
+
+    Raises:
+        RuntimeError: If the database is unavailable
+    """
+    session = get_db_session()
+    if session is None:
+        raise RuntimeError("Database unavailable - check DATABASE_URL")
+
+    try:
+        if user_ids is None:
+            user_ids = [
+                user_id for (user_id,) in
+                session.query(Interaction.user_id).distinct().order_by(Interaction.user_id)
+            ]
+
+        count = 0
+        for user_id in user_ids:
+            rebuild_aggregate(user_id, session)
+            count += 1
+            if count % commit_every == 0:
+                session.commit()
+                print(f"[backfill] {count} users aggregated")
+        session.commit()
+        return count
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        session.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backfill interaction_aggregates")
+    parser.add_argument("--user", action="append", dest="users", help="User id (repeatable)")
+    parser.add_argument("--commit-every", type=int, default=100, help="Users per transaction")
+    args = parser.parse_args()
+
+    count = backfill_interaction_aggregates(args.users, commit_every=args.commit_every)
+    print(f"[backfill] Done - {count} users aggregated")
+
+
+if __name__ == "__main__":
+    main()
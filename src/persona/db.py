@@ -22,6 +22,8 @@ def _clean_db_url(url: str) -> str:
     """
     parsed = urlparse(url)
     params = parse_qs(parsed.query, keep_blank_values=True)
+    if "channel_binding" not in params:
+        return url  # Nothing to strip; don't round-trip (it mangles sqlite:////abs paths)
     params.pop("channel_binding", None)
     new_query = urlencode({k: v[0] for k, v in params.items()})
     return urlunparse(parsed._replace(query=new_query))
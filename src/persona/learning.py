@@ -0,0 +1,105 @@
+"""
+Trait Learning Rules
+
+Pure functions that turn behavioral signals into traits and traits into
+user-facing adaptation messages. Shared by the database layer and the
+orchestrator, which uses them to predict the learning message without
+waiting for the database writes.
+"""
+
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional
+
+# How many recent interactions decide the preferred response length
+RECENT_RESPONSE_WINDOW = 10
+
+
+def derive_traits(analysis: Dict[str, Any], policy: Dict[str, Any]) -> List[str]:
+    """
+    Map one interaction's signals to personality traits.
+
+    Args:
+        analysis: Social analysis dict (emotion, relationship, intensity, etc.)
+        policy: Behavior policy dict (mode, tone, etc.)
+
+    Returns:
+        Traits identified from this interaction (may be empty)
+    """
+    emotion = analysis.get("primary_emotion")
+    intensity = analysis.get("intensity", 5)
+    relationship = analysis.get("relationship")
+    conflict_risk = analysis.get("conflict_risk")
+    user_need = analysis.get("user_need")
+    mode = policy.get("mode")
+    humor_level = policy.get("humor_level", 1)
+
+    traits = []
+
+    if relationship == "authority" and conflict_risk == "high":
+        traits.append("avoids_conflict")
+    if mode == "venting_listener" or user_need == "vent":
+        traits.append("needs_validation")
+    if emotion in ["anxiety", "stressed"] and intensity >= 7:
+        traits.append("reassurance_seeking")
+    if emotion == "anxiety" and intensity >= 8:
+        traits.append("high_anxiety_baseline")
+    if humor_level >= 2 and emotion in ["boredom", "neutral", "happy"]:
+        traits.append("humor_responsive")
+    if user_need in ["advice", "decision_help"] or mode == "practical_helper":
+        traits.append("solution_oriented")
+    if user_need in ["reassurance", "validation"]:
+        traits.append("needs_emotional_support")
+    if relationship == "authority" and emotion in ["frustration", "anger", "anxiety"]:
+        traits.append("workplace_stress_prone")
+
+    return traits
+
+
+def merge_traits(existing: Iterable[str], new: Iterable[str]) -> List[str]:
+    """Append new traits to existing ones, keeping order and dropping duplicates"""
+    merged = list(existing)
+    for trait in new:
+        if trait not in merged:
+            merged.append(trait)
+    return merged
+
+
+def describe_adaptations(
+    traits: Iterable[str],
+    response_lengths: Optional[Iterable[str]] = None,
+) -> List[str]:
+    """
+    Build the adaptation messages shown to the user.
+
+    Args:
+        traits: Learned trait strings
+        response_lengths: Recent policy message lengths, oldest first
+
+    Returns:
+        Adaptation messages; the last one is the "latest learning"
+    """
+    traits = set(traits)
+    adaptations = []
+
+    if "avoids_conflict" in traits:
+        adaptations.append("Buddy learned you prefer diplomatic approaches")
+    if "needs_validation" in traits:
+        adaptations.append("Buddy adapted to validate your emotions first")
+    if "solution_oriented" in traits:
+        adaptations.append("Buddy learned you prefer actionable solutions")
+    if "reassurance_seeking" in traits:
+        adaptations.append("Buddy provides more reassurance based on your patterns")
+    if "humor_responsive" in traits:
+        adaptations.append("Buddy uses appropriate humor when suitable")
+    if "workplace_stress_prone" in traits:
+        adaptations.append("Buddy is extra supportive for work-related stress")
+
+    lengths = [length for length in (response_lengths or []) if length]
+    if lengths:
+        most_common = Counter(lengths[-RECENT_RESPONSE_WINDOW:]).most_common(1)[0][0]
+        if most_common == "short":
+            adaptations.append("Buddy learned you prefer concise replies")
+        elif most_common == "long":
+            adaptations.append("Buddy learned you appreciate detailed responses")
+
+    return adaptations
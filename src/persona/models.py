@@ -68,3 +68,23 @@ class MemorySummary(Base):
     traits_identified = Column(JSON, default=list)
     signals = Column(JSON, default=dict)
     type = Column(String, default="trait_update")
+
+
+class InteractionAggregate(Base):
+    """
+    Running per-user interaction counters, maintained by log_interaction.
+
+    Lets get_interaction_stats answer in O(1) instead of scanning every
+    interaction the user ever had.
+    """
+
+    __tablename__ = "interaction_aggregates"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    user_id = Column(String, unique=True, nullable=False, index=True)
+    total_interactions = Column(Integer, default=0)
+    scenario_counts = Column(JSON, default=dict)
+    emotion_counts = Column(JSON, default=dict)
+    mode_counts = Column(JSON, default=dict)
+    recent_response_lengths = Column(JSON, default=list)  # Ring, oldest first
+    updated_at = Column(DateTime, default=datetime.utcnow)
@@ -7,8 +7,25 @@ Uses PostgreSQL via SQLAlchemy (Neon DB).
 
 from typing import Dict, Optional, Any
 from datetime import datetime
+from telemetry.logging import get_logger
 from .db import get_db_session
 from .models import User, Memory, Interaction, MemorySummary
+from .learning import (
+    RECENT_RESPONSE_WINDOW,
+    derive_traits,
+    merge_traits,
+    describe_adaptations,
+)
+from .aggregates import (
+    get_aggregate,
+    lock_or_rebuild_aggregate,
+    apply_interaction,
+    top_keys,
+    recent_lengths,
+)
+
+
+logger = get_logger(__name__)
 
 
 def load_user_context(user_id: str) -> dict:
@@ -65,6 +82,8 @@ def load_user_context(user_id: str) -> dict:
             },
             "communication_style": user.communication_style,
             "memory_summary": memory_summary,
+            "learned_patterns": list(user.learned_patterns or []),
+            "recent_response_lengths": _get_recent_response_lengths(user_id, session),
             "interaction_count": user.interaction_count,
             "created_at": user.created_at,
             "last_interaction": user.last_interaction,
@@ -78,7 +97,7 @@ def load_user_context(user_id: str) -> dict:
         return context
 
     except Exception as e:
-        print(f"Warning: Could not load user context: {e}")
+        logger.warning("could not load user context: %s", e, extra={"stage": "persona_load"})
         session.rollback()
         return create_default_profile(user_id)
     finally:
@@ -110,11 +129,38 @@ def create_default_profile(user_id: str) -> dict:
         },
         "communication_style": "casual",
         "learned_patterns": [],
+        "recent_response_lengths": [],
         "topics_of_interest": [],
         "emotional_baseline": "neutral",
     }
 
 
+def _get_recent_response_lengths(user_id: str, session) -> list:
+    """
+    Response lengths of the user's most recent interactions, oldest first.
+
+    Lets callers predict the length adaptation without a full stats scan.
+    """
+    aggregate = get_aggregate(user_id, session)
+    if aggregate is not None:
+        return recent_lengths(aggregate)
+
+    # No aggregate yet (not backfilled) - read the latest few rows directly
+    recent = (
+        session.query(Interaction.extra_metadata)
+        .filter_by(user_id=user_id)
+        .order_by(Interaction.timestamp.desc())
+        .limit(RECENT_RESPONSE_WINDOW)
+        .all()
+    )
+    lengths = [
+        metadata.get("response_length")
+        for (metadata,) in reversed(recent)
+        if metadata and metadata.get("response_length")
+    ]
+    return lengths
+
+
 def _get_memory_summary(user_id: str, session) -> str:
     """
     Build compact memory summary string from recent memories.
@@ -203,7 +249,7 @@ def update_user_preferences(user_id: str, preferences: Dict[str, Any]) -> bool:
         session.commit()
         return True
     except Exception as e:
-        print(f"Error updating preferences: {e}")
+        logger.error("error updating preferences: %s", e)
         session.rollback()
         return False
     finally:
@@ -249,7 +295,7 @@ def save_memory(
         session.commit()
         return True
     except Exception as e:
-        print(f"Error saving memory: {e}")
+        logger.error("error saving memory: %s", e)
         session.rollback()
         return False
     finally:
@@ -317,7 +363,7 @@ def update_user_traits(
     """
     session = get_db_session()
     if session is None:
-        print("Warning: PostgreSQL unavailable, cannot update traits")
+        logger.warning("PostgreSQL unavailable, cannot update traits", extra={"stage": "trait_update"})
         return False
 
     try:
@@ -327,26 +373,8 @@ def update_user_traits(
         conflict_risk = analysis.get("conflict_risk")
         user_need = analysis.get("user_need")
         mode = policy.get("mode")
-        humor_level = policy.get("humor_level", 1)
-
-        traits_to_add = []
-
-        if relationship == "authority" and conflict_risk == "high":
-            traits_to_add.append("avoids_conflict")
-        if mode == "venting_listener" or user_need == "vent":
-            traits_to_add.append("needs_validation")
-        if emotion in ["anxiety", "stressed"] and intensity >= 7:
-            traits_to_add.append("reassurance_seeking")
-        if emotion == "anxiety" and intensity >= 8:
-            traits_to_add.append("high_anxiety_baseline")
-        if humor_level >= 2 and emotion in ["boredom", "neutral", "happy"]:
-            traits_to_add.append("humor_responsive")
-        if user_need in ["advice", "decision_help"] or mode == "practical_helper":
-            traits_to_add.append("solution_oriented")
-        if user_need in ["reassurance", "validation"]:
-            traits_to_add.append("needs_emotional_support")
-        if relationship == "authority" and emotion in ["frustration", "anger", "anxiety"]:
-            traits_to_add.append("workplace_stress_prone")
+
+        traits_to_add = derive_traits(analysis, policy)
 
         if not traits_to_add:
             return False
@@ -362,12 +390,7 @@ def update_user_traits(
             session.add(user)
             session.flush()
 
-        existing_traits = list(user.learned_patterns or [])
-        for trait in traits_to_add:
-            if trait not in existing_traits:
-                existing_traits.append(trait)
-
-        user.learned_patterns = existing_traits
+        user.learned_patterns = merge_traits(user.learned_patterns or [], traits_to_add)
         user.last_updated = datetime.utcnow()
 
         # Save memory summary
@@ -390,7 +413,7 @@ def update_user_traits(
         return True
 
     except Exception as e:
-        print(f"Error updating user traits: {e}")
+        logger.error("error updating user traits: %s", e, extra={"stage": "trait_update"})
         session.rollback()
         return False
     finally:
@@ -437,10 +460,21 @@ def log_interaction(
     """
     session = get_db_session()
     if session is None:
-        print("Warning: PostgreSQL unavailable, cannot log interaction")
+        logger.warning("PostgreSQL unavailable, cannot log interaction", extra={"stage": "log"})
         return False
 
     try:
+        # Keep the per-user aggregate in step with the log (same transaction);
+        # the first log since aggregates existed folds in the history once
+        aggregate = lock_or_rebuild_aggregate(user_id, session)
+        apply_interaction(
+            aggregate,
+            scenario=scenario,
+            emotion=emotion,
+            mode=mode,
+            response_length=(metadata or {}).get("response_length"),
+        )
+
         interaction = Interaction(
             user_id=user_id,
             timestamp=datetime.utcnow(),
@@ -470,7 +504,7 @@ def log_interaction(
         session.commit()
         return True
     except Exception as e:
-        print(f"Error logging interaction: {e}")
+        logger.error("error logging interaction: %s", e, extra={"stage": "log"})
         session.rollback()
         return False
     finally:
@@ -498,71 +532,34 @@ def get_interaction_stats(user_id: str) -> Dict[str, Any]:
         }
 
     try:
-        user_interactions = (
-            session.query(Interaction).filter_by(user_id=user_id).all()
-        )
+        # O(1): read the running aggregate maintained by log_interaction
+        aggregate = get_aggregate(user_id, session)
+        if aggregate is None:
+            aggregate = lock_or_rebuild_aggregate(user_id, session)
+            if not aggregate.total_interactions:
+                session.rollback()
+                return {
+                    "total_interactions": 0,
+                    "common_scenarios": [],
+                    "common_emotions": [],
+                    "preferred_modes": [],
+                    "adaptations_learned": [],
+                }
+            session.commit()
 
-        if not user_interactions:
-            return {
-                "total_interactions": 0,
-                "common_scenarios": [],
-                "common_emotions": [],
-                "preferred_modes": [],
-                "adaptations_learned": [],
-            }
-
-        scenarios: Dict[str, int] = {}
-        emotions: Dict[str, int] = {}
-        modes: Dict[str, int] = {}
-
-        for interaction in user_interactions:
-            s = interaction.scenario or "unknown"
-            e = interaction.emotion or "unknown"
-            m = interaction.mode or "unknown"
-            scenarios[s] = scenarios.get(s, 0) + 1
-            emotions[e] = emotions.get(e, 0) + 1
-            modes[m] = modes.get(m, 0) + 1
-
-        common_scenarios = sorted(scenarios.items(), key=lambda x: x[1], reverse=True)[:3]
-        common_emotions = sorted(emotions.items(), key=lambda x: x[1], reverse=True)[:3]
-        preferred_modes = sorted(modes.items(), key=lambda x: x[1], reverse=True)[:3]
-
-        adaptations = []
-        traits = get_user_traits(user_id)
-
-        if "avoids_conflict" in traits:
-            adaptations.append("Buddy learned you prefer diplomatic approaches")
-        if "needs_validation" in traits:
-            adaptations.append("Buddy adapted to validate your emotions first")
-        if "solution_oriented" in traits:
-            adaptations.append("Buddy learned you prefer actionable solutions")
-        if "reassurance_seeking" in traits:
-            adaptations.append("Buddy provides more reassurance based on your patterns")
-        if "humor_responsive" in traits:
-            adaptations.append("Buddy uses appropriate humor when suitable")
-        if "workplace_stress_prone" in traits:
-            adaptations.append("Buddy is extra supportive for work-related stress")
-
-        recent = user_interactions[-10:] if len(user_interactions) > 10 else user_interactions
-        response_lengths = [
-            i.extra_metadata.get("response_length")
-            for i in recent
-            if i.extra_metadata and i.extra_metadata.get("response_length")
-        ]
-        if response_lengths:
-            from collections import Counter
-            most_common = Counter(response_lengths).most_common(1)[0][0]
-            if most_common == "short":
-                adaptations.append("Buddy learned you prefer concise replies")
-            elif most_common == "long":
-                adaptations.append("Buddy learned you appreciate detailed responses")
+        user = session.query(User).filter_by(user_id=user_id).first()
+        traits = (user.learned_patterns or []) if user else []
+        adaptations = describe_adaptations(traits, recent_lengths(aggregate))
 
         return {
-            "total_interactions": len(user_interactions),
-            "common_scenarios": [s[0] for s in common_scenarios],
-            "common_emotions": [e[0] for e in common_emotions],
-            "preferred_modes": [m[0] for m in preferred_modes],
+            "total_interactions": aggregate.total_interactions,
+            "common_scenarios": top_keys(aggregate.scenario_counts),
+            "common_emotions": top_keys(aggregate.emotion_counts),
+            "preferred_modes": top_keys(aggregate.mode_counts),
             "adaptations_learned": adaptations,
         }
+    except Exception:
+        session.rollback()
+        raise
     finally:
         session.close()
@@ -0,0 +1,142 @@
+"""
+Background Writer
+
+Runs persona database writes (trait updates, interaction logs) on a
+single worker thread so they never add to user-visible latency.
+
+The queue is bounded: when the database falls behind and the queue is
+full, new writes are dropped (and counted) rather than blocking the
+request path. On shutdown the queue is drained before the worker exits.
+Each write runs in a copy of the submitter's context, so its log lines
+keep the request id of the request that queued it.
+
+Configuration (environment variables):
+    BUDDY_WRITE_QUEUE_SIZE      Max pending writes (default: 1000)
+"""
+
+import contextvars
+import os
+import queue
+import threading
+import time
+from typing import Any, Callable, Optional
+
+from telemetry.logging import get_logger
+
+
+logger = get_logger(__name__)
+
+
+_STOP = object()
+
+
+class BackgroundWriter:
+    """Single-thread, bounded FIFO executor for fire-and-forget DB writes"""
+
+    def __init__(self, maxsize: int = 1000, name: str = "buddy-writer"):
+        self._queue: "queue.Queue" = queue.Queue(maxsize=maxsize)
+        self._closed = False
+        self._lock = threading.Lock()
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.dropped = 0
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def submit(self, func: Callable[..., Any], *args, **kwargs) -> bool:
+        """
+        Queue `func(*args, **kwargs)` to run on the writer thread.
+
+        Returns:
+            True if queued, False if the writer is closed or the queue is full
+        """
+        with self._lock:
+            if self._closed:
+                self.dropped += 1
+                return False
+            try:
+                self._queue.put_nowait((contextvars.copy_context(), func, args, kwargs))
+            except queue.Full:
+                self.dropped += 1
+                logger.warning("background write queue full, dropping %s", getattr(func, '__name__', func))
+                return False
+            self.submitted += 1
+            return True
+
+    @property
+    def pending(self) -> int:
+        """Writes queued but not yet finished"""
+        return self._queue.unfinished_tasks
+
+    def flush(self) -> None:
+        """Block until every queued write has run"""
+        self._queue.join()
+
+    def shutdown(self, timeout: Optional[float] = 10.0) -> bool:
+        """
+        Stop accepting writes, drain the queue and stop the worker.
+
+        Args:
+            timeout: Max seconds to wait for the drain (None waits forever)
+
+        Returns:
+            True if the queue fully drained in time; False abandons the
+            (daemon) worker with writes still pending
+        """
+        with self._lock:
+            if self._closed:
+                return not self._thread.is_alive()
+            self._closed = True
+        deadline = None if timeout is None else time.monotonic() + timeout
+        # The sentinel must land behind every pending write; a full queue
+        # behind a hung database must not stall shutdown past the timeout
+        try:
+            self._queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            logger.warning("background write queue still full at shutdown, %d writes abandoned", self.pending)
+            return False
+        self._thread.join(None if deadline is None else max(deadline - time.monotonic(), 0))
+        return not self._thread.is_alive()
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            try:
+                if item is _STOP:
+                    return
+                ctx, func, args, kwargs = item
+                try:
+                    ctx.run(func, *args, **kwargs)
+                    self.completed += 1
+                except Exception:
+                    self.failed += 1
+                    logger.exception("background write %s failed", getattr(func, '__name__', func))
+            finally:
+                self._queue.task_done()
+
+
+_writer: Optional[BackgroundWriter] = None
+_writer_lock = threading.Lock()
+
+
+def get_background_writer() -> BackgroundWriter:
+    """Get the process-wide background writer, starting it on first use"""
+    global _writer
+    if _writer is None:
+        with _writer_lock:
+            if _writer is None:
+                _writer = BackgroundWriter(
+                    maxsize=int(os.getenv("BUDDY_WRITE_QUEUE_SIZE", "1000"))
+                )
+    return _writer
+
+
+def shutdown_background_writer(timeout: Optional[float] = 10.0) -> bool:
+    """Drain and stop the process-wide writer (call on shutdown)"""
+    global _writer
+    with _writer_lock:
+        writer, _writer = _writer, None
+    if writer is None:
+        return True
+    return writer.shutdown(timeout)
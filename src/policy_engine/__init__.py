@@ -1,7 +1,12 @@
 """Policy Engine module for Buddy AI"""
-__all__ = ["BehaviorPolicy", "PolicyDecider", "generate_behavior_policy"]
+__all__ = [
+    "BehaviorPolicy", "PolicyDecider", "generate_behavior_policy", "agenerate_behavior_policy",
+    "RuleDecision", "decide_policy_by_rules", "get_policy_cache", "policy_cache_key",
+    "POLICY_MODES", "get_policy_mode", "select_behavior_policy", "aselect_behavior_policy",
+]
 
 from .models import BehaviorPolicy
-from .decider import PolicyDecider, generate_behavior_policy
-
-
+from .decider import PolicyDecider, generate_behavior_policy, agenerate_behavior_policy
+from .rules import RuleDecision, decide_policy_by_rules
+from .cache import get_policy_cache, policy_cache_key
+from .selector import POLICY_MODES, get_policy_mode, select_behavior_policy, aselect_behavior_policy
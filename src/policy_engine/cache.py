@@ -0,0 +1,75 @@
+"""
+Policy Decision Cache
+
+Memoizes LLM policy decisions by their decision-relevant signals:
+(emotion, user_need, relationship, conflict_risk, intensity bucket) plus
+the behavior prompt's content hash, so a prompt edit never serves stale
+decisions. Only successful LLM decisions are cached - fallbacks are not.
+
+Configuration (environment variables):
+    POLICY_CACHE_SIZE   Max cached decisions, 0 disables (default: 512)
+    POLICY_CACHE_TTL    Seconds a decision stays valid (default: 3600)
+"""
+
+import os
+import threading
+from typing import Optional, Tuple
+
+from cache import LRUCache
+from llm import get_prompt_version
+from .rules import Signals
+
+
+# Inclusive upper bounds of each intensity bucket, one per cut point in
+# rules.py (boredom humor <=4, frustration light humor <=5, long decision
+# help <=6, strong >=7, overload >=9): intensities the rules treat
+# differently never share a cached decision
+INTENSITY_BUCKETS = (4, 5, 6, 8, 10)
+
+
+def intensity_bucket(intensity: int) -> int:
+    """Index of the bucket `intensity` (1-10) falls into"""
+    for index, upper in enumerate(INTENSITY_BUCKETS):
+        if intensity <= upper:
+            return index
+    return len(INTENSITY_BUCKETS) - 1
+
+
+def policy_cache_key(context: dict, prompt_name: str = "behavior_policy") -> Tuple:
+    """
+    Normalized cache key for a policy context.
+
+    Args:
+        context: Policy context dict (see generate_behavior_policy)
+        prompt_name: Registered prompt whose version is part of the key
+
+    Returns:
+        Hashable tuple of signals, intensity bucket and prompt version
+    """
+    signals = Signals.from_context(context)
+    return (
+        signals.emotion.lower(),
+        signals.user_need.lower(),
+        signals.relationship.lower(),
+        signals.conflict_risk.lower(),
+        intensity_bucket(signals.intensity),
+        get_prompt_version(prompt_name),
+    )
+
+
+_cache: Optional[LRUCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_policy_cache() -> LRUCache:
+    """Get the process-wide policy decision cache, creating it on first use"""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = LRUCache(
+                    maxsize=int(os.getenv("POLICY_CACHE_SIZE", "512")),
+                    ttl=float(os.getenv("POLICY_CACHE_TTL", "3600")),
+                    name="policy",
+                )
+    return _cache
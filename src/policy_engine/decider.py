@@ -9,8 +9,19 @@ import os
 import json
 from pathlib import Path
 from typing import Optional
-from openai import OpenAI
+from llm import DEFAULT_MODEL, get_llm_client, get_async_llm_client, get_prompt, register_prompt
+from telemetry.logging import get_logger
+from telemetry.metrics import track_llm_call, record_llm_fallback
 from .models import BehaviorPolicy
+from .cache import get_policy_cache, policy_cache_key
+
+
+logger = get_logger(__name__)
+
+
+# System prompt is read once at import and served from memory
+PROMPT_NAME = "behavior_policy"
+register_prompt(PROMPT_NAME, Path(__file__).parent / "behavior_policy_prompt.txt")
 
 
 def generate_behavior_policy(context: dict) -> BehaviorPolicy:
@@ -18,10 +29,11 @@ def generate_behavior_policy(context: dict) -> BehaviorPolicy:
     Generate a BehaviorPolicy from context using Gemini API.
 
     This is a standalone function that:
+    - Serves repeated signal combinations from the policy cache
     - Calls Gemini API with behavior_policy_prompt.txt
     - Passes context as JSON
     - Parses response into BehaviorPolicy
-    - Falls back to safe default if parsing fails
+    - Falls back to safe default if parsing fails (fallbacks are never cached)
 
     Args:
         context: Dictionary containing user context. Can include:
@@ -45,64 +57,122 @@ def generate_behavior_policy(context: dict) -> BehaviorPolicy:
         ... })
         >>> print(policy.mode)  # diplomatic_advisor
     """
-    # Get API key
-    api_key = os.getenv("OPENROUTER_API_KEY")
-    if not api_key:
-        raise ValueError("OPENROUTER_API_KEY not found in environment")
-
-    # Initialize client
-    client = OpenAI(
-        base_url="https://openrouter.ai/api/v1",
-        api_key=api_key,
-    )
+    cache = get_policy_cache()
+    key = policy_cache_key(context, PROMPT_NAME)
+    cached = cache.get(key)
+    if cached is not None:
+        return cached.model_copy()
 
-    # Load system prompt
-    prompt_path = Path(__file__).parent / "behavior_policy_prompt.txt"
-    with open(prompt_path, "r") as f:
-        system_prompt = f.read()
+    # Shared pooled client
+    client = get_llm_client()
 
-    # Convert context dict to readable format for Gemini
-    context_str = json.dumps(context, indent=2)
+    try:
+        policy = _request_behavior_policy(client, context)
+    except Exception as e:
+        return _fallback_policy(e)
+
+    cache.set(key, policy)
+    return policy.model_copy()
+
+
+async def agenerate_behavior_policy(context: dict) -> BehaviorPolicy:
+    """
+    Async counterpart of generate_behavior_policy().
+
+    Args:
+        context: Dictionary containing user context (see generate_behavior_policy)
+
+    Returns:
+        BehaviorPolicy object
+
+    Raises:
+        ValueError: If OPENROUTER_API_KEY is not set
+    """
+    cache = get_policy_cache()
+    key = policy_cache_key(context, PROMPT_NAME)
+    cached = cache.get(key)
+    if cached is not None:
+        return cached.model_copy()
+
+    # Shared pooled client
+    client = get_async_llm_client()
 
     try:
-        # Call API
+        policy = await _arequest_behavior_policy(client, context)
+    except Exception as e:
+        return _fallback_policy(e)
+
+    cache.set(key, policy)
+    return policy.model_copy()
+
+
+def _request_behavior_policy(client, context: dict) -> BehaviorPolicy:
+    """One uncached policy call; raises on API or parse errors"""
+    with track_llm_call("policy", DEFAULT_MODEL):
         response = client.chat.completions.create(
-            model="nvidia/nemotron-3-super-120b-a12b:free",
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": f"Context:\n{context_str}"}
-            ],
+            model=DEFAULT_MODEL,
+            messages=_build_messages(context),
             response_format={ "type": "json_object" },
             extra_body={"reasoning": {"enabled": True}}
         )
+    return _parse_policy(response.choices[0].message.content)
 
-        # Parse response
-        response_text = response.choices[0].message.content.strip()
 
-        # Handle markdown code blocks
-        if response_text.startswith("```"):
-            lines = response_text.split("\n")
-            # Remove first line (```json or ```) and last line (```)
-            response_text = "\n".join(lines[1:-1])
+async def _arequest_behavior_policy(client, context: dict) -> BehaviorPolicy:
+    """Async counterpart of _request_behavior_policy()"""
+    with track_llm_call("policy", DEFAULT_MODEL):
+        response = await client.chat.completions.create(
+            model=DEFAULT_MODEL,
+            messages=_build_messages(context),
+            response_format={ "type": "json_object" },
+            extra_body={"reasoning": {"enabled": True}}
+        )
+    return _parse_policy(response.choices[0].message.content)
 
-        # Parse JSON
-        policy_dict = json.loads(response_text)
 
-        # Create and validate BehaviorPolicy
-        return BehaviorPolicy(**policy_dict)
+def _build_messages(context: dict) -> list:
+    """Chat messages for the policy call"""
+    system_prompt = get_prompt(PROMPT_NAME)
 
-    except Exception as e:
-        # Fallback to safe default: chill_companion
-        print(f"Warning: Failed to generate policy ({e}). Using fallback.")
-        return BehaviorPolicy(
-            mode="chill_companion",
-            tone="casual_supportive",
-            humor_level=1,
-            message_length="medium",
-            initiative="medium",
-            give_action_steps=False,
-            ask_followup_question=True
-        )
+    # Convert context dict to readable format for Gemini
+    context_str = json.dumps(context, indent=2)
+
+    return [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": f"Context:\n{context_str}"}
+    ]
+
+
+def _parse_policy(response_text: str) -> BehaviorPolicy:
+    """Parse the model's JSON reply into a validated BehaviorPolicy"""
+    response_text = response_text.strip()
+
+    # Handle markdown code blocks
+    if response_text.startswith("```"):
+        lines = response_text.split("\n")
+        # Remove first line (```json or ```) and last line (```)
+        response_text = "\n".join(lines[1:-1])
+
+    # Parse JSON
+    policy_dict = json.loads(response_text)
+
+    # Create and validate BehaviorPolicy
+    return BehaviorPolicy(**policy_dict)
+
+
+def _fallback_policy(error: Exception) -> BehaviorPolicy:
+    """Safe default (chill_companion) used when the model call or parsing fails"""
+    logger.warning("failed to generate policy (%s), using fallback", error, extra={"stage": "policy"})
+    record_llm_fallback("policy")
+    return BehaviorPolicy(
+        mode="chill_companion",
+        tone="casual_supportive",
+        humor_level=1,
+        message_length="medium",
+        initiative="medium",
+        give_action_steps=False,
+        ask_followup_question=True
+    )
 
 
 class PolicyDecider:
@@ -129,15 +199,10 @@ class PolicyDecider:
         if not self.api_key:
             raise ValueError("OPENROUTER_API_KEY not found in environment or constructor")
 
-        self.client = OpenAI(
-            base_url="https://openrouter.ai/api/v1",
-            api_key=self.api_key,
-        )
+        self.client = get_llm_client(self.api_key)
 
-        # Load the behavior policy prompt
-        prompt_path = Path(__file__).parent / "behavior_policy_prompt.txt"
-        with open(prompt_path, "r") as f:
-            self.system_prompt = f.read()
+        # Behavior policy prompt (served from the prompt registry)
+        self.system_prompt = get_prompt(PROMPT_NAME)
 
     def decide_policy(
         self,
@@ -173,7 +238,7 @@ class PolicyDecider:
 
         # Call API to decide policy
         response = self.client.chat.completions.create(
-            model="nvidia/nemotron-3-super-120b-a12b:free",
+            model=DEFAULT_MODEL,
             messages=[
                 {"role": "system", "content": self.system_prompt},
                 {"role": "user", "content": user_context}
@@ -0,0 +1,168 @@
+"""
+Rule-Based Policy Engine
+
+Derives a BehaviorPolicy locally from the SocialAnalysis signals
+(emotion, user need, relationship, conflict risk, intensity) using the
+same rules behavior_policy_prompt.txt gives the model, encoded as
+lookup tables. Runs in microseconds and needs no network call.
+
+A decision is flagged ambiguous when no mode rule fires or when two
+rules of equal priority point at different modes - those are the cases
+worth escalating to the LLM.
+"""
+
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Tuple
+
+from .models import BehaviorPolicy
+
+
+@dataclass(frozen=True)
+class Signals:
+    """The decision-relevant part of a policy context"""
+
+    emotion: str
+    user_need: str
+    relationship: str
+    conflict_risk: str
+    intensity: int
+
+    @classmethod
+    def from_context(cls, context: dict) -> "Signals":
+        """Read signals from a policy context (orchestrator or analysis keys)"""
+        intensity = context.get("intensity", 5)
+        try:
+            intensity = int(intensity)
+        except (TypeError, ValueError):
+            intensity = 5
+        return cls(
+            emotion=context.get("emotion") or context.get("primary_emotion") or "neutral",
+            user_need=context.get("user_need") or "unknown",
+            relationship=context.get("relationship") or "unknown",
+            conflict_risk=context.get("conflict_risk") or "low",
+            intensity=max(1, min(10, intensity)),
+        )
+
+
+@dataclass(frozen=True)
+class RuleDecision:
+    """Result of the rule engine"""
+
+    policy: BehaviorPolicy
+    ambiguous: bool
+    matched_rules: Tuple[str, ...]
+
+
+# Mode rules: (name, priority, mode, predicate). Higher priority wins.
+MODE_RULES: List[Tuple[str, int, str, Callable[[Signals], bool]]] = [
+    ("emotional_overload", 100, "silent_support",
+     lambda s: s.intensity >= 9 and s.emotion in ("sadness", "anxiety")),
+    ("authority_conflict", 90, "diplomatic_advisor",
+     lambda s: s.relationship == "authority" and s.conflict_risk in ("medium", "high")),
+    ("venting", 80, "venting_listener",
+     lambda s: s.user_need == "vent"),
+    ("confusion_or_decision", 60, "practical_helper",
+     lambda s: s.emotion == "confusion" or s.user_need in ("decision_help", "advice")),
+    ("boredom_or_waiting", 60, "chill_companion",
+     lambda s: s.emotion == "boredom" or s.user_need == "distraction"),
+    ("demotivated", 50, "motivational_push",
+     lambda s: s.emotion == "sadness" and s.user_need in ("reassurance", "validation")),
+]
+
+DEFAULT_MODE = "chill_companion"
+
+# Per-mode defaults: message_length, initiative, give_action_steps, ask_followup_question
+MODE_DEFAULTS: Dict[str, Tuple[str, str, bool, bool]] = {
+    "venting_listener":   ("short",  "low",    False, True),
+    "chill_companion":    ("short",  "medium", False, True),
+    "practical_helper":   ("medium", "high",   True,  False),
+    "diplomatic_advisor": ("medium", "medium", True,  False),
+    "motivational_push":  ("medium", "high",   False, True),
+    "silent_support":     ("short",  "low",    False, False),
+}
+
+# Tone rules, first match wins
+TONE_RULES: List[Tuple[str, Callable[[Signals, str], bool]]] = [
+    ("serious_care",
+     lambda s, mode: mode == "silent_support" or (s.emotion == "sadness" and s.intensity >= 7)),
+    ("calm_reassuring",
+     lambda s, mode: s.emotion == "anxiety"),
+    ("respectful_formal",
+     lambda s, mode: mode == "diplomatic_advisor"),
+    ("light_humor",
+     lambda s, mode: s.emotion in ("boredom", "happy") or (s.emotion == "frustration" and s.intensity <= 5)),
+]
+
+DEFAULT_TONE = "casual_supportive"
+
+HUMOR_BY_TONE: Dict[str, int] = {
+    "light_humor": 2,
+    "casual_supportive": 1,
+    "calm_reassuring": 0,
+    "serious_care": 0,
+    "respectful_formal": 0,
+}
+
+
+def decide_policy_by_rules(context: dict) -> RuleDecision:
+    """
+    Derive a BehaviorPolicy from analysis signals without an LLM call.
+
+    Args:
+        context: Policy context dict (emotion, user_need, relationship,
+            conflict_risk, intensity); other keys are ignored
+
+    Returns:
+        RuleDecision with the policy, an ambiguity flag and the rule names
+        that fired
+
+    Example:
+        >>> decision = decide_policy_by_rules({
+        ...     "emotion": "frustration", "user_need": "vent",
+        ...     "relationship": "friend", "conflict_risk": "low", "intensity": 6
+        ... })
+        >>> decision.policy.mode  # "venting_listener"
+    """
+    signals = Signals.from_context(context)
+
+    matched = [(name, priority, mode) for name, priority, mode, rule in MODE_RULES if rule(signals)]
+    matched.sort(key=lambda m: m[1], reverse=True)
+
+    if matched:
+        mode = matched[0][2]
+        top_priority = matched[0][1]
+        ambiguous = any(p == top_priority and m != mode for _, p, m in matched[1:])
+    else:
+        mode = DEFAULT_MODE
+        ambiguous = True
+
+    tone = next((tone for tone, rule in TONE_RULES if rule(signals, mode)), DEFAULT_TONE)
+
+    humor_level = HUMOR_BY_TONE[tone]
+    if signals.intensity >= 7:
+        humor_level = min(humor_level, 1)
+    if signals.conflict_risk == "high" or mode == "silent_support":
+        humor_level = 0
+    if signals.emotion == "boredom" and signals.intensity <= 4:
+        humor_level = 3
+
+    message_length, initiative, give_action_steps, ask_followup = MODE_DEFAULTS[mode]
+    if signals.user_need in ("advice", "decision_help"):
+        give_action_steps = True
+    if signals.user_need == "decision_help" and signals.intensity <= 6:
+        message_length = "long"
+
+    policy = BehaviorPolicy(
+        mode=mode,
+        tone=tone,
+        humor_level=humor_level,
+        message_length=message_length,
+        initiative=initiative,
+        give_action_steps=give_action_steps,
+        ask_followup_question=ask_followup,
+    )
+    return RuleDecision(
+        policy=policy,
+        ambiguous=ambiguous,
+        matched_rules=tuple(name for name, _, _ in matched),
+    )
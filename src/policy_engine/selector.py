@@ -0,0 +1,86 @@
+"""
+Policy Selection
+
+Chooses how each request's BehaviorPolicy is decided:
+
+    rules                         Table-driven rules only (no LLM call)
+    llm                           LLM call via behavior_policy_prompt.txt
+    rules_then_llm_on_ambiguity   Rules, escalating to the LLM only when
+                                  the rule decision is ambiguous
+
+Configuration (environment variables):
+    POLICY_MODE     One of the modes above (default: llm)
+"""
+
+import os
+from typing import Optional
+
+from telemetry.logging import get_logger, warn_once
+from . import decider
+from .models import BehaviorPolicy
+from .rules import decide_policy_by_rules
+
+
+POLICY_MODES = ("rules", "llm", "rules_then_llm_on_ambiguity")
+DEFAULT_POLICY_MODE = "llm"
+
+logger = get_logger(__name__)
+
+
+def get_policy_mode() -> str:
+    """Policy mode from POLICY_MODE, falling back to llm on unknown values"""
+    mode = os.getenv("POLICY_MODE", DEFAULT_POLICY_MODE).strip().lower()
+    if mode not in POLICY_MODES:
+        warn_once(logger, ("POLICY_MODE", mode), "unknown POLICY_MODE %r, using %s",
+                  mode, DEFAULT_POLICY_MODE, extra={"stage": "policy"})
+        return DEFAULT_POLICY_MODE
+    return mode
+
+
+def _resolve_mode(mode: Optional[str]) -> str:
+    if mode is None:
+        return get_policy_mode()
+    if mode not in POLICY_MODES:
+        raise ValueError(f"Unknown policy mode '{mode}', expected one of {POLICY_MODES}")
+    return mode
+
+
+def select_behavior_policy(context: dict, mode: Optional[str] = None) -> BehaviorPolicy:
+    """
+    Decide a BehaviorPolicy using the configured policy mode.
+
+    Args:
+        context: Policy context (see generate_behavior_policy)
+        mode: Override for POLICY_MODE
+
+    Returns:
+        BehaviorPolicy object
+
+    Raises:
+        ValueError: If `mode` is not a known policy mode
+    """
+    mode = _resolve_mode(mode)
+    if mode != "llm":
+        decision = decide_policy_by_rules(context)
+        if mode == "rules" or not decision.ambiguous:
+            return decision.policy
+    return decider.generate_behavior_policy(context)
+
+
+async def aselect_behavior_policy(context: dict, mode: Optional[str] = None) -> BehaviorPolicy:
+    """
+    Async counterpart of select_behavior_policy().
+
+    Args:
+        context: Policy context (see generate_behavior_policy)
+        mode: Override for POLICY_MODE
+
+    Returns:
+        BehaviorPolicy object
+    """
+    mode = _resolve_mode(mode)
+    if mode != "llm":
+        decision = decide_policy_by_rules(context)
+        if mode == "rules" or not decision.ambiguous:
+            return decision.policy
+    return await decider.agenerate_behavior_policy(context)
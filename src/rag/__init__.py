@@ -1,6 +1,42 @@
 """RAG module for behavior knowledge retrieval"""
 
-from .retriever import retrieve_behavior_knowledge, get_all_scenarios, find_relevant_knowledge
-
-__all__ = ["retrieve_behavior_knowledge", "get_all_scenarios", "find_relevant_knowledge"]
+from .library import BehaviorLibrary, ScenarioRecord, get_library, reload_library
+from .retriever import (
+    RAG_ENGINES,
+    retrieve_behavior_knowledge,
+    get_all_scenarios,
+    find_relevant_knowledge,
+    search_scenarios,
+    retrieve_scenarios,
+    blend_knowledge,
+    ScenarioMatch,
+    get_rag_engine,
+    get_top_k,
+)
+from .bm25 import BM25Index
+from .keyword import KeywordIndex
+from .query_cache import get_knowledge_cache
+from .tokenize import tokenize
+from .compile import compile_library
 
+__all__ = [
+    "BehaviorLibrary",
+    "ScenarioRecord",
+    "get_library",
+    "reload_library",
+    "retrieve_behavior_knowledge",
+    "get_all_scenarios",
+    "find_relevant_knowledge",
+    "search_scenarios",
+    "retrieve_scenarios",
+    "blend_knowledge",
+    "ScenarioMatch",
+    "get_rag_engine",
+    "get_top_k",
+    "RAG_ENGINES",
+    "BM25Index",
+    "KeywordIndex",
+    "get_knowledge_cache",
+    "tokenize",
+    "compile_library",
+]
@@ -0,0 +1,112 @@
+"""
+Compiled Library Artifact I/O
+
+The compiled library is one JSON document (see compile.py) read with a
+single file read. orjson is used when installed (several times faster
+on this payload); the stdlib json module otherwise.
+
+Also computes the library version (a content hash of the source files)
+and the cheap stat-based manifest used to detect a stale artifact.
+
+Configuration (environment variables):
+    BEHAVIOR_LIBRARY_ARTIFACT   Artifact path (default: <library>/library.compiled)
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Iterable, List, Optional, Tuple
+
+from telemetry.logging import get_logger
+
+try:
+    import orjson
+except ImportError:  # Optional speedup
+    orjson = None
+
+
+logger = get_logger(__name__)
+
+
+ARTIFACT_NAME = "library.compiled"
+FORMAT_VERSION = 2
+
+
+def artifact_path(library_path: Path) -> Path:
+    """Where the compiled artifact for `library_path` lives"""
+    override = os.getenv("BEHAVIOR_LIBRARY_ARTIFACT")
+    return Path(override) if override else library_path / ARTIFACT_NAME
+
+
+def source_files(library_path: Path) -> List[Path]:
+    return sorted(library_path.glob("*.json"))
+
+
+def source_manifest(files: Iterable[Path]) -> List[List]:
+    """[name, size, mtime_ns] per source file - compared on load instead of rehashing"""
+    manifest = []
+    for file in files:
+        stat = file.stat()
+        manifest.append([file.name, stat.st_size, stat.st_mtime_ns])
+    return manifest
+
+
+def library_version(sources: Iterable[Tuple[str, bytes]]) -> str:
+    """Content hash of (file name, raw bytes) pairs; changes whenever any file does"""
+    digest = hashlib.sha256()
+    for name, raw in sources:
+        digest.update(name.encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(hashlib.sha256(raw).digest())
+    return digest.hexdigest()[:16]
+
+
+def dumps(payload: dict) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def loads(raw: bytes):
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def write_artifact(path: Path, payload: dict) -> int:
+    """Write atomically (temp file + rename); returns the size in bytes"""
+    data = dumps(payload)
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+    return len(data)
+
+
+def read_artifact(path: Path, library_path: Path) -> Optional[dict]:
+    """
+    Read the artifact if it exists, has the current format and matches the sources.
+
+    Returns:
+        The decoded payload, or None (caller parses the sources instead)
+    """
+    if not path.exists():
+        return None
+    try:
+        with open(path, "rb") as f:
+            payload = loads(f.read())
+    except Exception as e:
+        logger.warning("could not read compiled library %s (%s), parsing sources", path, e,
+                       extra={"stage": "library_load"})
+        return None
+
+    if payload.get("format") != FORMAT_VERSION:
+        logger.warning("compiled library %s has format %s, expected %s, parsing sources",
+                       path, payload.get("format"), FORMAT_VERSION, extra={"stage": "library_load"})
+        return None
+    if payload.get("manifest") != source_manifest(source_files(library_path)):
+        logger.warning("compiled library %s is stale, parsing sources (rebuild with: python -m rag.compile)",
+                       path, extra={"stage": "library_load"})
+        return None
+    return payload
@@ -0,0 +1,240 @@
+"""
+BM25 Scenario Index
+
+Inverted index over the behavior library's example texts. Every entry
+`text` is a document labelled with its scenario; a query is scored
+against documents with BM25, and document scores are rolled up into
+scenario scores.
+
+Besides the example texts, each scenario gets one short descriptor
+document (its name and typical emotions), so plain scenario-style
+queries ("exam stress") still land on the right file.
+
+Document ids follow the input order (documents without any tokens keep
+their id but get no postings), so callers can map the per-scenario best
+documents returned by search_detailed() back to their texts.
+
+Posting weights are precomputed at build time, so a query only sums
+idf * weight over the postings of its terms. The built index can be
+exported with to_dict() and restored with from_dict() without
+re-tokenizing anything (the compiled library artifact stores it).
+"""
+
+import base64
+import heapq
+import math
+import sys
+from array import array
+from collections import Counter
+from typing import AbstractSet, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .tokenize import tokenize
+
+
+# BM25 parameters (Robertson/Sparck Jones defaults)
+DEFAULT_K1 = 1.2
+DEFAULT_B = 0.75
+
+# Scenario score = best doc + half the 2nd + a quarter of the 3rd: rewards
+# several matching examples without letting big scenarios win on volume
+SCENARIO_DOC_WEIGHTS = (1.0, 0.5, 0.25)
+
+
+class BM25Index:
+    """
+    BM25 over (scenario, text) documents, queried per scenario.
+
+    Example:
+        >>> index = BM25Index([("exam stress", "kal exam hai tension"), ("train late", "train phir late")])
+        >>> index.search("exam ki tension", k=1)
+        [('exam stress', 1.38...)]
+    """
+
+    def __init__(self, docs: Iterable[Tuple[str, str]], k1: float = DEFAULT_K1, b: float = DEFAULT_B):
+        """
+        Build the index.
+
+        Args:
+            docs: (scenario, text) pairs; a scenario may have any number of docs
+            k1: Term frequency saturation
+            b: Document length normalization
+        """
+        self.k1 = k1
+        self.b = b
+
+        scenario_ids: Dict[str, int] = {}
+        doc_scenarios: List[int] = []
+        doc_terms: List[Counter] = []
+        for scenario, text in docs:
+            terms = Counter(tokenize(text))
+            doc_scenarios.append(scenario_ids.setdefault(scenario, len(scenario_ids)))
+            doc_terms.append(terms)
+
+        self.scenarios: Tuple[str, ...] = tuple(scenario_ids)
+        self._doc_scenarios: Tuple[int, ...] = tuple(doc_scenarios)
+        self.doc_count = len(doc_terms)
+
+        lengths = [sum(terms.values()) for terms in doc_terms]
+        avg_length = (sum(lengths) / len(lengths)) if lengths else 0.0
+
+        postings: Dict[str, List[Tuple[int, float]]] = {}
+        for doc_id, (terms, length) in enumerate(zip(doc_terms, lengths)):
+            if not terms:
+                continue
+            norm = k1 * (1 - b + b * length / avg_length)
+            for term, tf in terms.items():
+                postings.setdefault(term, []).append((doc_id, tf * (k1 + 1) / (tf + norm)))
+
+        n = self.doc_count
+        # term -> (idf, doc ids, weights); parallel lists keep the export compact
+        self._postings: Dict[str, Tuple[float, List[int], List[float]]] = {}
+        for term, plist in postings.items():
+            df = len(plist)
+            idf = math.log(1 + (n - df + 0.5) / (df + 0.5))
+            self._postings[term] = (idf, [doc_id for doc_id, _ in plist], [w for _, w in plist])
+
+    @classmethod
+    def from_library(cls, library, **kwargs) -> "BM25Index":
+        """Index every example text plus one descriptor doc per scenario (see BehaviorLibrary.documents)"""
+        return cls(((scenario, text) for scenario, text, _ in library.documents()), **kwargs)
+
+    def to_dict(self) -> dict:
+        """
+        JSON-serializable state for from_dict().
+
+        Postings are concatenated into two flat binary arrays (base64) with
+        per-term offsets, so restoring them is a memcpy rather than parsing
+        tens of thousands of JSON numbers.
+        """
+        terms = list(self._postings)
+        idf = []
+        offsets = [0]
+        doc_ids = array("i")
+        weights = array("d")
+        for term in terms:
+            term_idf, ids, term_weights = self._postings[term]
+            idf.append(term_idf)
+            doc_ids.extend(ids)
+            weights.extend(term_weights)
+            offsets.append(len(doc_ids))
+        return {
+            "k1": self.k1,
+            "b": self.b,
+            "scenarios": list(self.scenarios),
+            "doc_scenarios": list(self._doc_scenarios),
+            "terms": terms,
+            "idf": idf,
+            "offsets": offsets,
+            "byteorder": sys.byteorder,
+            "doc_ids": base64.b64encode(doc_ids.tobytes()).decode("ascii"),
+            "weights": base64.b64encode(weights.tobytes()).decode("ascii"),
+        }
+
+    @classmethod
+    def from_dict(cls, state: dict) -> "BM25Index":
+        """Restore an index exported with to_dict()"""
+        doc_ids = array("i", base64.b64decode(state["doc_ids"]))
+        weights = array("d", base64.b64decode(state["weights"]))
+        if state["byteorder"] != sys.byteorder:
+            doc_ids.byteswap()
+            weights.byteswap()
+        # One int object per document, shared by every posting (as after a build)
+        doc_objects = list(range(len(state["doc_scenarios"])))
+        ids_list = [doc_objects[doc_id] for doc_id in doc_ids]
+        weights_list = weights.tolist()
+        offsets = state["offsets"]
+
+        index = cls.__new__(cls)
+        index.k1 = state["k1"]
+        index.b = state["b"]
+        index.scenarios = tuple(state["scenarios"])
+        index._doc_scenarios = tuple(state["doc_scenarios"])
+        index.doc_count = len(index._doc_scenarios)
+        index._postings = {
+            term: (idf, ids_list[start:end], weights_list[start:end])
+            for term, idf, start, end in zip(state["terms"], state["idf"], offsets, offsets[1:])
+        }
+        return index
+
+    @property
+    def vocabulary_size(self) -> int:
+        return len(self._postings)
+
+    def score_docs(self, terms: Sequence[str]) -> Dict[int, float]:
+        """BM25 score per matching document id for already-tokenized terms"""
+        scores: Dict[int, float] = {}
+        get = scores.get
+        for term, qtf in Counter(terms).items():
+            posting = self._postings.get(term)
+            if posting is None:
+                continue
+            idf, doc_ids, weights = posting
+            idf *= qtf
+            for doc_id, weight in zip(doc_ids, weights):
+                scores[doc_id] = get(doc_id, 0.0) + idf * weight
+        return scores
+
+    def search(self, query: str, k: int = 3, terms: Optional[Sequence[str]] = None) -> List[Tuple[str, float]]:
+        """
+        Top-k scenarios for a query.
+
+        Args:
+            query: Raw query text
+            k: Number of scenarios to return
+            terms: Pre-tokenized query (skips tokenize(query))
+
+        Returns:
+            (scenario, score) pairs, best first; empty if no term matched
+        """
+        return [(scenario, score) for scenario, score, _ in self.search_detailed(query, k, terms)]
+
+    def search_detailed(
+        self,
+        query: str,
+        k: int = 3,
+        terms: Optional[Sequence[str]] = None,
+        allowed: Optional[AbstractSet[str]] = None,
+    ) -> List[Tuple[str, float, List[Tuple[int, float]]]]:
+        """
+        Top-k scenarios for a query, with the documents behind each score.
+
+        Same ranking as search(); the best documents come out of the
+        roll-up for free, so this costs no more than search().
+
+        Args:
+            allowed: Only roll up documents of these scenarios (None: all)
+
+        Returns:
+            (scenario, score, [(doc_id, doc_score), ...]) triples, best first;
+            at most len(SCENARIO_DOC_WEIGHTS) docs per scenario, best first
+        """
+        doc_scores = self.score_docs(tokenize(query) if terms is None else terms)
+        if not doc_scores:
+            return []
+
+        allowed_ids = None
+        if allowed is not None:
+            allowed_ids = {i for i, scenario in enumerate(self.scenarios) if scenario in allowed}
+
+        per_scenario: Dict[int, List[Tuple[float, int]]] = {}
+        top_n = len(SCENARIO_DOC_WEIGHTS)
+        for doc_id, score in doc_scores.items():
+            scenario_id = self._doc_scenarios[doc_id]
+            if allowed_ids is not None and scenario_id not in allowed_ids:
+                continue
+            best = per_scenario.setdefault(scenario_id, [])
+            if len(best) < top_n:
+                heapq.heappush(best, (score, doc_id))
+            elif score > best[0][0]:
+                heapq.heapreplace(best, (score, doc_id))
+
+        totals = []
+        for scenario_id, best in per_scenario.items():
+            best.sort(reverse=True)
+            totals.append((sum([w * s for w, (s, _) in zip(SCENARIO_DOC_WEIGHTS, best)]), scenario_id))
+
+        # Document lists only for the scenarios that make the cut
+        return [
+            (self.scenarios[scenario_id], total, [(doc_id, s) for s, doc_id in per_scenario[scenario_id]])
+            for total, scenario_id in heapq.nlargest(k, totals, key=lambda item: item[0])
+        ]
@@ -0,0 +1,72 @@
+"""
+Behavior Library Compiler
+
+Build step that turns behavior_library/*.json into the compact artifact
+loaded at startup (see library.py / artifact.py):
+
+- each scenario's do/dont/tone/action_suggestions block stored once
+  instead of once per example entry
+- example texts deduplicated across the whole library
+- the BM25 index prebuilt, so startup does no tokenizing
+
+Usage:
+    PYTHONPATH=src python -m rag.compile [--library PATH] [--out PATH]
+"""
+
+import argparse
+import time
+from pathlib import Path
+from typing import Optional
+
+from .artifact import artifact_path, source_files, source_manifest, write_artifact
+from .library import BehaviorLibrary, find_library_path
+
+
+def compile_library(library_path: Path, out: Optional[Path] = None) -> dict:
+    """
+    Compile the library at `library_path` and write the artifact.
+
+    Returns:
+        Summary dict: path, version, scenarios, texts, bytes, source_bytes
+    """
+    # Manifest first: if a file changes mid-build the artifact reads as stale
+    files = source_files(library_path)
+    manifest = source_manifest(files)
+    library = BehaviorLibrary.load_sources(library_path)
+    payload = library.to_artifact(manifest)
+
+    out = out or artifact_path(library_path)
+    size = write_artifact(out, payload)
+    return {
+        "path": str(out),
+        "version": library.version,
+        "scenarios": len(library),
+        "entries": library.entry_count,
+        "texts": len(payload["texts"]),
+        "bytes": size,
+        "source_bytes": sum(entry[1] for entry in manifest),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compile behavior_library into a compact artifact")
+    parser.add_argument("--library", type=Path, help="behavior_library directory (default: auto-detect)")
+    parser.add_argument("--out", type=Path, help="Artifact path (default: <library>/library.compiled)")
+    args = parser.parse_args()
+
+    library_path = args.library or find_library_path()
+    if library_path is None or not library_path.exists():
+        raise SystemExit("behavior_library not found")
+
+    start = time.perf_counter()
+    summary = compile_library(library_path, args.out)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    print(f"[RAG] Compiled {summary['scenarios']} scenarios ({summary['entries']} entries, "
+          f"{summary['texts']} distinct texts) in {elapsed_ms:.0f} ms")
+    print(f"   {summary['source_bytes'] / 1e6:.1f} MB JSON -> {summary['bytes'] / 1e6:.1f} MB "
+          f"at {summary['path']} (version {summary['version']})")
+
+
+if __name__ == "__main__":
+    main()
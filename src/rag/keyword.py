@@ -0,0 +1,65 @@
+"""
+Keyword Scenario Index
+
+The original retrieval engine: overlap between the query's words and
+each scenario's name/label words, plus a boost when a query word appears
+in the scenario's file name. No example texts are involved.
+"""
+
+from typing import FrozenSet, Iterable, List, Tuple
+
+
+# Added when any query word is a substring of the file name
+FILE_NAME_BOOST = 2
+
+
+class KeywordIndex:
+    """
+    Keyword overlap per scenario.
+
+    Example:
+        >>> index = KeywordIndex.from_documents([("office stress", "boss yelled"), ("train late", "late again")])
+        >>> index.search("office stress work", k=1)
+        [('office stress', 4.0)]
+    """
+
+    def __init__(self, scenarios: Iterable[Tuple[str, Iterable[str], str]]):
+        """
+        Args:
+            scenarios: (name, keywords, file stem) per scenario
+        """
+        self._scenarios: Tuple[Tuple[str, FrozenSet[str], str], ...] = tuple(
+            (name, frozenset(keywords), file_stem.lower()) for name, keywords, file_stem in scenarios
+        )
+        self.scenarios: Tuple[str, ...] = tuple(name for name, _, _ in self._scenarios)
+
+    @classmethod
+    def from_library(cls, library) -> "KeywordIndex":
+        return cls((record.name, record.keywords, record.file_stem) for record in library.scenarios)
+
+    @classmethod
+    def from_documents(cls, docs: Iterable[Tuple[str, str]]) -> "KeywordIndex":
+        """Index the scenario names of (scenario, text) docs; the texts are ignored"""
+        names = dict.fromkeys(scenario for scenario, _ in docs)
+        return cls((name, name.split(), name.replace(" ", "_")) for name in names)
+
+    def search(self, query: str, k: int = 3) -> List[Tuple[str, float]]:
+        """
+        Top-k scenarios by keyword overlap.
+
+        Returns:
+            (scenario, score) pairs, best first; empty if no word matched
+        """
+        query_words = set(query.lower().split())
+
+        ranked = []
+        for name, keywords, file_stem in self._scenarios:
+            matches = len(query_words & keywords)
+            if any(word in file_stem for word in query_words):
+                matches += FILE_NAME_BOOST
+            if matches > 0:
+                ranked.append((name, float(matches)))
+
+        # Stable sort keeps library order on ties, like the old first-best scan
+        ranked.sort(key=lambda item: item[1], reverse=True)
+        return ranked[:k]
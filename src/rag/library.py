@@ -0,0 +1,301 @@
+"""
+Behavior Library Index
+
+Loads behavior_library/*.json once per process into an immutable
+in-memory index, so retrieval never touches the disk on the hot path.
+The BM25 and character n-gram text indexes over the example texts are
+built on first use.
+
+If a compiled artifact (python -m rag.compile) matching the sources is
+present, it is loaded instead: one read, example texts deduplicated and
+the BM25 index prebuilt.
+"""
+
+import threading
+from dataclasses import dataclass
+from functools import cached_property
+from pathlib import Path
+from types import MappingProxyType
+from typing import FrozenSet, List, Mapping, Optional, Tuple
+
+from telemetry.logging import get_logger
+from .artifact import (
+    FORMAT_VERSION,
+    artifact_path,
+    library_version,
+    loads,
+    read_artifact,
+    source_files,
+)
+from .bm25 import BM25Index
+from .keyword import KeywordIndex
+from .signals import SignalIndex
+
+
+logger = get_logger(__name__)
+
+
+# Candidate locations for behavior_library, in priority order
+LIBRARY_PATHS = (
+    Path(__file__).parent.parent.parent / "behavior_library",  # Development
+    Path("/app/behavior_library"),  # Docker production
+    Path.cwd() / "behavior_library",  # Alternative
+)
+
+
+@dataclass(frozen=True)
+class ScenarioRecord:
+    """
+    One behavior library file, flattened for retrieval.
+
+    Every entry in a scenario file repeats the same guidance block, so it
+    is stored once in `metadata`; the per-entry example messages live in
+    `texts`.
+    """
+
+    name: str                   # Human readable, e.g. "train late"
+    file_stem: str              # e.g. "train_late_enhanced"
+    metadata: Mapping[str, object]
+    texts: Tuple[str, ...]
+    keywords: FrozenSet[str]
+
+    def to_knowledge(self) -> dict:
+        """
+        Return a fresh knowledge dict in the shape of a library entry.
+
+        Lists are copied so callers can never mutate the shared index.
+        """
+        knowledge = {
+            key: list(value) if isinstance(value, (list, tuple)) else value
+            for key, value in self.metadata.items()
+        }
+        if self.texts:
+            knowledge["text"] = self.texts[0]
+        return knowledge
+
+
+class BehaviorLibrary:
+    """Immutable, query-only view over every scenario in the library"""
+
+    def __init__(self, path: Optional[Path], scenarios: Tuple[ScenarioRecord, ...],
+                 version: str = "", bm25: Optional[BM25Index] = None):
+        self.path = path
+        self.scenarios = scenarios
+        self.version = version  # Content hash of the source files
+        if bm25 is not None:
+            self.__dict__["bm25"] = bm25  # Prebuilt: skip the cached_property build
+        self._by_name: Mapping[str, ScenarioRecord] = MappingProxyType(
+            {record.name: record for record in scenarios}
+        )
+
+    def __len__(self) -> int:
+        return len(self.scenarios)
+
+    def get(self, name: str) -> Optional[ScenarioRecord]:
+        """Look up a scenario by its human readable name"""
+        return self._by_name.get(name)
+
+    def scenario_names(self) -> List[str]:
+        """Sorted list of scenario names"""
+        return sorted(self._by_name)
+
+    @property
+    def entry_count(self) -> int:
+        """Total number of example entries across all scenarios"""
+        return sum(len(record.texts) for record in self.scenarios)
+
+    def documents(self) -> List[Tuple[str, str, bool]]:
+        """
+        (scenario name, text, is_example) per BM25 document, in doc id
+        order: for each scenario, one descriptor doc (name, scenario and
+        typical emotions) followed by its example texts.
+        """
+        docs = []
+        for record in self.scenarios:
+            descriptor = " ".join([record.name, str(record.metadata.get("scenario", "")).replace("_", " ")]
+                                  + list(record.metadata.get("typical_emotions", ())))
+            docs.append((record.name, descriptor, False))
+            docs.extend((record.name, text, True) for text in record.texts)
+        return docs
+
+    @cached_property
+    def doc_examples(self) -> Tuple[Optional[str], ...]:
+        """Example text per BM25 doc id (None for descriptor docs)"""
+        return tuple(text if is_example else None for _, text, is_example in self.documents())
+
+    @cached_property
+    def bm25(self) -> BM25Index:
+        """BM25 index over every example text (built once, on first access)"""
+        return BM25Index.from_library(self)
+
+    @cached_property
+    def keyword(self) -> KeywordIndex:
+        """Keyword overlap index over scenario names and labels"""
+        return KeywordIndex.from_library(self)
+
+    @cached_property
+    def signals(self) -> SignalIndex:
+        """Structured-signal lookups (emotion/relationship/need -> scenarios)"""
+        return SignalIndex.from_library(self)
+
+    @cached_property
+    def ngram(self):
+        """Character n-gram index over every example text (built once, on first access)"""
+        from .ngram import NgramIndex  # numpy is only needed for this engine
+        return NgramIndex.from_library(self)
+
+    @classmethod
+    def load(cls, path: Optional[Path]) -> "BehaviorLibrary":
+        """
+        Load the library under `path`: the compiled artifact if it is
+        present and current, otherwise the JSON sources.
+        """
+        if path is None:
+            return cls(None, ())
+
+        payload = read_artifact(artifact_path(path), path)
+        if payload is not None:
+            return cls.from_artifact(path, payload)
+        return cls.load_sources(path)
+
+    @classmethod
+    def load_sources(cls, path: Path) -> "BehaviorLibrary":
+        """
+        Parse every JSON file under `path` into a library index.
+
+        Files that fail to parse are skipped, matching the old retriever.
+        """
+        records = []
+        sources = []
+        for json_file in source_files(path):
+            try:
+                with open(json_file, "rb") as f:
+                    raw = f.read()
+                data = loads(raw)
+            except Exception:
+                continue
+            sources.append((json_file.name, raw))
+
+            record = _build_record(json_file.stem, data)
+            if record is not None:
+                records.append(record)
+
+        return cls(path, tuple(records), version=library_version(sources))
+
+    def to_artifact(self, manifest: List[list]) -> dict:
+        """
+        Compact, JSON-serializable form: one metadata block per scenario,
+        each distinct example text stored once, plus the BM25 index.
+
+        Args:
+            manifest: source_manifest() taken before the sources were read
+        """
+        text_ids = {}
+        scenarios = []
+        for record in self.scenarios:
+            scenarios.append({
+                "name": record.name,
+                "file_stem": record.file_stem,
+                "metadata": dict(record.metadata),
+                "keywords": sorted(record.keywords),
+                "texts": [text_ids.setdefault(text, len(text_ids)) for text in record.texts],
+            })
+        return {
+            "format": FORMAT_VERSION,
+            "version": self.version,
+            "manifest": manifest,
+            "texts": list(text_ids),
+            "scenarios": scenarios,
+            "bm25": self.bm25.to_dict(),
+        }
+
+    @classmethod
+    def from_artifact(cls, path: Optional[Path], payload: dict) -> "BehaviorLibrary":
+        """Rebuild the library from to_artifact() output"""
+        texts = payload["texts"]
+        records = tuple(
+            ScenarioRecord(
+                name=item["name"],
+                file_stem=item["file_stem"],
+                metadata=MappingProxyType({
+                    key: tuple(value) if isinstance(value, list) else value
+                    for key, value in item["metadata"].items()
+                }),
+                texts=tuple(texts[i] for i in item["texts"]),
+                keywords=frozenset(item["keywords"]),
+            )
+            for item in payload["scenarios"]
+        )
+        return cls(path, records, version=payload["version"], bm25=BM25Index.from_dict(payload["bm25"]))
+
+
+def _build_record(file_stem: str, data) -> Optional[ScenarioRecord]:
+    """Flatten one library file (list or single object) into a ScenarioRecord"""
+    if isinstance(data, list):
+        entries = [entry for entry in data if isinstance(entry, dict)]
+    elif isinstance(data, dict):
+        entries = [data]
+    else:
+        return None
+
+    if not entries:
+        return None
+
+    first = entries[0]
+    metadata = {
+        key: tuple(value) if isinstance(value, list) else value
+        for key, value in first.items()
+        if key != "text"
+    }
+    texts = tuple(entry["text"] for entry in entries if entry.get("text"))
+
+    name = file_stem.replace("_enhanced", "").replace("_", " ")
+    keywords = set(name.split())
+    if "scenario" in first:
+        keywords.update(str(first["scenario"]).replace("_", " ").split())
+
+    return ScenarioRecord(
+        name=name,
+        file_stem=file_stem,
+        metadata=MappingProxyType(metadata),
+        texts=texts,
+        keywords=frozenset(keywords),
+    )
+
+
+def find_library_path() -> Optional[Path]:
+    """Return the first existing behavior_library directory, if any"""
+    for path in LIBRARY_PATHS:
+        if path.exists():
+            return path
+    return None
+
+
+_library: Optional[BehaviorLibrary] = None
+_library_lock = threading.Lock()
+
+
+def get_library() -> BehaviorLibrary:
+    """
+    Get the process-wide behavior library, loading it on first use.
+
+    Call this at startup to pay the parse cost before the first request.
+    """
+    global _library
+    if _library is None:
+        with _library_lock:
+            if _library is None:
+                path = find_library_path()
+                if path is None:
+                    logger.warning("behavior_library not found, tried %s", [str(p) for p in LIBRARY_PATHS],
+                                   extra={"stage": "library_load"})
+                _library = BehaviorLibrary.load(path)
+    return _library
+
+
+def reload_library() -> BehaviorLibrary:
+    """Drop the cached index and load the library again from disk"""
+    global _library
+    with _library_lock:
+        _library = None
+    return get_library()
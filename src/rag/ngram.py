@@ -0,0 +1,262 @@
+"""
+Character N-gram Scenario Index
+
+Hashed character n-gram vectors over the behavior library's example
+texts, queried by cosine similarity. Where BM25 needs exact (normalized)
+words, n-grams still overlap across Hinglish spelling variation ("upp" /
+"up", "hora" / "ho raha", "pareshan" / "preshan"), which gives a cheap
+semantic-ish match without a network embedding service.
+
+- Text is lowercased, URLs/mentions dropped and every run of a repeated
+  character collapsed ("bahuuut", "acchha", "upp" -> "bahut", "acha", "up")
+- Each word is padded with spaces and split into 3- and 4-grams, hashed
+  (crc32, stable across processes) into DEFAULT_N_FEATURES buckets
+- Weights are sublinear tf * idf, L2-normalized per document
+- The document matrix is stored column-wise (bucket -> doc ids, weights)
+  as flat NumPy arrays, so a query only touches the postings of its own
+  n-grams (minus the most common ones, see MAX_DF); a batch of queries
+  is scored with one bincount
+
+Documents and scenario roll-up follow BM25Index (same (scenario, text)
+input, same doc ids, same search/search_detailed results shape), so the
+two engines are interchangeable in the retriever.
+"""
+
+import math
+import re
+import zlib
+from collections import Counter
+from functools import lru_cache
+from typing import AbstractSet, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .bm25 import SCENARIO_DOC_WEIGHTS
+
+
+DEFAULT_N_FEATURES = 2 ** 20
+NGRAM_RANGE = (3, 4)
+
+# Scenario scores are rolled up over each query's best documents only
+CANDIDATE_DOCS = 64
+
+# N-grams in more than this fraction of documents (" ha", "hai ", ...) count
+# towards document norms but get no postings: they carry little weight and
+# would otherwise be most of the postings every query walks. Small corpora
+# (under MIN_STOP_DF / MAX_DF documents) keep every n-gram and score exactly.
+MAX_DF = 0.05
+MIN_STOP_DF = 100
+
+_URL_RE = re.compile(r"https?://\S+|www\.\S+|@\w+")
+_REPEAT_RE = re.compile(r"(.)\1+")
+_WORD_RE = re.compile(r"[a-z0-9\u0900-\u097f]+|[\U0001f300-\U0001faff\u2600-\u27bf]")
+
+
+def normalize_words(text: str) -> List[str]:
+    """Lowercased words (and emoji) with repeated characters collapsed"""
+    text = _URL_RE.sub(" ", text.lower())
+    return [_REPEAT_RE.sub(r"\1", word) for word in _WORD_RE.findall(text)]
+
+
+@lru_cache(maxsize=65536)
+def _word_buckets(word: str, n_features: int) -> Tuple[int, ...]:
+    """Hashed buckets of the padded word's character n-grams"""
+    padded = f" {word} "
+    if len(padded) <= NGRAM_RANGE[0]:
+        grams = [padded]
+    else:
+        grams = [
+            padded[i:i + n]
+            for n in range(NGRAM_RANGE[0], NGRAM_RANGE[1] + 1)
+            for i in range(len(padded) - n + 1)
+        ]
+    mask = n_features - 1
+    return tuple(zlib.crc32(gram.encode("utf-8")) & mask for gram in grams)
+
+
+def text_buckets(text: str, n_features: int = DEFAULT_N_FEATURES) -> Counter:
+    """Bucket -> n-gram count for a text"""
+    counts: Counter = Counter()
+    for word in normalize_words(text):
+        counts.update(_word_buckets(word, n_features))
+    return counts
+
+
+class NgramIndex:
+    """
+    Cosine similarity over hashed character n-grams, queried per scenario.
+
+    Example:
+        >>> index = NgramIndex([("upi fail", "upi payment fail hogaya"), ("train late", "train late hai")])
+        >>> index.search("upp paymnt failed", k=1)
+        [('upi fail', 0.31...)]
+    """
+
+    def __init__(self, docs: Iterable[Tuple[str, str]], n_features: int = DEFAULT_N_FEATURES):
+        """
+        Build the index.
+
+        Args:
+            docs: (scenario, text) pairs; a scenario may have any number of docs
+            n_features: Hash buckets (a power of two)
+
+        Raises:
+            ValueError: If n_features is not a power of two
+        """
+        if n_features <= 0 or n_features & (n_features - 1):
+            raise ValueError(f"n_features must be a power of two, got {n_features}")
+        self.n_features = n_features
+
+        scenario_ids: Dict[str, int] = {}
+        doc_scenarios: List[int] = []
+        rows: List[int] = []
+        cols: List[int] = []
+        tfs: List[int] = []
+        for doc_id, (scenario, text) in enumerate(docs):
+            doc_scenarios.append(scenario_ids.setdefault(scenario, len(scenario_ids)))
+            counts = text_buckets(text, n_features)
+            rows.extend([doc_id] * len(counts))
+            cols.extend(counts.keys())
+            tfs.extend(counts.values())
+
+        self.scenarios: Tuple[str, ...] = tuple(scenario_ids)
+        self._doc_scenarios = np.asarray(doc_scenarios, dtype=np.int32)
+        self.doc_count = len(doc_scenarios)
+
+        rows_arr = np.asarray(rows, dtype=np.int32)
+        cols_arr = np.asarray(cols, dtype=np.int64)
+        features, df = np.unique(cols_arr, return_counts=True)
+
+        # Smooth idf; _unseen_idf weighs query n-grams no document has
+        n = self.doc_count
+        self._idf = (np.log((1 + n) / (1 + df)) + 1).astype(np.float32)
+        self._unseen_idf = float(math.log(1 + n) + 1)
+
+        weights = (1 + np.log(np.asarray(tfs, dtype=np.float32))) * self._idf[np.searchsorted(features, cols_arr)]
+        norms = np.sqrt(np.bincount(rows_arr, weights=weights.astype(np.float64) ** 2, minlength=n))
+        norms[norms == 0] = 1.0
+        weights = (weights / norms[rows_arr]).astype(np.float32)
+
+        # Column-wise layout: postings of features[i] are [indptr[i], indptr[i + 1]);
+        # stop n-grams keep their idf but get an empty postings range
+        kept = np.where(df > max(MAX_DF * n, MIN_STOP_DF), 0, df)
+        order = np.argsort(cols_arr, kind="stable")
+        order = order[np.repeat(kept > 0, df)]
+        self._features = features
+        self._indptr = np.concatenate([[0], np.cumsum(kept)])
+        self._doc_ids = rows_arr[order].astype(np.int64)
+        self._weights = weights[order].astype(np.float64)
+
+    @classmethod
+    def from_library(cls, library, **kwargs) -> "NgramIndex":
+        """Index every example text plus one descriptor doc per scenario (see BehaviorLibrary.documents)"""
+        return cls(((scenario, text) for scenario, text, _ in library.documents()), **kwargs)
+
+    @property
+    def nnz(self) -> int:
+        """Stored (document, bucket) weights"""
+        return len(self._weights)
+
+    def score_docs_many(self, queries: Sequence[str]) -> np.ndarray:
+        """
+        Cosine similarity of every query against every document.
+
+        Returns:
+            float array of shape (len(queries), doc_count)
+        """
+        n = self.doc_count
+        starts, lengths, query_weights, query_rows = [], [], [], []
+        for row, query in enumerate(queries):
+            counts = text_buckets(query, self.n_features)
+            if not counts:
+                continue
+            buckets = np.fromiter(counts.keys(), dtype=np.int64, count=len(counts))
+            tf = np.fromiter(counts.values(), dtype=np.float32, count=len(counts))
+
+            pos = np.minimum(np.searchsorted(self._features, buckets), max(len(self._features) - 1, 0))
+            known = self._features[pos] == buckets if len(self._features) else np.zeros(len(buckets), bool)
+            weights = (1 + np.log(tf)) * np.where(known, self._idf[pos] if len(self._idf) else 0, self._unseen_idf)
+            weights /= np.sqrt(np.dot(weights, weights))
+
+            pos = pos[known]
+            starts.append(self._indptr[pos])
+            lengths.append(self._indptr[pos + 1] - self._indptr[pos])
+            query_weights.append(weights[known])
+            query_rows.append(np.full(len(pos), row, dtype=np.int64))
+
+        if not starts:
+            return np.zeros((len(queries), n))
+
+        starts = np.concatenate(starts)
+        lengths = np.concatenate(lengths)
+        total = int(lengths.sum())
+        # Flat positions of every posting of every query n-gram
+        offsets = np.repeat(starts - np.cumsum(lengths) + lengths, lengths) + np.arange(total)
+        slots = np.repeat(np.concatenate(query_rows), lengths) * n + self._doc_ids[offsets]
+        values = np.repeat(np.concatenate(query_weights), lengths) * self._weights[offsets]
+        return np.bincount(slots, weights=values, minlength=len(queries) * n).reshape(len(queries), n)
+
+    def search_detailed_many(
+        self, queries: Sequence[str], k: int = 3, allowed: Optional[AbstractSet[str]] = None
+    ) -> List[List[Tuple[str, float, List[Tuple[int, float]]]]]:
+        """
+        Top-k scenarios for each of several queries, scored in one batch.
+
+        Args:
+            allowed: Only consider documents of these scenarios (None: all)
+
+        Returns:
+            Per query, (scenario, score, [(doc_id, doc_score), ...]) triples
+            as in BM25Index.search_detailed(); empty if nothing matched
+        """
+        if not self.doc_count:
+            return [[] for _ in queries]
+        scores = self.score_docs_many(queries)
+        if allowed is not None:
+            allowed_ids = [i for i, scenario in enumerate(self.scenarios) if scenario in allowed]
+            scores[:, ~np.isin(self._doc_scenarios, allowed_ids)] = 0.0
+        top = min(CANDIDATE_DOCS, self.doc_count)
+        candidates = np.argpartition(-scores, top - 1, axis=1)[:, :top]
+
+        results = []
+        for row, doc_ids in zip(scores, candidates):
+            doc_ids = doc_ids[np.argsort(-row[doc_ids], kind="stable")]
+            per_scenario: Dict[int, List[Tuple[int, float]]] = {}
+            for doc_id, scenario_id, score in zip(
+                doc_ids.tolist(), self._doc_scenarios[doc_ids].tolist(), row[doc_ids].tolist()
+            ):
+                if score <= 0:
+                    break
+                best = per_scenario.setdefault(scenario_id, [])
+                if len(best) < len(SCENARIO_DOC_WEIGHTS):
+                    best.append((doc_id, score))
+
+            ranked = [
+                (self.scenarios[scenario_id], sum(w * s for w, (_, s) in zip(SCENARIO_DOC_WEIGHTS, best)), best)
+                for scenario_id, best in per_scenario.items()
+            ]
+            ranked.sort(key=lambda item: item[1], reverse=True)
+            results.append(ranked[:k])
+        return results
+
+    def search_many(self, queries: Sequence[str], k: int = 3) -> List[List[Tuple[str, float]]]:
+        """Top-k (scenario, score) pairs for each query, scored in one batch"""
+        return [
+            [(scenario, score) for scenario, score, _ in ranked]
+            for ranked in self.search_detailed_many(queries, k)
+        ]
+
+    def search_detailed(
+        self, query: str, k: int = 3, allowed: Optional[AbstractSet[str]] = None
+    ) -> List[Tuple[str, float, List[Tuple[int, float]]]]:
+        """Top-k scenarios for a query, with the documents behind each score"""
+        return self.search_detailed_many([query], k, allowed)[0]
+
+    def search(self, query: str, k: int = 3) -> List[Tuple[str, float]]:
+        """
+        Top-k scenarios for a query.
+
+        Returns:
+            (scenario, score) pairs, best first; empty if no n-gram matched
+        """
+        return self.search_many([query], k)[0]
@@ -0,0 +1,82 @@
+"""
+Knowledge Query Cache
+
+Memoizes find_relevant_knowledge() results. Chat traffic repeats itself
+("monday blues", "traffic bahut hai"), so the key is what the ranking
+actually sees rather than the raw string:
+
+- the query's normalized token signature for the active engine (sorted,
+  so word order, case, punctuation and elongations do not matter)
+- the structured signals used for filtering/boosting (emotion,
+  relationship, need)
+- engine, top-k and the library version, so a rebuilt library never
+  serves stale knowledge - old entries just age out of the LRU
+
+Configuration (environment variables):
+    RAG_CACHE_SIZE      Max cached queries, 0 disables (default: 2048)
+"""
+
+import os
+import threading
+from typing import Mapping, Optional, Tuple
+
+from cache import LRUCache
+from telemetry.logging import get_logger
+from .tokenize import tokenize
+
+
+DEFAULT_RAG_CACHE_SIZE = 2048
+
+logger = get_logger(__name__)
+
+
+def query_signature(query: str, engine: str) -> Tuple[str, ...]:
+    """
+    Order-independent normalized form of `query` for `engine`.
+
+    Two queries with the same signature rank identically: BM25 only sees
+    tokenize() terms, the n-gram engine only normalized words. The keyword
+    engine ranks on the lowercased word set but picks its examples through
+    BM25, so its signature is both.
+    """
+    if engine == "bm25":
+        return tuple(sorted(tokenize(query)))
+    if engine == "ngram":
+        from .ngram import normalize_words  # numpy
+        return tuple(sorted(normalize_words(query)))
+    return (tuple(sorted(set(query.lower().split()))), tuple(sorted(tokenize(query))))
+
+
+def knowledge_cache_key(
+    query: str,
+    analysis: Optional[Mapping],
+    engine: str,
+    k: int,
+    library_version: str,
+) -> Tuple:
+    """Hashable cache key for one find_relevant_knowledge() call"""
+    signals = (
+        (analysis.get("primary_emotion"), analysis.get("relationship"), analysis.get("user_need"))
+        if analysis else None
+    )
+    return (query_signature(query, engine), signals, engine, k, library_version)
+
+
+_cache: Optional[LRUCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_knowledge_cache() -> LRUCache:
+    """Get the process-wide knowledge cache, creating it on first use"""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                try:
+                    size = int(os.getenv("RAG_CACHE_SIZE", DEFAULT_RAG_CACHE_SIZE))
+                except ValueError:
+                    logger.warning("invalid RAG_CACHE_SIZE, using %s", DEFAULT_RAG_CACHE_SIZE,
+                                   extra={"stage": "rag"})
+                    size = DEFAULT_RAG_CACHE_SIZE
+                _cache = LRUCache(maxsize=max(size, 0), name="rag_knowledge")
+    return _cache
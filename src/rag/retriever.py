@@ -1,22 +1,74 @@
 """
 Behavior Knowledge RAG Retrieval
 
-Simple keyword-based matching to find relevant behavioral patterns
-from the behavior_library.
+Finds relevant behavioral patterns in the behavior_library. The library
+is parsed once per process (see library.py); every query runs against
+the in-memory index.
+
+Three engines rank scenarios for a message:
+- "bm25": BM25 over every example text, rolled up per scenario (see bm25.py)
+- "ngram": cosine over hashed character n-grams of the same texts, robust
+  to Hinglish spelling variation (see ngram.py; needs numpy)
+- "keyword": overlap between query words and scenario file names (see keyword.py)
+
+find_relevant_knowledge() takes the top-k scenarios (a message can touch
+several: "boss yelled and my UPI failed") and blends their guidance into
+one knowledge dict for the composer. The structured SocialAnalysis
+fields are not matched as text: they pre-filter and boost scenarios
+through the library's signal index (see signals.py).
+
+Configuration (environment variables):
+    RAG_ENGINE      "bm25" (default), "ngram" or "keyword"
+    RAG_TOP_K       Scenarios blended per message (default: 3)
+    RAG_CACHE_SIZE  Cached find_relevant_knowledge() results (see query_cache.py)
 """
 
 import os
-import json
-from pathlib import Path
-from typing import Dict, List, Optional
+from dataclasses import dataclass
+from itertools import zip_longest
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+
+from telemetry.logging import get_logger, warn_once
+from .library import ScenarioRecord, get_library
+from .query_cache import get_knowledge_cache, knowledge_cache_key
+
+
+logger = get_logger(__name__)
+
+
+RAG_ENGINES = ("bm25", "ngram", "keyword")
+DEFAULT_RAG_ENGINE = "bm25"
+
+DEFAULT_TOP_K = 3
+
+# Lower-ranked scenarios only contribute guidance if they score at least
+# this fraction of the top match
+BLEND_MIN_RELATIVE_SCORE = 0.5
+
+# Keys merged across scenarios, and how many items each keeps
+BLEND_LIST_KEYS = ("do", "dont", "action_suggestions")
+BLEND_MAX_ITEMS = 5
+
+# Extra scenarios fetched before signal boosts re-rank the top k
+SIGNAL_RERANK_POOL = 5
+
+
+@dataclass(frozen=True)
+class ScenarioMatch:
+    """One ranked scenario with its most similar example entries"""
+
+    name: str                   # Library scenario name, e.g. "upi fail"
+    score: float                # Engine score; only comparable within one engine
+    examples: Tuple[str, ...]   # Example texts closest to the query, best first
+    record: ScenarioRecord
 
 
 def retrieve_behavior_knowledge(scenario: str) -> dict:
     """
     Retrieve behavior knowledge from behavior_library based on scenario.
 
-    Uses simple keyword matching to find the best matching JSON file.
-    Loads all JSON files and returns the one with the most keyword matches.
+    Uses simple keyword matching against the preloaded library index
+    and returns the scenario with the most keyword matches.
 
     Args:
         scenario: Scenario description or keywords (e.g., "office stress", "exam anxiety")
@@ -30,70 +82,199 @@ def retrieve_behavior_knowledge(scenario: str) -> dict:
         >>> print(knowledge.get('do'))  # List of helpful patterns
     """
 
-    # Try multiple possible paths for behavior_library
-    possible_paths = [
-        Path(__file__).parent.parent.parent / "behavior_library",  # Development
-        Path("/app/behavior_library"),  # Docker production
-        Path.cwd() / "behavior_library",  # Alternative
-    ]
-
-    lib_path = None
-    for path in possible_paths:
-        if path.exists():
-            lib_path = path
-            break
+    ranked = _keyword_search(scenario, k=1)
 
-    if lib_path is None:
-        print(f"Warning: behavior_library not found. Tried: {[str(p) for p in possible_paths]}")
+    # Return best match or empty dict
+    if ranked:
+        return get_library().get(ranked[0][0]).to_knowledge()
+    else:
         return {}
 
-    # Convert scenario to lowercase keywords
-    scenario_keywords = set(scenario.lower().split())
 
-    best_match = None
-    best_score = 0
+def _keyword_search(query: str, k: int) -> List[Tuple[str, float]]:
+    """Top-k scenarios by keyword overlap (+2 if a word appears in the file name)"""
+    return get_library().keyword.search(query, k)
 
-    # Scan all JSON files in behavior_library
-    for json_file in lib_path.glob("*.json"):
-        try:
-            with open(json_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
 
-            # Handle both array and single object formats
-            if isinstance(data, list) and len(data) > 0:
-                data = data[0]  # Take first entry if array
+def get_rag_engine() -> str:
+    """Retrieval engine from RAG_ENGINE, falling back to bm25 on unknown values"""
+    engine = os.getenv("RAG_ENGINE", DEFAULT_RAG_ENGINE).lower()
+    if engine not in RAG_ENGINES:
+        warn_once(logger, ("RAG_ENGINE", engine), "unknown RAG_ENGINE %r, using %s",
+                  engine, DEFAULT_RAG_ENGINE, extra={"stage": "rag"})
+        return DEFAULT_RAG_ENGINE
+    return engine
 
-            # Extract scenario name from filename
-            file_scenario = json_file.stem.replace('_enhanced', '').replace('_', ' ')
 
-            # Calculate keyword match score
-            file_keywords = set(file_scenario.split())
+def search_scenarios(query: str, k: int = 3, engine: Optional[str] = None) -> List[Tuple[str, float]]:
+    """
+    Rank library scenarios for a free-text query.
 
-            # Also check the scenario field if it exists
-            if 'scenario' in data:
-                file_keywords.update(data['scenario'].replace('_', ' ').split())
+    Args:
+        query: User message and/or signal words
+        k: Number of scenarios to return
+        engine: One of RAG_ENGINES (defaults to RAG_ENGINE)
 
-            # Count matching keywords
-            matches = len(scenario_keywords & file_keywords)
+    Returns:
+        (scenario name, score) pairs, best first; scores are only
+        comparable within one engine
 
-            # Boost score if filename closely matches
-            if any(keyword in json_file.stem.lower() for keyword in scenario_keywords):
-                matches += 2
+    Raises:
+        ValueError: If engine is not one of RAG_ENGINES
 
-            if matches > best_score:
-                best_score = matches
-                best_match = data
+    Example:
+        >>> search_scenarios("kal exam hai, bahut tension", k=2)
+        [('exam stress', 19.09...), ('overthinking night', 16.51...)]
+    """
+    engine = engine or get_rag_engine()
+    if engine == "bm25":
+        return get_library().bm25.search(query, k)
+    if engine == "ngram":
+        return get_library().ngram.search(query, k)
+    if engine == "keyword":
+        return _keyword_search(query, k)
+    raise ValueError(f"Unknown RAG engine '{engine}'. Expected one of {RAG_ENGINES}")
+
+
+def retrieve_scenarios(
+    query: str,
+    k: int = DEFAULT_TOP_K,
+    examples: int = 2,
+    engine: Optional[str] = None,
+    analysis: Optional[Mapping] = None
+) -> List[ScenarioMatch]:
+    """
+    Top-k scenarios for a query, each with its most similar example entries.
 
-        except Exception as e:
-            # Skip files that can't be parsed
-            continue
+    With the bm25 and ngram engines the example entries fall out of the
+    same ranking pass; with the keyword engine one extra pass over the
+    prebuilt BM25 index picks them for the chosen scenarios.
 
-    # Return best match or empty dict
-    if best_match:
-        return best_match
+    With an `analysis`, scenarios whose typical emotions contradict it are
+    filtered out before text scoring, and scenarios matching its emotion,
+    relationship or need get their scores boosted (see signals.py).
+
+    Args:
+        query: User message and/or signal words
+        k: Number of scenarios to return
+        examples: Example texts per scenario (at most 3)
+        engine: One of RAG_ENGINES (defaults to RAG_ENGINE)
+        analysis: Optional SocialAnalysis dict (primary_emotion, relationship, user_need)
+
+    Returns:
+        ScenarioMatch list, best first
+
+    Raises:
+        ValueError: If engine is not one of RAG_ENGINES
+
+    Example:
+        >>> [m.name for m in retrieve_scenarios("office me boss ne daant diya aur upi bhi fail ho gaya", k=2)]
+        ['upi fail', 'office politics']
+    """
+    engine = engine or get_rag_engine()
+    library = get_library()
+    plan = library.signals.plan(analysis)
+    pool = k + SIGNAL_RERANK_POOL if plan.boosts else k
+
+    if engine in ("bm25", "ngram"):
+        index = library.bm25 if engine == "bm25" else library.ngram
+        detailed = plan.apply(index.search_detailed(query, pool, allowed=plan.allowed))[:k]
+        ranked = [(name, score) for name, score, _ in detailed]
+        best_docs = {name: docs for name, _, docs in detailed}
+    elif engine == "keyword":
+        ranked = _keyword_search(query, len(library))
+        if plan.allowed is not None:
+            ranked = [item for item in ranked if item[0] in plan.allowed]
+        ranked = plan.apply(ranked)[:k]
+        index = library.bm25
+        best_docs = {name: docs for name, _, docs in index.search_detailed(query, len(index.scenarios))}
     else:
+        raise ValueError(f"Unknown RAG engine '{engine}'. Expected one of {RAG_ENGINES}")
+
+    doc_examples = library.doc_examples
+    matches = []
+    for name, score in ranked:
+        texts = [doc_examples[doc_id] for doc_id, _ in best_docs.get(name, ())]
+        # Library files repeat some entries verbatim; keep each text once
+        unique = tuple(dict.fromkeys(text for text in texts if text is not None))
+        matches.append(ScenarioMatch(
+            name=name,
+            score=score,
+            examples=unique[:examples],
+            record=library.get(name),
+        ))
+    return matches
+
+
+def blend_knowledge(matches: Sequence[ScenarioMatch], max_items: int = BLEND_MAX_ITEMS) -> dict:
+    """
+    Merge the guidance of several matched scenarios into one knowledge dict.
+
+    The top match supplies scenario, tone and emotions. do/dont/action
+    lists are interleaved across every match scoring at least
+    BLEND_MIN_RELATIVE_SCORE of the top one (best scenario first, duplicates
+    dropped), and humor is only allowed if all of them allow it.
+
+    Args:
+        matches: retrieve_scenarios() output, best first
+        max_items: Items kept per merged list
+
+    Returns:
+        Knowledge dict in the shape of a library entry, plus
+        "related_scenarios" and "examples"; empty if there are no matches
+    """
+    if not matches:
         return {}
 
+    top = matches[0]
+    blended = [m for m in matches if m.score >= top.score * BLEND_MIN_RELATIVE_SCORE]
+
+    knowledge = top.record.to_knowledge()
+    for key in BLEND_LIST_KEYS:
+        merged = _interleave([m.record.metadata.get(key, ()) for m in blended], max_items)
+        if merged:
+            knowledge[key] = merged
+
+    if "humor_allowed" in knowledge:
+        knowledge["humor_allowed"] = all(m.record.metadata.get("humor_allowed", True) for m in blended)
+
+    if top.examples:
+        knowledge["text"] = top.examples[0]
+    knowledge["examples"] = list(top.examples)
+    knowledge["related_scenarios"] = [
+        m.record.metadata.get("scenario", m.name) for m in blended[1:]
+    ]
+    return knowledge
+
+
+def _interleave(lists: Sequence[Sequence[str]], limit: int) -> List[str]:
+    """Round-robin over the lists, skipping case-insensitive duplicates"""
+    merged = []
+    seen = set()
+    for row in zip_longest(*lists):
+        for item in row:
+            if item is None:
+                continue
+            key = item.strip().lower()
+            if key in seen:
+                continue
+            seen.add(key)
+            merged.append(item)
+            if len(merged) >= limit:
+                return merged
+    return merged
+
+
+def get_top_k() -> int:
+    """Scenarios blended per message, from RAG_TOP_K"""
+    value = os.getenv("RAG_TOP_K", DEFAULT_TOP_K)
+    try:
+        return max(1, int(value))
+    except ValueError:
+        warn_once(logger, ("RAG_TOP_K", value), "invalid RAG_TOP_K %r, using %s",
+                  value, DEFAULT_TOP_K, extra={"stage": "rag"})
+        return DEFAULT_TOP_K
+
 
 def get_all_scenarios() -> List[str]:
     """
@@ -102,17 +283,7 @@ def get_all_scenarios() -> List[str]:
     Returns:
         List of scenario names
     """
-    lib_path = Path(__file__).parent.parent.parent / "behavior_library"
-
-    if not lib_path.exists():
-        return []
-
-    scenarios = []
-    for json_file in lib_path.glob("*.json"):
-        scenario_name = json_file.stem.replace('_enhanced', '').replace('_', ' ')
-        scenarios.append(scenario_name)
-
-    return sorted(scenarios)
+    return get_library().scenario_names()
 
 
 def find_relevant_knowledge(
@@ -122,17 +293,43 @@ def find_relevant_knowledge(
     """
     Find relevant behavior knowledge based on user message and social analysis.
 
-    Combines keywords from both user message and detected signals for better matching.
+    Ranks the top RAG_TOP_K scenarios for the message with the configured
+    engine, using the detected signals as pre-filters and boosts, and blends
+    their guidance (see blend_knowledge); falls back to keyword matching
+    over the message plus signal words when the engine finds nothing.
+
+    Results are cached per normalized query, signals and library version
+    (see query_cache.py); a repeat lookup skips scoring entirely.
 
     Args:
         user_message: The user's actual message
         social_analysis: Optional dict with emotion, relationship, etc.
 
     Returns:
-        Dict containing relevant behavior patterns
+        Dict containing relevant behavior patterns; "scenario" is the top match
     """
+    engine = get_rag_engine()
+    k = get_top_k()
+    library = get_library()
+    cache = get_knowledge_cache()
+    key = knowledge_cache_key(user_message, social_analysis, engine, k, library.version)
+
+    cached = cache.get(key)
+    if cached is not None:
+        return _copy_knowledge(cached)
+
+    matches = retrieve_scenarios(user_message, k=k, engine=engine, analysis=social_analysis)
+    if not matches:
+        # Not cached: the fallback sees raw words the signature normalizes away
+        return retrieve_behavior_knowledge(_fallback_query(user_message, social_analysis))
+
+    knowledge = blend_knowledge(matches)
+    cache.set(key, knowledge)
+    return _copy_knowledge(knowledge)
+
 
-    # Build search query from message and signals
+def _fallback_query(user_message: str, social_analysis: Optional[Dict]) -> str:
+    """Keyword fallback query: message plus signal words"""
     search_terms = [user_message]
 
     if social_analysis:
@@ -149,7 +346,9 @@ def find_relevant_knowledge(
             search_terms.append(social_analysis['user_need'])
 
     # Combine all search terms
-    combined_query = ' '.join(search_terms)
+    return ' '.join(search_terms)
 
-    return retrieve_behavior_knowledge(combined_query)
 
+def _copy_knowledge(knowledge: dict) -> dict:
+    """Fresh dict and lists, so callers never mutate a cached entry"""
+    return {key: list(value) if isinstance(value, list) else value for key, value in knowledge.items()}
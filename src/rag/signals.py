@@ -0,0 +1,196 @@
+"""
+Structured Signal Index
+
+Secondary indexes from the SocialAnalysis fields to library scenarios,
+precomputed once per library so retrieval can apply them before (and
+instead of) pasting the labels into the text query:
+
+- emotion -> scenarios: the analysis labels ("anxiety") are mapped onto
+  the words used in the library's typical_emotions ("anxious",
+  "worried", ...); matching scenarios get a score boost
+- emotion valence -> excluded scenarios: a sad or angry message never
+  lands on a scenario whose typical emotions are all positive, and a
+  happy one never on an all-negative scenario (a cheap pre-filter that
+  shrinks the candidate set before text scoring)
+- relationship / user_need -> scenarios: hand-written priors (an
+  "authority" relationship points to office and HR scenarios), also
+  applied as boosts
+
+Scenarios without typical_emotions are never excluded, so a wrong or
+missing analysis can only cost a small boost, never a correct match.
+"""
+
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Dict, FrozenSet, Iterable, Mapping, Optional, Sequence, Tuple
+
+
+# SocialAnalysis.primary_emotion -> typical_emotions words in the library
+EMOTION_VOCABULARY = {
+    "frustration": ("frustrated", "annoyed", "impatient", "helpless", "exhausted", "burnt_out"),
+    "anger": ("angry", "frustrated", "annoyed", "betrayed"),
+    "sadness": ("sad", "sadness", "heartbroken", "hurt", "depressed", "low", "disappointed",
+                "grief", "sorrow", "mourning", "loss"),
+    "anxiety": ("anxious", "worried", "stressed", "panicked", "nervous", "overwhelmed",
+                "frantic", "uncertain"),
+    "confusion": ("confused", "uncertain"),
+    "boredom": ("bored",),
+    "happy": ("happy", "excited", "joyful", "proud", "relieved", "accomplished", "celebratory",
+              "grateful", "hyped", "giddy", "festive", "amused", "entertained", "playful",
+              "lighthearted", "laughing", "hopeful"),
+    "neutral": (),
+}
+
+# Library emotion words by valence; anything else ("cynical", "intense") is mixed
+POSITIVE_EMOTIONS = frozenset(EMOTION_VOCABULARY["happy"]) | {"relaxed", "comfortable", "passionate",
+                                                               "determined", "relatable"}
+NEGATIVE_EMOTIONS = frozenset(
+    word
+    for emotion in ("frustration", "anger", "sadness", "anxiety")
+    for word in EMOTION_VOCABULARY[emotion]
+) | {"shocked", "sick", "tired", "uncomfortable", "isolated"}
+
+# Analysis emotions whose valence excludes scenarios of the opposite one
+NEGATIVE_ANALYSIS_EMOTIONS = ("frustration", "anger", "sadness", "anxiety")
+POSITIVE_ANALYSIS_EMOTIONS = ("happy",)
+
+# SocialAnalysis.relationship -> library scenario ids (the files' "scenario" field)
+RELATIONSHIP_PRIORS = {
+    "authority": ("office_stress", "office_politics", "hr_issue", "hr_fuckup", "hr_ghosted",
+                  "deadline_panic", "layoff_news", "interview_experience", "attendance_short",
+                  "exam_stress"),
+    "family": ("mom_scolding", "loss_condolence", "health_issue", "festival", "birthday",
+               "money_problem"),
+    "romantic": ("breakup", "crush_love", "one_sided_love"),
+    "friend": ("friend_ghosted", "birthday", "funny_random", "achievement", "hackathon_win"),
+    "service_person": ("upi_fail", "train_late", "tech_issue", "forgot_wallet", "phone_broken",
+                       "traffic_rant"),
+    "stranger": ("public_embarrassment", "traffic_rant"),
+    "unknown": (),
+}
+
+# SocialAnalysis.user_need -> library scenario ids
+NEED_PRIORS = {
+    "vent": ("office_stress", "office_politics", "traffic_rant", "train_late", "mom_scolding",
+             "hr_fuckup", "monday_blues"),
+    "advice": ("money_problem", "tech_issue", "code_not_working", "git_conflict",
+               "works_on_my_machine", "upi_fail", "phone_broken", "interview_experience"),
+    "reassurance": ("exam_stress", "overthinking_night", "health_issue", "sad_news",
+                    "loss_condolence", "interview_experience", "layoff_news"),
+    "distraction": ("funny_random", "corporate_meme", "cricket_reaction", "movie_review",
+                    "monday_blues"),
+    "decision_help": ("startup_struggle", "crypto_loss", "one_sided_love", "money_problem"),
+    "validation": ("office_politics", "friend_ghosted", "breakup", "public_embarrassment"),
+}
+
+# Score multipliers: a scenario matching every signal scores 1.35x
+EMOTION_BOOST = 0.15
+RELATIONSHIP_BOOST = 0.1
+NEED_BOOST = 0.1
+
+
+@dataclass(frozen=True)
+class SignalPlan:
+    """What the structured signals of one analysis do to retrieval"""
+
+    allowed: Optional[FrozenSet[str]]   # Candidate scenario names (None: no filter)
+    boosts: Mapping[str, float]         # Scenario name -> score multiplier (> 1)
+
+    def apply(self, ranked: Sequence[Tuple]) -> list:
+        """Re-rank (name, score, ...) tuples by boosted score; extra fields are kept"""
+        if not self.boosts:
+            return list(ranked)
+        boosted = [
+            (item[0], item[1] * self.boosts.get(item[0], 1.0)) + tuple(item[2:])
+            for item in ranked
+        ]
+        boosted.sort(key=lambda item: item[1], reverse=True)
+        return boosted
+
+
+NO_SIGNALS = SignalPlan(allowed=None, boosts=MappingProxyType({}))
+
+
+class SignalIndex:
+    """Structured-signal lookups over one library, built once"""
+
+    def __init__(self, scenarios: Iterable[Tuple[str, str, Sequence[str]]]):
+        """
+        Build the lookups.
+
+        Args:
+            scenarios: (name, scenario id, typical_emotions) per library scenario
+        """
+        by_word: Dict[str, set] = {}
+        by_id: Dict[str, str] = {}
+        positive_only, negative_only, names = set(), set(), set()
+        for name, scenario_id, emotions in scenarios:
+            names.add(name)
+            by_id[scenario_id] = name
+            for word in emotions:
+                by_word.setdefault(word, set()).add(name)
+            if emotions and all(word in POSITIVE_EMOTIONS for word in emotions):
+                positive_only.add(name)
+            if emotions and all(word in NEGATIVE_EMOTIONS for word in emotions):
+                negative_only.add(name)
+
+        self.by_emotion: Mapping[str, FrozenSet[str]] = MappingProxyType({
+            emotion: frozenset(name for word in words for name in by_word.get(word, ()))
+            for emotion, words in EMOTION_VOCABULARY.items()
+        })
+        self.by_relationship = _priors(RELATIONSHIP_PRIORS, by_id)
+        self.by_need = _priors(NEED_PRIORS, by_id)
+
+        allowed = {}
+        for emotion in NEGATIVE_ANALYSIS_EMOTIONS:
+            allowed[emotion] = frozenset(names - positive_only)
+        for emotion in POSITIVE_ANALYSIS_EMOTIONS:
+            allowed[emotion] = frozenset(names - negative_only)
+        self.allowed_by_emotion: Mapping[str, FrozenSet[str]] = MappingProxyType(allowed)
+
+        self._plans: Dict[Tuple, SignalPlan] = {}
+
+    @classmethod
+    def from_library(cls, library) -> "SignalIndex":
+        return cls(
+            (record.name, str(record.metadata.get("scenario", record.file_stem)),
+             tuple(record.metadata.get("typical_emotions", ())))
+            for record in library.scenarios
+        )
+
+    def plan(self, analysis: Optional[Mapping]) -> SignalPlan:
+        """
+        Candidate filter and boosts for a SocialAnalysis dict.
+
+        Plans are memoized per (emotion, relationship, need): there are
+        only a few hundred combinations.
+        """
+        if not analysis:
+            return NO_SIGNALS
+        key = (analysis.get("primary_emotion"), analysis.get("relationship"), analysis.get("user_need"))
+        plan = self._plans.get(key)
+        if plan is None:
+            plan = self._plans[key] = self._build_plan(*key)
+        return plan
+
+    def _build_plan(self, emotion, relationship, need) -> SignalPlan:
+        boosts: Dict[str, float] = {}
+        for names, boost in (
+            (self.by_emotion.get(emotion, ()), EMOTION_BOOST),
+            (self.by_relationship.get(relationship, ()), RELATIONSHIP_BOOST),
+            (self.by_need.get(need, ()), NEED_BOOST),
+        ):
+            for name in names:
+                boosts[name] = boosts.get(name, 1.0) + boost
+        allowed = self.allowed_by_emotion.get(emotion)
+        if allowed is not None:
+            boosts = {name: value for name, value in boosts.items() if name in allowed}
+        return SignalPlan(allowed=allowed, boosts=MappingProxyType(boosts))
+
+
+def _priors(priors: Mapping[str, Sequence[str]], by_id: Mapping[str, str]) -> Mapping[str, FrozenSet[str]]:
+    """Scenario-id priors -> scenario names (ids missing from this library are skipped)"""
+    return MappingProxyType({
+        label: frozenset(by_id[scenario_id] for scenario_id in ids if scenario_id in by_id)
+        for label, ids in priors.items()
+    })
@@ -0,0 +1,105 @@
+"""
+Hinglish-aware Tokenizer
+
+Turns chat text (English, Hindi in Latin script, Devanagari, emoji) into
+index terms for retrieval:
+
+- lowercases, unescapes HTML entities and drops URLs and @mentions
+- collapses elongations ("bahuuut" -> "bahut", "sooo" -> "so")
+- folds common romanized-Hindi spelling variants onto one form
+  ("nhi"/"nahin"/"nai" -> "nahi")
+- drops English and Hinglish function words
+- strips a few English suffixes ("exams" -> "exam", "yelled" -> "yell")
+- keeps each emoji as its own term
+
+Queries and documents must go through the same tokenize().
+"""
+
+import html
+import re
+from typing import List
+
+
+# Spelling variants -> canonical form (after elongation collapse)
+SPELLING_VARIANTS = {
+    "nhi": "nahi", "nahin": "nahi", "nai": "nahi", "ni": "nahi", "nahii": "nahi",
+    "kia": "kya", "kyaa": "kya",
+    "kyu": "kyun", "kyon": "kyun", "q": "kyun",
+    "muje": "mujhe", "mjhe": "mujhe",
+    "bht": "bahut", "bohot": "bahut", "bhot": "bahut", "bohat": "bahut",
+    "yr": "yaar", "yrr": "yaar", "yar": "yaar",
+    "bhaiya": "bhai", "bhaii": "bhai", "bro": "bhai", "bruh": "bhai",
+    "pta": "pata",
+    "rha": "raha", "rhi": "rahi", "rhe": "rahe",
+    "accha": "acha", "achha": "acha", "acchha": "acha",
+    "thik": "theek", "thk": "theek",
+    "aj": "aaj",
+    "plz": "please", "pls": "please",
+    "msg": "message", "msgs": "message",
+    "exm": "exam", "xam": "exam",
+    "frnd": "friend", "frnds": "friend",
+    "gf": "girlfriend", "bf": "boyfriend",
+    "mgr": "manager",
+}
+
+STOPWORDS = frozenset("""
+a an the and or but if so of to in on at by for from with as is am are was were be been being
+i me my mine we us our you your yours he him his she her it its they them their this that these
+those there here what which who whom when where why how all any some no not do does did done
+have has had can could will would should shall may might must just very too also than then
+im ive id ill dont didnt doesnt cant wont isnt arent wasnt u ur r ok okay oh yeah yes
+hai hain ho hoga hogi honge tha thi the thay hu hoon hun h
+ka ki ke ko se me mein mai main mujhe mera meri mere tera teri tere tu tum aap apna apni apne
+hum humara woh wo vo ye yeh ek aur ya bhi to toh hi na ne par pe tak jo jab kab kaise
+kuch koi sab wala wali wale raha rahi rahe kar karna karke kiya diya liya gaya gayi gaye
+liye hota hoti hote hua hui hue ab agar
+है हैं था थी थे का की के को से में मैं मेरा और तो भी ही ना ने पर यह वह
+""".split())
+
+_URL_RE = re.compile(r"https?://\S+|www\.\S+|@\w+")
+_ELONGATION_RE = re.compile(r"(.)\1{2,}")
+# Latin/Devanagari words (Devanagari vowel signs are not \w), or single emoji
+_TOKEN_RE = re.compile(
+    r"[a-z0-9\u0900-\u097f]+"
+    r"|[\U0001f300-\U0001faff\u2600-\u27bf]"
+)
+
+
+def _stem(token: str) -> str:
+    """Conservative English suffix stripping (ASCII words only)"""
+    if not token.isascii():
+        return token
+    if len(token) > 4 and token.endswith("ies"):
+        return token[:-3] + "y"
+    if len(token) > 5 and token.endswith("ing"):
+        return token[:-3]
+    if len(token) > 4 and token.endswith("ed"):
+        return token[:-2]
+    if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+        return token[:-1]
+    return token
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split text into normalized retrieval terms.
+
+    Example:
+        >>> tokenize("Bhai exams kal hai, bahuuut tension 😭 nhi ho raha")
+        ['bhai', 'exam', 'kal', 'bahut', 'tension', '😭', 'nahi']
+    """
+    if not text:
+        return []
+
+    text = _URL_RE.sub(" ", html.unescape(text).lower())
+    text = _ELONGATION_RE.sub(r"\1", text)
+
+    terms = []
+    for token in _TOKEN_RE.findall(text):
+        if token.isdigit():
+            continue
+        token = SPELLING_VARIANTS.get(token, token)
+        if token in STOPWORDS or (len(token) < 2 and token.isascii()):
+            continue
+        terms.append(_stem(token))
+    return terms
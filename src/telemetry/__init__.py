@@ -0,0 +1,47 @@
+"""Telemetry module - timing and instrumentation for the chat pipeline"""
+
+from .timing import StageTimer
+from .histogram import (
+    LatencyHistogram,
+    HistogramRegistry,
+    get_stage_histograms,
+    format_server_timing,
+)
+from .metrics import (
+    MetricsRegistry,
+    get_metrics_registry,
+    render_metrics,
+    track_llm_call,
+    record_llm_fallback,
+)
+from .logging import (
+    get_logger,
+    configure_logging,
+    set_hot_path_logging,
+    shutdown_logging,
+    log_context,
+    set_log_context,
+    hash_user_id,
+    warn_once,
+)
+
+__all__ = [
+    "StageTimer",
+    "LatencyHistogram",
+    "HistogramRegistry",
+    "get_stage_histograms",
+    "format_server_timing",
+    "MetricsRegistry",
+    "get_metrics_registry",
+    "render_metrics",
+    "track_llm_call",
+    "record_llm_fallback",
+    "get_logger",
+    "configure_logging",
+    "set_hot_path_logging",
+    "shutdown_logging",
+    "log_context",
+    "set_log_context",
+    "hash_user_id",
+    "warn_once",
+]
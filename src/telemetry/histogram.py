@@ -0,0 +1,148 @@
+"""
+Latency Histograms
+
+In-process latency histograms, one per pipeline stage (or route, or
+model call). Each histogram keeps:
+
+- cumulative fixed-bucket counts, count and sum since start (for
+  Prometheus-style export)
+- a rolling window of the most recent samples (for p50/p95/p99)
+
+Recording is a lock plus a few list writes, cheap enough for every
+request.
+"""
+
+import math
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Deque, Dict, List, Optional, Sequence, Tuple
+
+# Upper bounds in milliseconds; LLM stages take seconds, RAG microseconds
+DEFAULT_BUCKETS_MS: Tuple[float, ...] = (
+    1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000, 60000,
+)
+
+DEFAULT_WINDOW = 1024
+
+
+def _percentile(sorted_samples: List[float], q: float) -> float:
+    """Nearest-rank percentile of already-sorted samples"""
+    if not sorted_samples:
+        return 0.0
+    rank = max(1, math.ceil(q / 100 * len(sorted_samples)))
+    return sorted_samples[min(rank, len(sorted_samples)) - 1]
+
+
+class LatencyHistogram:
+    """Cumulative bucket counts plus a rolling window of recent samples"""
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS_MS, window: int = DEFAULT_WINDOW):
+        self.buckets = tuple(sorted(buckets))
+        self._bucket_counts = [0] * len(self.buckets)
+        self._window: Deque[float] = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value_ms: float) -> None:
+        with self._lock:
+            self.count += 1
+            self.sum += value_ms
+            self._window.append(value_ms)
+            for i, upper in enumerate(self.buckets):
+                if value_ms <= upper:
+                    self._bucket_counts[i] += 1
+                    break
+
+    def cumulative_buckets(self) -> List[Tuple[float, int]]:
+        """(upper bound, count <= bound) pairs, Prometheus `le` style, without +Inf"""
+        with self._lock:
+            running = 0
+            result = []
+            for upper, n in zip(self.buckets, self._bucket_counts):
+                running += n
+                result.append((upper, running))
+            return result
+
+    def percentiles(self, *qs: float) -> Dict[str, float]:
+        """Percentiles over the rolling window, e.g. percentiles(50, 99) -> {"p50": .., "p99": ..}"""
+        with self._lock:
+            samples = sorted(self._window)
+        return {f"p{q:g}": round(_percentile(samples, q), 3) for q in qs}
+
+    def snapshot(self) -> Dict[str, float]:
+        """Count/mean since start plus rolling-window percentiles and max"""
+        with self._lock:
+            samples = sorted(self._window)
+            count, total = self.count, self.sum
+        return {
+            "count": count,
+            "mean_ms": round(total / count, 3) if count else 0.0,
+            "p50_ms": round(_percentile(samples, 50), 3),
+            "p95_ms": round(_percentile(samples, 95), 3),
+            "p99_ms": round(_percentile(samples, 99), 3),
+            "max_ms": round(samples[-1], 3) if samples else 0.0,
+        }
+
+
+class HistogramRegistry:
+    """Name -> LatencyHistogram, created on first observation"""
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS_MS, window: int = DEFAULT_WINDOW):
+        self._buckets = buckets
+        self._window = window
+        self._histograms: Dict[str, LatencyHistogram] = {}
+        self._lock = threading.Lock()
+
+    def get(self, name: str) -> LatencyHistogram:
+        histogram = self._histograms.get(name)
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.setdefault(name, LatencyHistogram(self._buckets, self._window))
+        return histogram
+
+    def observe(self, name: str, value_ms: float) -> None:
+        self.get(name).observe(value_ms)
+
+    @contextmanager
+    def time(self, name: str):
+        """Time the enclosed block into histogram `name`"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, (time.perf_counter() - start) * 1000)
+
+    def items(self) -> List[Tuple[str, LatencyHistogram]]:
+        with self._lock:
+            return sorted(self._histograms.items())
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        return {name: histogram.snapshot() for name, histogram in self.items()}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._histograms.clear()
+
+
+_stage_histograms = HistogramRegistry()
+
+
+def get_stage_histograms() -> HistogramRegistry:
+    """Per-stage latency histograms for the chat pipeline (process-wide)"""
+    return _stage_histograms
+
+
+def format_server_timing(timings: Optional[Dict[str, float]]) -> str:
+    """
+    Render stage timings as a Server-Timing header value.
+
+    Example:
+        >>> format_server_timing({"analysis": 812.4, "total": 1500.2})
+        'analysis;dur=812.4, total;dur=1500.2'
+    """
+    if not timings:
+        return ""
+    return ", ".join(f"{name};dur={ms}" for name, ms in timings.items())
@@ -0,0 +1,272 @@
+"""
+Structured Logging
+
+JSON-lines logging for the chat service. Every record carries the
+request id and a salted hash of the user id (never the raw id) from
+context variables, so lines from one request can be joined without
+passing ids around.
+
+Records are handed to a QueueHandler and written by a single listener
+thread, so request threads never block on stdout. Debug/info records
+can be sampled, and hot-path loggers (per-request chatter) can be
+silenced entirely.
+
+Configuration (environment variables):
+    LOG_LEVEL           Minimum level for buddy.* loggers (default: INFO)
+    LOG_SAMPLE_DEBUG    Fraction of DEBUG records kept (default: 1.0)
+    LOG_SAMPLE_INFO     Fraction of INFO records kept (default: 1.0)
+    LOG_HOT_PATH        0 silences hot-path loggers (default: 1)
+    LOG_USER_SALT       Salt for user id hashes
+    LOG_QUEUE_SIZE      Max queued records before dropping (default: 10000)
+"""
+
+import atexit
+import contextvars
+import copy
+import hashlib
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import sys
+import threading
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Dict, Optional
+
+ROOT_LOGGER = "buddy"
+HOT_PATH_LOGGER = "buddy.hot"
+
+_request_id: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("buddy_request_id", default=None)
+_user_hash: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("buddy_user_hash", default=None)
+
+# Standard LogRecord attributes; anything else passed via `extra` is emitted as a field
+_RECORD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime"}
+_CONTEXT_ATTRS = ("request_id", "user")
+
+
+def hash_user_id(user_id: str) -> str:
+    """Stable, salted 12-char hash of a user id for log correlation"""
+    salt = os.getenv("LOG_USER_SALT", "buddy")
+    return hashlib.sha256(f"{salt}:{user_id}".encode("utf-8")).hexdigest()[:12]
+
+
+def new_request_id() -> str:
+    return uuid.uuid4().hex[:16]
+
+
+def get_request_id() -> Optional[str]:
+    return _request_id.get()
+
+
+def set_log_context(request_id: Optional[str] = None, user_id: Optional[str] = None) -> None:
+    """Set context fields for the current task/thread without restoring them later"""
+    if request_id is not None:
+        _request_id.set(request_id)
+    if user_id is not None:
+        _user_hash.set(hash_user_id(user_id))
+
+
+@contextmanager
+def log_context(request_id: Optional[str] = None, user_id: Optional[str] = None):
+    """
+    Bind request id and user hash for the enclosed block.
+
+    A request id is generated if none is bound yet and none is given.
+
+    Example:
+        >>> with log_context(user_id="user_123"):
+        ...     logger.info("analysis done", extra={"stage": "analysis"})
+    """
+    if request_id is None and _request_id.get() is None:
+        request_id = new_request_id()
+    tokens = []
+    if request_id is not None:
+        tokens.append((_request_id, _request_id.set(request_id)))
+    if user_id is not None:
+        tokens.append((_user_hash, _user_hash.set(hash_user_id(user_id))))
+    try:
+        yield
+    finally:
+        for var, token in reversed(tokens):
+            try:
+                var.reset(token)
+            except ValueError:
+                pass  # Reset from a different context (e.g. a resumed generator)
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: ts, level, logger, msg, request_id, user, extras"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        for key in _CONTEXT_ATTRS:
+            value = getattr(record, key, None)
+            if value is not None:
+                entry[key] = value
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS and key not in _CONTEXT_ATTRS and key not in entry and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class _ContextFilter(logging.Filter):
+    """Copy context variables onto the record (runs in the calling thread)"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if getattr(record, "request_id", None) is None:
+            record.request_id = _request_id.get()
+        if getattr(record, "user", None) is None:
+            record.user = _user_hash.get()
+        return True
+
+
+class _SamplingFilter(logging.Filter):
+    """Keep a random fraction of records per level"""
+
+    def __init__(self, rates: Dict[int, float]):
+        super().__init__()
+        self.rates = rates
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        rate = self.rates.get(record.levelno, 1.0)
+        return rate >= 1.0 or random.random() < rate
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that keeps extras and traceback text as separate fields, and never blocks"""
+
+    dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            _QueueHandler.dropped += 1
+
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_configure_lock = threading.Lock()
+
+
+def _rate(name: str) -> float:
+    try:
+        return max(0.0, min(1.0, float(os.getenv(name, "1.0"))))
+    except ValueError:
+        return 1.0
+
+
+def configure_logging(stream=None, force: bool = False) -> None:
+    """
+    Route buddy.* loggers through the JSON queue handler.
+
+    Called automatically by get_logger(); call with force=True to apply
+    changed environment settings (or a different stream).
+    """
+    global _listener
+    with _configure_lock:
+        if _listener is not None and not force:
+            return
+        if _listener is not None:
+            _listener.stop()
+            _listener = None
+
+        output = logging.StreamHandler(stream or sys.stdout)
+        output.setFormatter(JsonFormatter())
+
+        log_queue: "queue.Queue" = queue.Queue(maxsize=int(os.getenv("LOG_QUEUE_SIZE", "10000")))
+        handler = _QueueHandler(log_queue)
+        handler.addFilter(_SamplingFilter({
+            logging.DEBUG: _rate("LOG_SAMPLE_DEBUG"),
+            logging.INFO: _rate("LOG_SAMPLE_INFO"),
+        }))
+        handler.addFilter(_ContextFilter())
+
+        root = logging.getLogger(ROOT_LOGGER)
+        for existing in list(root.handlers):
+            root.removeHandler(existing)
+        root.addHandler(handler)
+        root.setLevel(os.getenv("LOG_LEVEL", "INFO").upper())
+        root.propagate = False
+
+        set_hot_path_logging(os.getenv("LOG_HOT_PATH", "1").lower() not in ("0", "false", "no"))
+
+        _listener = logging.handlers.QueueListener(log_queue, output, respect_handler_level=False)
+        _listener.start()
+
+
+def set_hot_path_logging(enabled: bool) -> None:
+    """Turn per-request hot-path logs (buddy.hot.*) on or off at runtime"""
+    # Children inherit the effective level, so this silences all of buddy.hot.*
+    logging.getLogger(HOT_PATH_LOGGER).setLevel(logging.NOTSET if enabled else logging.CRITICAL + 1)
+
+
+def shutdown_logging() -> None:
+    """Flush queued records and stop the listener thread"""
+    global _listener
+    with _configure_lock:
+        if _listener is not None:
+            _listener.stop()
+            _listener = None
+
+
+atexit.register(shutdown_logging)
+
+
+_warned: set = set()
+_warned_lock = threading.Lock()
+
+
+def warn_once(logger: logging.Logger, key, msg: str, *args, **kwargs) -> None:
+    """
+    logger.warning() only the first time `key` is seen in this process.
+
+    For settings re-read on every request (an invalid env value would
+    otherwise log once per message).
+
+    Example:
+        >>> warn_once(logger, ("RAG_ENGINE", engine), "unknown RAG_ENGINE %r", engine, extra={"stage": "rag"})
+    """
+    with _warned_lock:
+        if key in _warned:
+            return
+        _warned.add(key)
+    logger.warning(msg, *args, **kwargs)
+
+
+def get_logger(name: str, hot_path: bool = False) -> logging.Logger:
+    """
+    Get a structured logger.
+
+    Args:
+        name: Usually __name__
+        hot_path: Per-request chatter that LOG_HOT_PATH=0 silences
+
+    Example:
+        >>> logger = get_logger(__name__)
+        >>> logger.warning("database unavailable", extra={"stage": "persona_load"})
+    """
+    configure_logging()
+    prefix = HOT_PATH_LOGGER if hot_path else ROOT_LOGGER
+    return logging.getLogger(f"{prefix}.{name}")
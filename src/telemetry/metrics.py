@@ -0,0 +1,234 @@
+"""
+Metrics Registry
+
+Minimal in-process counters and labelled latency histograms rendered in
+the Prometheus text exposition format (version 0.0.4). No client
+library and no network dependency: /metrics just calls render().
+
+Values that live elsewhere (DB pool, cache stats) are exported through
+collectors - callables that return metric families at scrape time.
+"""
+
+import math
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple
+
+from .logging import get_logger
+from .histogram import DEFAULT_BUCKETS_MS, LatencyHistogram, get_stage_histograms
+
+
+logger = get_logger(__name__)
+
+
+# (labels, value) pairs for one metric family
+Samples = List[Tuple[Dict[str, str], float]]
+# (name, type, help, samples) returned by collectors; type is "gauge" or "counter"
+MetricFamily = Tuple[str, str, str, Samples]
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items()) + "}"
+
+
+def _format_value(value: float) -> str:
+    if math.isnan(value):
+        return "NaN"
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if value == int(value) and abs(value) < 1e15:
+        return str(int(value))
+    return repr(float(value))
+
+
+class Counter:
+    """Monotonic counter with optional labels"""
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labelvalues: str, amount: float = 1.0) -> None:
+        key = tuple(str(v) for v in labelvalues)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, *labelvalues: str) -> float:
+        return self._values.get(tuple(str(v) for v in labelvalues), 0.0)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            lines.append(f"{self.name}{_format_labels(dict(zip(self.labelnames, key)))} {_format_value(value)}")
+        return lines
+
+
+class Histogram:
+    """Labelled latency histogram; observes milliseconds, exports seconds"""
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS_MS):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        self._histograms: Dict[Tuple[str, ...], LatencyHistogram] = {}
+        self._lock = threading.Lock()
+
+    def labels(self, *labelvalues: str) -> LatencyHistogram:
+        key = tuple(str(v) for v in labelvalues)
+        histogram = self._histograms.get(key)
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.setdefault(key, LatencyHistogram(self.buckets))
+        return histogram
+
+    def observe(self, *labelvalues: str, value_ms: float) -> None:
+        self.labels(*labelvalues).observe(value_ms)
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._histograms.items())
+        return render_histograms(
+            self.name, self.help,
+            [(dict(zip(self.labelnames, key)), histogram) for key, histogram in items]
+        )
+
+
+def render_histograms(name: str, help: str,
+                      histograms: Iterable[Tuple[Dict[str, str], LatencyHistogram]]) -> List[str]:
+    """Prometheus histogram lines (seconds) for millisecond LatencyHistograms"""
+    lines = [f"# HELP {name} {help}", f"# TYPE {name} histogram"]
+    for labels, histogram in histograms:
+        for upper_ms, count in histogram.cumulative_buckets():
+            bucket_labels = {**labels, "le": _format_value(upper_ms / 1000)}
+            lines.append(f"{name}_bucket{_format_labels(bucket_labels)} {count}")
+        lines.append(f'{name}_bucket{_format_labels({**labels, "le": "+Inf"})} {histogram.count}')
+        lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(round(histogram.sum / 1000, 6))}")
+        lines.append(f"{name}_count{_format_labels(labels)} {histogram.count}")
+    return lines
+
+
+class MetricsRegistry:
+    """Owned counters/histograms plus scrape-time collectors"""
+
+    def __init__(self):
+        self._metrics: Dict[str, object] = {}
+        self._collectors: List[Callable[[], Iterable[MetricFamily]]] = []
+        self._lock = threading.Lock()
+
+    def counter(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Counter:
+        with self._lock:
+            return self._metrics.setdefault(name, Counter(name, help, labelnames))
+
+    def histogram(self, name: str, help: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS_MS) -> Histogram:
+        with self._lock:
+            return self._metrics.setdefault(name, Histogram(name, help, labelnames, buckets))
+
+    def register_collector(self, collector: Callable[[], Iterable[MetricFamily]]) -> None:
+        with self._lock:
+            if collector not in self._collectors:
+                self._collectors.append(collector)
+
+    def render(self) -> str:
+        """Every metric in Prometheus text format"""
+        lines: List[str] = []
+        with self._lock:
+            metrics = list(self._metrics.values())
+            collectors = list(self._collectors)
+        for metric in metrics:
+            lines.extend(metric.render())
+        for collector in collectors:
+            try:
+                families = list(collector())
+            except Exception as e:
+                logger.warning("metrics collector %s failed: %s", getattr(collector, '__name__', collector), e,
+                               extra={"stage": "metrics"})
+                continue
+            for name, kind, help, samples in families:
+                lines.append(f"# HELP {name} {help}")
+                lines.append(f"# TYPE {name} {kind}")
+                for labels, value in samples:
+                    lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+_registry = MetricsRegistry()
+
+
+def get_metrics_registry() -> MetricsRegistry:
+    """Process-wide metrics registry behind /metrics"""
+    return _registry
+
+
+# ---------------------------------------------------------------------------
+# Standard metrics
+# ---------------------------------------------------------------------------
+
+HTTP_REQUESTS = _registry.counter(
+    "buddy_http_requests_total", "HTTP requests by route and status", ("method", "route", "status"))
+HTTP_DURATION = _registry.histogram(
+    "buddy_http_request_duration_seconds", "HTTP request latency until response headers", ("method", "route"))
+LLM_CALLS = _registry.counter(
+    "buddy_llm_calls_total", "OpenRouter calls by pipeline stage and model", ("stage", "model"))
+LLM_ERRORS = _registry.counter(
+    "buddy_llm_call_errors_total", "OpenRouter calls that raised", ("stage", "model"))
+LLM_FALLBACKS = _registry.counter(
+    "buddy_llm_fallbacks_total", "Stage results replaced by the safe fallback", ("stage",))
+LLM_DURATION = _registry.histogram(
+    "buddy_llm_call_duration_seconds", "OpenRouter call latency", ("stage", "model"))
+# The local analyzer tier answers in well under a millisecond
+ANALYSIS_TIER_DURATION = _registry.histogram(
+    "buddy_analysis_tier_latency_seconds", "Social analysis latency per cascade tier", ("tier",),
+    buckets=(0.1, 0.25, 0.5) + DEFAULT_BUCKETS_MS)
+
+
+@contextmanager
+def track_llm_call(stage: str, model: str):
+    """
+    Count and time one model call; exceptions are counted and re-raised.
+
+    Example:
+        >>> with track_llm_call("analysis", DEFAULT_MODEL):
+        ...     response = client.chat.completions.create(...)
+    """
+    LLM_CALLS.inc(stage, model)
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        LLM_ERRORS.inc(stage, model)
+        raise
+    finally:
+        LLM_DURATION.observe(stage, model, value_ms=(time.perf_counter() - start) * 1000)
+
+
+def record_llm_fallback(stage: str) -> None:
+    """Count a stage answering with its fallback instead of a model result"""
+    LLM_FALLBACKS.inc(stage)
+
+
+def _stage_collector_lines() -> List[str]:
+    return render_histograms(
+        "buddy_stage_duration_seconds",
+        "Chat pipeline stage latency",
+        [({"stage": name}, histogram) for name, histogram in get_stage_histograms().items()]
+    )
+
+
+def render_metrics() -> str:
+    """Registry metrics plus the per-stage pipeline histograms"""
+    return _registry.render() + "\n".join(_stage_collector_lines()) + "\n"
@@ -0,0 +1,79 @@
+"""
+Stage Timing
+
+Monotonic per-stage timers for a single pipeline run. Every finished
+stage is also recorded in the process-wide stage histograms.
+"""
+
+import time
+from contextlib import contextmanager
+from typing import Awaitable, Callable, Dict, Optional, TypeVar
+
+from .histogram import HistogramRegistry, get_stage_histograms
+
+T = TypeVar("T")
+
+
+class StageTimer:
+    """
+    Collects wall-clock durations (milliseconds) per named stage.
+
+    Stages may run in worker threads; each stage writes its own key, so
+    no locking is needed.
+
+    Example:
+        >>> timer = StageTimer()
+        >>> with timer.stage("analysis"):
+        ...     analysis = analyze_social_context(text)
+        >>> timer.as_dict()  # {"analysis": 812.4, "total": 812.5}
+    """
+
+    def __init__(self, histograms: Optional[HistogramRegistry] = None):
+        self._start = time.perf_counter()
+        self.timings: Dict[str, float] = {}
+        self._histograms = histograms if histograms is not None else get_stage_histograms()
+
+    @contextmanager
+    def stage(self, name: str):
+        """Time the enclosed block as `name`"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = (time.perf_counter() - start) * 1000
+            self.timings[name] = elapsed
+            self._histograms.observe(name, elapsed)
+
+    def timed(self, name: str, func: Callable[..., T]) -> Callable[..., T]:
+        """Wrap `func` so each call is recorded as stage `name`"""
+        def wrapper(*args, **kwargs):
+            with self.stage(name):
+                return func(*args, **kwargs)
+        return wrapper
+
+    async def atimed(self, name: str, awaitable: Awaitable[T]) -> T:
+        """Await `awaitable`, recording the wait as stage `name`"""
+        with self.stage(name):
+            return await awaitable
+
+    def mark(self, name: str) -> None:
+        """Record the time since the timer started as `name` (e.g. first token)"""
+        elapsed = self.elapsed_ms()
+        self.timings[name] = elapsed
+        self._histograms.observe(name, elapsed)
+
+    def elapsed_ms(self) -> float:
+        """Milliseconds since the timer was created"""
+        return (time.perf_counter() - self._start) * 1000
+
+    def as_dict(self) -> Dict[str, float]:
+        """Stage timings rounded to 0.1 ms, plus the overall total"""
+        result = {name: round(ms, 1) for name, ms in self.timings.items()}
+        result["total"] = round(self.elapsed_ms(), 1)
+        return result
+
+    def finish(self) -> Dict[str, float]:
+        """Record the overall total in the histograms and return as_dict()"""
+        result = self.as_dict()
+        self._histograms.observe("total", result["total"])
+        return result
@@ -0,0 +1,95 @@
+"""
+Test the local/LLM social analysis cascade
+
+Checks that each SOCIAL_ANALYSIS_MODE calls the model only when it
+should, and that escalation counts and per-tier latency are recorded.
+"""
+
+import sys
+import asyncio
+sys.path.insert(0, '/home/voyager4/projects/claudBUD/src')
+
+from extractors import (
+    SocialAnalysis,
+    get_cascade_stats,
+    get_social_analysis_mode,
+    select_social_analysis,
+    aselect_social_analysis,
+)
+from extractors import analyzer
+
+
+LLM_ANALYSIS = SocialAnalysis(
+    primary_emotion="neutral", intensity=5, user_need="advice",
+    relationship="unknown", conflict_risk="low"
+)
+
+CLEAR = "My boss yelled at me again, I'm so stressed, what should I do?"
+VAGUE = "hmm"
+
+
+def _stub_llm(monkeypatch):
+    calls = []
+
+    def fake_analyze(text):
+        calls.append(text)
+        return LLM_ANALYSIS
+
+    async def fake_aanalyze(text):
+        calls.append(text)
+        return LLM_ANALYSIS
+
+    monkeypatch.setattr(analyzer, "analyze_social_context", fake_analyze)
+    monkeypatch.setattr(analyzer, "aanalyze_social_context", fake_aanalyze)
+    return calls
+
+
+def test_modes_route_between_tiers(monkeypatch):
+    """llm always calls the model, local never does, cascade only when unsure"""
+    print("=" * 70)
+    print("Testing SOCIAL_ANALYSIS_MODE routing")
+    print("=" * 70)
+
+    calls = _stub_llm(monkeypatch)
+    get_cascade_stats().reset()
+
+    monkeypatch.delenv("SOCIAL_ANALYSIS_MODE", raising=False)
+    assert get_social_analysis_mode() == "llm"
+    assert select_social_analysis(CLEAR) is LLM_ANALYSIS
+    assert len(calls) == 1
+    print("✅ Default mode is llm")
+
+    monkeypatch.setenv("SOCIAL_ANALYSIS_MODE", "local")
+    assert select_social_analysis(VAGUE).primary_emotion == "neutral"
+    assert len(calls) == 1
+    print("✅ local mode never calls the model")
+
+    monkeypatch.setenv("SOCIAL_ANALYSIS_MODE", "cascade")
+    monkeypatch.setenv("SOCIAL_ANALYSIS_MIN_CONFIDENCE", "0.7")
+    local = select_social_analysis(CLEAR)
+    assert local.relationship == "authority"
+    assert len(calls) == 1
+    assert select_social_analysis(VAGUE) is LLM_ANALYSIS
+    assert len(calls) == 2
+    print("✅ cascade escalates only low-confidence messages")
+
+    monkeypatch.setenv("SOCIAL_ANALYSIS_MAX_LOCAL_CHARS", "20")
+    assert asyncio.run(aselect_social_analysis(CLEAR)) is LLM_ANALYSIS
+    assert len(calls) == 3
+    print("✅ cascade escalates long messages (async path)")
+
+    stats = get_cascade_stats().as_dict()
+    assert stats["requests"] == 4
+    assert stats["served_local"] == 2
+    assert stats["escalations"] == {"low_confidence": 1, "too_long": 1}
+    assert stats["escalation_rate"] == 0.5
+    assert stats["tiers"]["local"]["calls"] == 4
+    assert stats["tiers"]["llm"]["calls"] == 3
+    assert sum(stats["confidence_histogram"]) == 4
+    print(f"✅ Stats: {stats}")
+
+    get_cascade_stats().reset()
+
+
+if __name__ == "__main__":
+    print("Run with pytest (uses monkeypatch)")
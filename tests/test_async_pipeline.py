@@ -0,0 +1,233 @@
+"""
+Test orchestrator pipeline concurrency
+
+Checks that abuddy_chat() awaits every model call without blocking the
+event loop, and that both pipelines overlap independent stages, using
+stubbed stages instead of real OpenRouter calls.
+"""
+
+import sys
+import time
+import asyncio
+sys.path.insert(0, '/home/voyager4/projects/claudBUD/src')
+
+from extractors import SocialAnalysis
+from policy_engine import BehaviorPolicy
+from orchestrator import buddy_agent
+
+
+FAKE_LATENCY = 0.05
+
+
+async def fake_analyze(text):
+    await asyncio.sleep(FAKE_LATENCY)
+    return SocialAnalysis(
+        primary_emotion="frustration",
+        intensity=6,
+        user_need="vent",
+        relationship="friend",
+        conflict_risk="low"
+    )
+
+
+async def fake_policy(context):
+    await asyncio.sleep(FAKE_LATENCY)
+    return BehaviorPolicy(
+        mode="venting_listener",
+        tone="casual_supportive",
+        humor_level=1,
+        message_length="short",
+        initiative="low",
+        give_action_steps=False,
+        ask_followup_question=True
+    )
+
+
+async def fake_reply(**kwargs):
+    await asyncio.sleep(FAKE_LATENCY)
+    return f"reply to {kwargs['user_input']}"
+
+
+def test_abuddy_chat_concurrent(monkeypatch):
+    """Many conversations share one event loop without serializing"""
+
+    print("=" * 70)
+    print("Test: abuddy_chat() concurrency")
+    print("=" * 70)
+    print()
+
+    monkeypatch.delenv("DATABASE_URL", raising=False)
+    monkeypatch.setattr(buddy_agent, "aselect_social_analysis", fake_analyze)
+    monkeypatch.setattr(buddy_agent, "aselect_behavior_policy", fake_policy)
+    monkeypatch.setattr(buddy_agent, "agenerate_reply", fake_reply)
+
+    conversations = 100
+
+    async def run_all():
+        return await asyncio.gather(*[
+            buddy_agent.abuddy_chat(f"user_{i}", f"bhai train late ho gayi {i}")
+            for i in range(conversations)
+        ])
+
+    start = time.perf_counter()
+    results = asyncio.run(run_all())
+    elapsed = time.perf_counter() - start
+
+    assert len(results) == conversations
+    assert all(r["error"] is None for r in results)
+    assert results[7]["reply"] == "reply to bhai train late ho gayi 7"
+    assert results[0]["mode"] == "venting_listener"
+
+    # Sequential execution would take conversations * 3 * FAKE_LATENCY (15s)
+    assert elapsed < conversations * 3 * FAKE_LATENCY / 5
+
+    print(f"✅ {conversations} conversations in {elapsed:.2f}s")
+    print()
+
+
+def slow_load_memory(user_id):
+    time.sleep(FAKE_LATENCY)
+    return {'learned_patterns': [], 'interaction_count': 0}, False
+
+
+def test_buddy_chat_overlaps_stages(monkeypatch):
+    """Persona load overlaps analysis; policy overlaps RAG (sync pipeline)"""
+
+    print("=" * 70)
+    print("Test: buddy_chat() critical path")
+    print("=" * 70)
+    print()
+
+    def sync_analyze(text):
+        time.sleep(FAKE_LATENCY)
+        return SocialAnalysis(
+            primary_emotion="frustration", intensity=6, user_need="vent",
+            relationship="friend", conflict_risk="low"
+        )
+
+    def sync_policy(context):
+        time.sleep(FAKE_LATENCY)
+        return BehaviorPolicy(
+            mode="venting_listener", tone="casual_supportive", humor_level=1,
+            message_length="short", initiative="low",
+            give_action_steps=False, ask_followup_question=True
+        )
+
+    def sync_reply(**kwargs):
+        time.sleep(FAKE_LATENCY)
+        return "reply"
+
+    monkeypatch.setattr(buddy_agent, "_load_memory", slow_load_memory)
+    monkeypatch.setattr(buddy_agent, "select_social_analysis", sync_analyze)
+    monkeypatch.setattr(buddy_agent, "select_behavior_policy", sync_policy)
+    monkeypatch.setattr(buddy_agent, "generate_reply", sync_reply)
+
+    result = buddy_agent.buddy_chat("user_sync", "boss yelled at me in the office")
+    timings = result["timings"]
+
+    assert result["error"] is None
+    for stage in ("persona_load", "analysis", "policy", "rag", "compose"):
+        assert stage in timings
+
+    # Sequential: load + analysis + policy + rag + compose = 4 * latency
+    # Critical path: analysis + max(policy, rag) + compose = 3 * latency
+    assert timings["total"] < 3.8 * FAKE_LATENCY * 1000
+
+    print(f"✅ Stage timings: {timings}")
+    print()
+
+
+def test_abuddy_chat_overlaps_stages(monkeypatch):
+    """Persona load overlaps analysis; policy overlaps RAG (async pipeline)"""
+
+    print("=" * 70)
+    print("Test: abuddy_chat() critical path")
+    print("=" * 70)
+    print()
+
+    monkeypatch.setattr(buddy_agent, "_load_memory", slow_load_memory)
+    monkeypatch.setattr(buddy_agent, "aselect_social_analysis", fake_analyze)
+    monkeypatch.setattr(buddy_agent, "aselect_behavior_policy", fake_policy)
+    monkeypatch.setattr(buddy_agent, "agenerate_reply", fake_reply)
+
+    result = asyncio.run(buddy_agent.abuddy_chat("user_async", "boss yelled at me"))
+    timings = result["timings"]
+
+    assert result["error"] is None
+    assert timings["persona_load"] >= FAKE_LATENCY * 1000
+    assert timings["total"] < 3.8 * FAKE_LATENCY * 1000
+
+    print(f"✅ Stage timings: {timings}")
+    print()
+
+
+def test_whatsapp_parse_off_event_loop(monkeypatch):
+    """Slow WhatsApp parses run in threads, not on the event loop"""
+
+    import whatsapp
+
+    def slow_parse(text):
+        time.sleep(FAKE_LATENCY * 2)
+        return "boss ne phir daanta"
+
+    monkeypatch.delenv("DATABASE_URL", raising=False)
+    monkeypatch.setattr(whatsapp, "parse_whatsapp_chat", slow_parse)
+    monkeypatch.setattr(buddy_agent, "aselect_social_analysis", fake_analyze)
+    monkeypatch.setattr(buddy_agent, "aselect_behavior_policy", fake_policy)
+    monkeypatch.setattr(buddy_agent, "agenerate_reply", fake_reply)
+
+    uploads = 5
+
+    async def run_all():
+        return await asyncio.gather(*[
+            buddy_agent.abuddy_chat(f"user_{i}", "[1/1/24, 10:00] A: hi", source="whatsapp")
+            for i in range(uploads)
+        ])
+
+    start = time.perf_counter()
+    results = asyncio.run(run_all())
+    elapsed = time.perf_counter() - start
+
+    assert all(r["error"] is None for r in results)
+    assert results[0]["timings"]["whatsapp_parse"] >= FAKE_LATENCY * 2 * 1000
+    # On the loop the parses would serialize: uploads * 2 * latency (0.5s)
+    assert elapsed < uploads * 2 * FAKE_LATENCY
+
+    print(f"✅ {uploads} uploads parsed in {elapsed:.2f}s")
+
+
+def test_failed_stage_cancels_inflight_tasks(monkeypatch):
+    """An analysis or RAG failure cancels the persona load / policy tasks"""
+
+    async def hung_policy(context):
+        await asyncio.sleep(10)
+
+    async def failing_analyze(text):
+        raise RuntimeError("analysis down")
+
+    def failing_rag(query, analysis=None):
+        raise RuntimeError("rag down")
+
+    def slow_memory(user_id):
+        time.sleep(FAKE_LATENCY)
+        return None, False
+
+    monkeypatch.setattr(buddy_agent, "_load_memory", slow_memory)
+    monkeypatch.setattr(buddy_agent, "aselect_social_analysis", failing_analyze)
+
+    async def run(coro):
+        result = await coro
+        # Nothing of this request may still be running once it returned
+        others = [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+        return result, others
+
+    result, others = asyncio.run(run(buddy_agent.abuddy_chat("user_fail", "boss yelled at me")))
+    assert result["error"] and not others
+
+    monkeypatch.setattr(buddy_agent, "aselect_social_analysis", fake_analyze)
+    monkeypatch.setattr(buddy_agent, "aselect_behavior_policy", hung_policy)
+    monkeypatch.setattr(buddy_agent, "find_relevant_knowledge", failing_rag)
+    result, others = asyncio.run(run(buddy_agent.abuddy_chat("user_fail", "boss yelled at me")))
+    assert result["error"] and not others
+
+    print("✅ In-flight tasks cancelled on failure")
@@ -0,0 +1,125 @@
+"""
+Test background persona writes
+
+Trait updates and interaction logs run on a bounded background queue;
+the learning message is predicted without waiting for them.
+"""
+
+import sys
+import time
+import threading
+sys.path.insert(0, '/home/voyager4/projects/claudBUD/src')
+
+from persona import BackgroundWriter, PostgresDB, load_user_context, get_interaction_stats
+from persona.models import Base
+from extractors import SocialAnalysis
+from policy_engine import BehaviorPolicy
+from orchestrator import buddy_agent
+
+
+def test_writer_runs_in_order_and_drains():
+    """Writes run FIFO on one thread and shutdown drains the queue"""
+
+    writer = BackgroundWriter(maxsize=100)
+    seen = []
+
+    def slow_append(i):
+        time.sleep(0.001)
+        seen.append((i, threading.current_thread().name))
+
+    for i in range(20):
+        assert writer.submit(slow_append, i)
+
+    assert writer.shutdown(timeout=5)
+    assert [i for i, _ in seen] == list(range(20))
+    assert {name for _, name in seen} == {"buddy-writer"}
+    assert writer.completed == 20
+
+    # Closed writers refuse new work
+    assert not writer.submit(slow_append, 99)
+    print("✅ FIFO order, drained on shutdown")
+
+
+def test_writer_is_bounded():
+    """A full queue drops writes instead of blocking the caller"""
+
+    gate = threading.Event()
+    writer = BackgroundWriter(maxsize=2)
+
+    writer.submit(gate.wait)           # Occupies the worker
+    time.sleep(0.05)
+    assert writer.submit(lambda: None)
+    assert writer.submit(lambda: None)
+    assert not writer.submit(lambda: None)
+    assert writer.dropped == 1
+
+    gate.set()
+    assert writer.shutdown(timeout=5)
+    print("✅ Full queue drops instead of blocking")
+
+
+def test_shutdown_respects_timeout_when_full():
+    """A hung write behind a full queue does not stall shutdown past its timeout"""
+
+    gate = threading.Event()
+    writer = BackgroundWriter(maxsize=1)
+
+    writer.submit(gate.wait)           # Hung database write
+    time.sleep(0.05)
+    assert writer.submit(lambda: None)  # Queue now full
+
+    start = time.perf_counter()
+    assert not writer.shutdown(timeout=0.2)
+    assert time.perf_counter() - start < 2
+    gate.set()
+    print("✅ Shutdown gave up after its timeout")
+
+
+def test_predicted_learning_matches_stats(tmp_path, monkeypatch):
+    """The predicted message equals what get_interaction_stats reports after the writes land"""
+
+    PostgresDB.close()
+    PostgresDB.connect(f"sqlite:///{tmp_path / 'buddy.db'}")
+    Base.metadata.create_all(PostgresDB._engine)
+
+    writer = BackgroundWriter()
+    monkeypatch.setattr("persona.get_background_writer", lambda: writer)
+
+    try:
+        analysis = SocialAnalysis(
+            primary_emotion="anxiety",
+            intensity=8,
+            user_need="advice",
+            relationship="authority",
+            conflict_risk="high"
+        )
+        policy = BehaviorPolicy(
+            mode="diplomatic_advisor",
+            tone="calm_reassuring",
+            humor_level=0,
+            message_length="short",
+            initiative="medium",
+            give_action_steps=True,
+            ask_followup_question=False
+        )
+
+        for turn in range(3):
+            context = load_user_context("writer_user")
+            memory = {
+                'learned_patterns': context['learned_patterns'],
+                'recent_response_lengths': context['recent_response_lengths'],
+            }
+
+            predicted = buddy_agent._record_learning(
+                "writer_user", "text", analysis, policy, {'scenario': 'office_stress'}, memory
+            )
+            writer.flush()
+
+            stats = get_interaction_stats("writer_user")
+            assert stats['total_interactions'] == turn + 1
+            assert predicted == stats['adaptations_learned'][-1]
+
+        print(f"✅ Predicted learning matches stats: {predicted}")
+    finally:
+        writer.shutdown()
+        PostgresDB.close()
@@ -0,0 +1,96 @@
+"""
+Test streaming chat endpoint
+
+Drives POST /chat/stream with stubbed model calls and checks the SSE
+event order: meta first, then tokens, then learning, then done.
+"""
+
+import sys
+import json
+import asyncio
+sys.path.insert(0, '/home/voyager4/projects/claudBUD/src')
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from extractors import SocialAnalysis
+from policy_engine import BehaviorPolicy
+from orchestrator import buddy_agent
+from api.chat_router import router
+
+
+async def fake_analyze(text):
+    return SocialAnalysis(
+        primary_emotion="frustration",
+        intensity=7,
+        user_need="vent",
+        relationship="friend",
+        conflict_risk="low"
+    )
+
+
+async def fake_policy(context):
+    return BehaviorPolicy(
+        mode="venting_listener",
+        tone="casual_supportive",
+        humor_level=1,
+        message_length="short",
+        initiative="low",
+        give_action_steps=False,
+        ask_followup_question=True
+    )
+
+
+async def fake_stream(**kwargs):
+    for chunk in ["Arre ", "bhai, ", "train ", "phir late?"]:
+        await asyncio.sleep(0)
+        yield chunk
+
+
+def parse_sse(body: str):
+    events = []
+    for block in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.split("\n"))
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+def test_chat_stream_event_order(monkeypatch):
+    """meta -> token* -> learning -> done"""
+
+    print("=" * 70)
+    print("Test: POST /chat/stream")
+    print("=" * 70)
+    print()
+
+    monkeypatch.delenv("DATABASE_URL", raising=False)
+    monkeypatch.setattr(buddy_agent, "aselect_social_analysis", fake_analyze)
+    monkeypatch.setattr(buddy_agent, "aselect_behavior_policy", fake_policy)
+    monkeypatch.setattr(buddy_agent, "astream_reply", fake_stream)
+
+    app = FastAPI()
+    app.include_router(router)
+    client = TestClient(app)
+
+    response = client.post("/chat/stream", json={"user_id": "u1", "message": "bhai train late ho gayi"})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+
+    events = parse_sse(response.text)
+    names = [name for name, _ in events]
+
+    assert names[0] == "meta"
+    assert events[0][1] == {
+        "mode": "venting_listener",
+        "emotion": "frustration",
+        "intensity": 7,
+        "relationship": "friend"
+    }
+    assert names[1:-2] == ["token"] * 4
+    assert "".join(data["text"] for name, data in events if name == "token") == "Arre bhai, train phir late?"
+    assert events[-2] == ("learning", {"learning": None})
+    assert names[-1] == "done"
+    assert "first_token" in events[-1][1]["timings"]
+
+    print(f"✅ Events: {names}")
+    print()
@@ -0,0 +1,83 @@
+"""
+Test the retrieval evaluation harness
+
+Checks that the hold-out split is deterministic and leak-free, and that
+accuracy, confusion and latency are reported for every engine built
+from the training documents only.
+"""
+
+import os
+import sys
+from types import MappingProxyType
+sys.path.insert(0, '/home/voyager4/projects/claudBUD/src')
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'benchmarks'))
+
+import pytest
+
+import eval_retrieval
+from rag.library import BehaviorLibrary, ScenarioRecord
+
+
+def _record(name, texts):
+    return ScenarioRecord(
+        name=name,
+        file_stem=name.replace(" ", "_") + "_enhanced",
+        metadata=MappingProxyType({"scenario": name.replace(" ", "_"), "typical_emotions": ()}),
+        texts=tuple(texts),
+        keywords=frozenset(name.split()),
+    )
+
+
+LIBRARY = BehaviorLibrary(None, (
+    _record("exam stress", [f"kal exam hai tension {i}" for i in range(20)] + ["shared text"]),
+    _record("train late", [f"train phir late ho gayi {i}" for i in range(20)] + ["shared text"]),
+))
+
+
+def test_split_is_deterministic_and_disjoint():
+    """Same split every run; no held-out text in training; shared texts keep both labels"""
+    print("=" * 70)
+    print("Testing evaluation split")
+    print("=" * 70)
+
+    train, queries = eval_retrieval.split_library(LIBRARY, test_percent=50)
+    assert (train, queries) == eval_retrieval.split_library(LIBRARY, test_percent=50)
+
+    held_out = {text for text, _ in queries}
+    assert held_out and not held_out & {text for _, text in train}
+    assert len(train) + sum(len(labels) for _, labels in queries) == len(LIBRARY.documents())
+
+    shared = eval_retrieval.in_test_split("shared text", 50)
+    assert (("shared text", frozenset({"exam stress", "train late"})) in queries) == shared
+
+    assert eval_retrieval.split_library(LIBRARY, test_percent=0)[1] == []
+    print(f"✅ {len(train)} train / {len(queries)} held out")
+
+
+def test_run_evaluation_reports_every_engine():
+    """Accuracy, confusion, per-scenario recall and latency per engine"""
+    report = eval_retrieval.run_evaluation(LIBRARY, ["keyword", "bm25", "ngram"], test_percent=50, k=2)
+    assert report["queries"] > 0 and set(report["engines"]) == {"keyword", "bm25", "ngram"}
+
+    for name, result in report["engines"].items():
+        assert 0 <= result["top1"] <= result["top2"] <= 1
+        assert set(result["latency_ms"]) == {"p50", "p95", "p99"}
+        assert set(result["per_scenario"]) <= {"exam stress", "train late"}
+        print(f"   {name}: top1={result['top1']:.0%} p50={result['latency_ms']['p50']}ms")
+
+    # Texts share their scenario's words: BM25 never picks the wrong one
+    # ("shared text" has no words in training and gets no answer at all)
+    bm25 = report["engines"]["bm25"]
+    assert bm25["confusion"] == []
+    assert bm25["top1"] + bm25["no_answer"] == pytest.approx(1.0, abs=1e-3)
+    # Keyword only sees names: "kal exam hai..." has no name word
+    assert report["engines"]["keyword"]["no_answer"] > 0
+
+    with pytest.raises(ValueError):
+        eval_retrieval.run_evaluation(LIBRARY, ["nonsense"])
+    print("✅ Report complete")
+
+
+if __name__ == "__main__":
+    test_split_is_deterministic_and_disjoint()
+    test_run_evaluation_reports_every_engine()
@@ -0,0 +1,92 @@
+"""
+Test the offline fake OpenRouter server
+
+Talks to benchmarks/fake_openrouter.py through the real OpenAI client
+and checks that every pipeline stage gets a response it can parse,
+including streamed replies.
+"""
+
+import os
+import sys
+sys.path.insert(0, '/home/voyager4/projects/claudBUD/src')
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'benchmarks'))
+
+import pytest
+from fastapi.testclient import TestClient
+from openai import OpenAI
+
+from fake_openrouter import create_app, parse_latency
+from extractors import SocialAnalysis
+from extractors.analyzer import _build_messages as analysis_messages
+from extractors.fused import _build_messages as fused_messages, _parse_fused
+from policy_engine import BehaviorPolicy
+from policy_engine.decider import _build_messages as policy_messages
+
+
+def _client(app) -> OpenAI:
+    return OpenAI(base_url="http://testserver/api/v1", api_key="fake", http_client=TestClient(app))
+
+
+def _complete(client: OpenAI, messages: list) -> str:
+    response = client.chat.completions.create(model="fake", messages=messages)
+    return response.choices[0].message.content
+
+
+def test_stage_responses_parse():
+    """Analysis, policy and fused prompts get valid structured JSON back"""
+    print("=" * 70)
+    print("Testing fake OpenRouter stage responses")
+    print("=" * 70)
+
+    app = create_app()
+    client = _client(app)
+    text = "My boss yelled at me in front of everyone, what do I do"
+
+    analysis = SocialAnalysis.model_validate_json(_complete(client, analysis_messages(text)))
+    assert analysis.relationship == "authority"
+
+    policy = BehaviorPolicy.model_validate_json(_complete(client, policy_messages({
+        "emotion": analysis.primary_emotion,
+        "user_need": analysis.user_need,
+        "relationship": analysis.relationship,
+        "conflict_risk": analysis.conflict_risk,
+        "intensity": analysis.intensity,
+    })))
+    assert policy.mode == "diplomatic_advisor"
+
+    fused_analysis, fused_policy = _parse_fused(_complete(client, fused_messages(text)))
+    assert fused_analysis == analysis
+    assert fused_policy.mode == policy.mode
+
+    assert app.state.requests == {"analysis": 1, "policy": 1, "fused": 1, "compose": 0}
+    print(f"✅ {analysis.primary_emotion}/{analysis.relationship} -> {policy.mode}")
+
+
+def test_streamed_reply():
+    """stream=True yields chunks that join back into the canned reply"""
+    client = _client(create_app())
+    stream = client.chat.completions.create(
+        model="fake",
+        messages=[{"role": "system", "content": "You are Buddy"}, {"role": "user", "content": "hi"}],
+        stream=True
+    )
+    text = "".join(chunk.choices[0].delta.content or "" for chunk in stream if chunk.choices)
+    assert text.startswith("Arre yaar")
+    print("✅ Streamed reply reassembled")
+
+
+def test_latency_specs():
+    """Latency specs parse into samplers; bad specs raise"""
+    assert parse_latency("fixed:25")() == 25
+    assert 10 <= parse_latency("uniform:10:20")() <= 20
+    assert parse_latency("lognormal:100:0.5")() > 0
+    for bad in ("fixed", "uniform:10", "gamma:1:2", "fixed:abc"):
+        with pytest.raises(ValueError):
+            parse_latency(bad)
+    print("✅ Latency specs")
+
+
+if __name__ == "__main__":
+    test_stage_responses_parse()
+    test_streamed_reply()
+    test_latency_specs()
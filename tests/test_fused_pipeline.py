@@ -0,0 +1,122 @@
+"""
+Test the fused analysis + policy stage
+
+Checks that the fused prompt carries both stage prompts, that replies
+are validated against both models, and that the orchestrator uses one
+call in fused mode and falls back to the staged calls when it fails.
+"""
+
+import sys
+import json
+import asyncio
+sys.path.insert(0, '/home/voyager4/projects/claudBUD/src')
+
+import pytest
+
+from extractors import SocialAnalysis
+from extractors import fused
+from llm import get_prompt
+from policy_engine import BehaviorPolicy
+from orchestrator import buddy_agent
+
+
+ANALYSIS = {
+    "primary_emotion": "anger", "intensity": 7, "user_need": "advice",
+    "relationship": "authority", "conflict_risk": "high"
+}
+POLICY = {
+    "mode": "diplomatic_advisor", "tone": "respectful_formal", "humor_level": 0,
+    "message_length": "medium", "initiative": "medium",
+    "give_action_steps": True, "ask_followup_question": False
+}
+
+
+def test_fused_prompt_and_parsing():
+    """System prompt embeds both prompts; output validates against both models"""
+    print("=" * 70)
+    print("Testing fused prompt and parsing")
+    print("=" * 70)
+
+    system = fused._build_messages("boss yelled")[0]["content"]
+    assert get_prompt("social_analysis") in system
+    assert get_prompt("behavior_policy") in system
+    print("✅ Fused prompt built from both stage prompts")
+
+    reply = "```json\n" + json.dumps({"analysis": ANALYSIS, "policy": POLICY}) + "\n```"
+    analysis, policy = fused._parse_fused(reply)
+    assert isinstance(analysis, SocialAnalysis) and analysis.relationship == "authority"
+    assert isinstance(policy, BehaviorPolicy) and policy.mode == "diplomatic_advisor"
+    print("✅ Combined JSON parsed into SocialAnalysis + BehaviorPolicy")
+
+    with pytest.raises(Exception):
+        fused._parse_fused(json.dumps({"analysis": ANALYSIS, "policy": {**POLICY, "mode": "bogus"}}))
+    print("✅ Invalid policy rejected")
+
+
+def _stub_pipeline(monkeypatch, fused_impl):
+    staged_calls = []
+
+    async def staged_analysis(text):
+        staged_calls.append("analysis")
+        return SocialAnalysis(**ANALYSIS)
+
+    async def staged_policy(context):
+        staged_calls.append("policy")
+        return BehaviorPolicy(**POLICY)
+
+    async def fake_reply(**kwargs):
+        return f"{kwargs['analysis'].primary_emotion}/{kwargs['policy'].mode}"
+
+    monkeypatch.setenv("BUDDY_PIPELINE_MODE", "fused")
+    monkeypatch.delenv("DATABASE_URL", raising=False)
+    monkeypatch.setattr(buddy_agent, "aanalyze_and_decide", fused_impl)
+    monkeypatch.setattr(buddy_agent, "aselect_social_analysis", staged_analysis)
+    monkeypatch.setattr(buddy_agent, "aselect_behavior_policy", staged_policy)
+    monkeypatch.setattr(buddy_agent, "agenerate_reply", fake_reply)
+    return staged_calls
+
+
+def test_orchestrator_uses_single_call(monkeypatch):
+    """Fused mode skips the staged analysis and policy calls"""
+    print("=" * 70)
+    print("Testing fused orchestrator path")
+    print("=" * 70)
+
+    fused_calls = []
+
+    async def fake_fused(text):
+        fused_calls.append(text)
+        return SocialAnalysis(**{**ANALYSIS, "primary_emotion": "frustration"}), BehaviorPolicy(**POLICY)
+
+    staged_calls = _stub_pipeline(monkeypatch, fake_fused)
+    result = asyncio.run(buddy_agent.abuddy_chat("user_fused", "boss yelled at me"))
+
+    assert result["error"] is None
+    assert result["reply"] == "frustration/diplomatic_advisor"
+    assert fused_calls == ["boss yelled at me"]
+    assert staged_calls == []
+    assert "analysis_policy" in result["timings"]
+    print(f"✅ One call: {result['timings']}")
+
+
+def test_orchestrator_falls_back_to_staged(monkeypatch):
+    """A failing fused call falls back to the staged calls"""
+    print("=" * 70)
+    print("Testing fused fallback")
+    print("=" * 70)
+
+    async def broken_fused(text):
+        raise ValueError("bad JSON")
+
+    staged_calls = _stub_pipeline(monkeypatch, broken_fused)
+    result = asyncio.run(buddy_agent.abuddy_chat("user_fused", "boss yelled at me"))
+
+    assert result["error"] is None
+    assert result["reply"] == "anger/diplomatic_advisor"
+    assert staged_calls == ["analysis", "policy"]
+    print("✅ Staged calls used after fused failure")
+
+
+if __name__ == "__main__":
+    test_fused_prompt_and_parsing()
+    print("\nRun with pytest for the orchestrator tests (uses monkeypatch)")
@@ -0,0 +1,106 @@
+"""
+Test the find_relevant_knowledge query cache
+
+Checks that near-identical messages share one entry, that signals and
+the library version are part of the key, that callers cannot mutate
+cached entries, and that keyword fallbacks are never cached.
+"""
+
+import sys
+sys.path.insert(0, '/home/voyager4/projects/claudBUD/src')
+
+from rag import find_relevant_knowledge, get_knowledge_cache, get_library
+from rag import query_cache
+from rag.query_cache import knowledge_cache_key, query_signature
+
+
+ANALYSIS = {"primary_emotion": "frustration", "relationship": "authority", "user_need": "vent"}
+
+
+def test_query_signature_normalizes():
+    """Case, punctuation, word order and elongations do not change the key"""
+    print("=" * 70)
+    print("Testing knowledge cache keys")
+    print("=" * 70)
+
+    base = query_signature("monday blues yaar", "bm25")
+    assert query_signature("Monday BLUES, yaaaar!!", "bm25") == base
+    assert query_signature("yrr blues monday", "bm25") == base
+    assert query_signature("tuesday blues yaar", "bm25") != base
+    assert query_signature("Traffic bahut hai", "keyword") == query_signature("hai traffic BAHUT", "keyword")
+    # Keyword ranks on the word set but picks examples through BM25 term counts
+    assert query_signature("exam tension", "keyword") != query_signature("exam tension tension", "keyword")
+
+    key = knowledge_cache_key("monday blues", ANALYSIS, "bm25", 3, "v1")
+    assert key == knowledge_cache_key("Monday blues!", dict(ANALYSIS, intensity=9), "bm25", 3, "v1")
+    assert key != knowledge_cache_key("monday blues", None, "bm25", 3, "v1")
+    assert key != knowledge_cache_key("monday blues", ANALYSIS, "bm25", 3, "v2")
+    assert key != knowledge_cache_key("monday blues", ANALYSIS, "keyword", 3, "v1")
+    assert key != knowledge_cache_key("monday blues", ANALYSIS, "bm25", 5, "v1")
+    print("✅ Keys normalized")
+
+
+def test_repeat_lookup_hits_cache(monkeypatch):
+    """Second near-identical lookup is a hit with an equal, independent result"""
+    monkeypatch.delenv("RAG_ENGINE", raising=False)
+    cache = get_knowledge_cache()
+    cache.clear()
+    cache.reset_stats()
+
+    first = find_relevant_knowledge("traffic bahut hai aaj office late", ANALYSIS)
+    second = find_relevant_knowledge("Traffic bahuuut hai aaj, office late!!", ANALYSIS)
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.size) == (1, 1, 1)
+    assert first == second and first is not second
+
+    second["do"].append("mutated")
+    assert "mutated" not in find_relevant_knowledge("traffic bahut hai aaj office late", ANALYSIS)["do"]
+
+    # Different signals: a separate entry
+    find_relevant_knowledge("traffic bahut hai aaj office late", None)
+    assert cache.stats().size == 2
+    print(f"✅ {cache.stats().as_dict()}")
+
+
+def test_keyword_repeated_words_miss(monkeypatch):
+    """Repeated words change keyword-engine examples, so they never share an entry"""
+    monkeypatch.setenv("RAG_ENGINE", "keyword")
+    cache = get_knowledge_cache()
+    cache.clear()
+    cache.reset_stats()
+
+    first = find_relevant_knowledge("exam stress tension")
+    repeated = find_relevant_knowledge("exam stress tension tension tension tension")
+    assert cache.stats().hits == 0 and cache.stats().size == 2
+    assert first["examples"] != repeated["examples"]
+    print(f"✅ {first['examples'][:1]} vs {repeated['examples'][:1]}")
+
+
+def test_library_version_invalidates(monkeypatch):
+    """A rebuilt library (new version) never serves entries from the old one"""
+    cache = get_knowledge_cache()
+    cache.clear()
+    cache.reset_stats()
+    find_relevant_knowledge("git merge conflict again")
+    monkeypatch.setattr(get_library(), "version", "rebuilt")
+    find_relevant_knowledge("git merge conflict again")
+    assert cache.stats().hits == 0 and cache.stats().size == 2
+
+
+def test_fallback_not_cached_and_disable(monkeypatch):
+    """Keyword fallbacks skip the cache; RAG_CACHE_SIZE=0 disables it"""
+    cache = get_knowledge_cache()
+    cache.clear()
+    cache.reset_stats()
+    find_relevant_knowledge("zzqx qqzx", {"primary_emotion": "anxiety"})
+    assert cache.stats().size == 0
+
+    monkeypatch.setattr(query_cache, "_cache", None)
+    monkeypatch.setenv("RAG_CACHE_SIZE", "0")
+    assert get_knowledge_cache().maxsize == 0
+    assert find_relevant_knowledge("git merge conflict again")["scenario"] == "git_conflict"
+    assert len(get_knowledge_cache()) == 0
+
+
+if __name__ == "__main__":
+    test_query_signature_normalizes()
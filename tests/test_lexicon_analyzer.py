@@ -0,0 +1,101 @@
+"""
+Test the offline lexicon social analyzer
+
+Checks Hinglish/English emotion, need and relationship detection,
+negation, intensifiers and emoji, the confidence score, and that a
+classification stays well under a millisecond.
+"""
+
+import sys
+import time
+sys.path.insert(0, '/home/voyager4/projects/claudBUD/src')
+
+from extractors import SocialAnalysis, classify_social_context
+
+
+def test_classifies_common_messages():
+    """Typical Hinglish/English messages map to the expected fields"""
+    print("=" * 70)
+    print("Testing lexicon classification")
+    print("=" * 70)
+
+    cases = [
+        ("bhai train late ho gayi", "frustration", "vent", "unknown", "low"),
+        ("My boss just yelled at me in front of everyone. So pissed off.", "anger", "vent", "authority", "high"),
+        ("Exam kal hai, bahut tension ho raha hai, kya hoga", "anxiety", "reassurance", "unknown", "low"),
+        ("should i take the offer or stay? confused", "confusion", "decision_help", "unknown", "low"),
+        ("so bored waiting at the airport 🥱", "boredom", "distraction", "unknown", "low"),
+        ("My girlfriend and I had a fight, am I wrong?", "anger", "validation", "romantic", "medium"),
+        ("ugh the waiter got my order wrong AGAIN", "frustration", "vent", "service_person", "low"),
+    ]
+
+    for text, emotion, need, relationship, risk in cases:
+        result = classify_social_context(text)
+        analysis = result.analysis
+        assert isinstance(analysis, SocialAnalysis)
+        assert analysis.primary_emotion == emotion, (text, result)
+        assert analysis.user_need == need, (text, result)
+        assert analysis.relationship == relationship, (text, result)
+        assert analysis.conflict_risk == risk, (text, result)
+        assert 0.0 <= result.confidence <= 1.0
+        print(f"✅ {text[:40]!r} -> {emotion}/{need}/{relationship} ({result.confidence})")
+
+
+def test_negation_intensity_and_emoji():
+    """Negation flips or drops emotions; intensifiers and emphasis raise intensity"""
+    print("=" * 70)
+    print("Testing negation, intensifiers and emoji")
+    print("=" * 70)
+
+    assert classify_social_context("khush nahi hoon yaar").analysis.primary_emotion == "sadness"
+    assert classify_social_context("I am not happy").analysis.primary_emotion == "sadness"
+    assert classify_social_context("Not worried at all").analysis.primary_emotion == "neutral"
+    print("✅ Negation handled before and after the word")
+
+    mild = classify_social_context("thoda stressed").analysis.intensity
+    plain = classify_social_context("stressed").analysis.intensity
+    strong = classify_social_context("bahut stressed!!!").analysis.intensity
+    assert mild < plain < strong
+    assert classify_social_context("sooo stressed").analysis.intensity > plain
+    print(f"✅ Intensity: thoda={mild} plain={plain} bahut!!!={strong}")
+
+    assert classify_social_context("😭😭").analysis.primary_emotion == "sadness"
+    assert classify_social_context("result aa gaya 🎉").analysis.primary_emotion == "happy"
+    print("✅ Emoji signals")
+
+
+def test_confidence_orders_clear_over_vague():
+    """Clear, specific messages score higher than vague ones"""
+    print("=" * 70)
+    print("Testing confidence score")
+    print("=" * 70)
+
+    vague = classify_social_context("hello")
+    clear = classify_social_context("I'm so stressed about my boss, what should I do?")
+    assert vague.analysis.primary_emotion == "neutral"
+    assert clear.confidence > vague.confidence
+    assert any(hit.startswith("relationship:authority") for hit in clear.evidence)
+    print(f"✅ vague={vague.confidence} clear={clear.confidence}")
+
+
+def test_classification_is_sub_millisecond():
+    """Average classification time stays well under 1 ms"""
+    texts = [
+        "bhai train late ho gayi",
+        "My boss keeps giving me impossible deadlines and I'm so stressed, what should I do?",
+        "so bored 🥱",
+    ]
+    iterations = 3000
+    start = time.perf_counter()
+    for i in range(iterations):
+        classify_social_context(texts[i % len(texts)])
+    avg_us = (time.perf_counter() - start) / iterations * 1e6
+    print(f"✅ {avg_us:.1f} µs per classification")
+    assert avg_us < 1000
+
+
+if __name__ == "__main__":
+    test_classifies_common_messages()
+    test_negation_intensity_and_emoji()
+    test_confidence_orders_clear_over_vague()
+    test_classification_is_sub_millisecond()
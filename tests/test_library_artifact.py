@@ -0,0 +1,101 @@
+"""
+Test the compiled behavior library artifact
+
+Compiles a copy of a few library files, then checks the artifact loads
+to the same scenarios and BM25 rankings as the sources, dedupes texts,
+and is ignored when stale or from another format version.
+"""
+
+import io
+import sys
+import json
+import shutil
+sys.path.insert(0, '/home/voyager4/projects/claudBUD/src')
+
+from rag import compile_library, get_library
+from rag.artifact import ARTIFACT_NAME, loads
+from rag.library import BehaviorLibrary
+from telemetry.logging import configure_logging, shutdown_logging
+
+
+FILES = ("exam_stress_enhanced.json", "train_late_enhanced.json", "breakup_enhanced.json")
+
+
+def _library_copy(tmp_path):
+    source = get_library().path
+    target = tmp_path / "behavior_library"
+    target.mkdir()
+    for name in FILES:
+        shutil.copy(source / name, target / name)
+    return target
+
+
+def test_compiled_matches_sources(tmp_path):
+    """Same records, version and rankings; texts stored once"""
+    print("=" * 70)
+    print("Testing compiled library artifact")
+    print("=" * 70)
+
+    path = _library_copy(tmp_path)
+    summary = compile_library(path)
+    assert (path / ARTIFACT_NAME).exists()
+    assert summary["bytes"] < summary["source_bytes"]
+
+    payload = loads((path / ARTIFACT_NAME).read_bytes())
+    assert len(payload["texts"]) == len(set(payload["texts"]))
+
+    compiled = BehaviorLibrary.load(path)
+    sources = BehaviorLibrary.load_sources(path)
+    assert "bm25" in vars(compiled)  # Prebuilt, not rebuilt on first access
+    assert compiled.version == sources.version == summary["version"]
+    assert [r.to_knowledge() for r in compiled.scenarios] == [r.to_knowledge() for r in sources.scenarios]
+    assert [r.texts for r in compiled.scenarios] == [r.texts for r in sources.scenarios]
+    assert [r.keywords for r in compiled.scenarios] == [r.keywords for r in sources.scenarios]
+
+    for query in ("kal exam hai bahut tension", "train phir late", "breakup ho gaya yaar"):
+        assert compiled.bm25.search(query, k=3) == sources.bm25.search(query, k=3)
+    print(f"✅ {summary['source_bytes']} -> {summary['bytes']} bytes, version {summary['version']}")
+
+
+def test_stale_artifact_ignored(tmp_path):
+    """Editing a source file makes the artifact stale; sources are parsed instead"""
+    path = _library_copy(tmp_path)
+    before = compile_library(path)["version"]
+
+    data = json.loads((path / FILES[0]).read_text(encoding="utf-8"))
+    data[0]["tone"] = "edited tone for the test"
+    (path / FILES[0]).write_text(json.dumps(data), encoding="utf-8")
+
+    stream = io.StringIO()
+    configure_logging(stream=stream, force=True)
+    library = BehaviorLibrary.load(path)
+    shutdown_logging()  # Flushes the queued warning
+    configure_logging(force=True)
+    assert "stale" in stream.getvalue()
+    assert "bm25" not in vars(library)
+    assert library.version != before
+    assert library.get("exam stress").metadata["tone"] == "edited tone for the test"
+    print("✅ Stale artifact ignored")
+
+
+def test_format_mismatch_and_override(tmp_path, monkeypatch):
+    """BEHAVIOR_LIBRARY_ARTIFACT moves the artifact; other formats are ignored"""
+    path = _library_copy(tmp_path)
+    artifact = tmp_path / "elsewhere.compiled"
+    monkeypatch.setenv("BEHAVIOR_LIBRARY_ARTIFACT", str(artifact))
+
+    compile_library(path)
+    assert artifact.exists() and not (path / ARTIFACT_NAME).exists()
+    assert "bm25" in vars(BehaviorLibrary.load(path))
+
+    payload = loads(artifact.read_bytes())
+    payload["format"] = 0
+    artifact.write_text(json.dumps(payload), encoding="utf-8")
+    assert "bm25" not in vars(BehaviorLibrary.load(path))
+    print("✅ Override path and format check")
+
+
+if __name__ == "__main__":
+    import tempfile
+    from pathlib import Path
+    test_compiled_matches_sources(Path(tempfile.mkdtemp()))
@@ -0,0 +1,56 @@
+"""
+Test shared LLM client
+
+Checks that every stage gets the same pooled OpenRouter client.
+"""
+
+import sys
+import asyncio
+sys.path.insert(0, '/home/voyager4/projects/claudBUD/src')
+
+import pytest
+
+from llm import get_llm_client, get_async_llm_client, close_llm_clients
+
+
+def test_sync_client_is_shared(monkeypatch):
+    """Same key returns the same client; different keys share one pool"""
+
+    monkeypatch.setenv("OPENROUTER_API_KEY", "test-key")
+    close_llm_clients()
+
+    client = get_llm_client()
+    assert get_llm_client() is client
+    assert get_llm_client("test-key") is client
+
+    other = get_llm_client("other-key")
+    assert other is not client
+    assert other._client is client._client
+
+    close_llm_clients()
+    print("✅ Sync client pooled and shared")
+
+
+def test_missing_api_key(monkeypatch):
+    """No key anywhere still raises ValueError like the old per-call clients"""
+
+    monkeypatch.delenv("OPENROUTER_API_KEY", raising=False)
+    with pytest.raises(ValueError):
+        get_llm_client()
+
+
+def test_async_client_per_loop(monkeypatch):
+    """Async clients are reused within a loop and rebuilt for a new loop"""
+
+    monkeypatch.setenv("OPENROUTER_API_KEY", "test-key")
+
+    async def grab_twice():
+        return get_async_llm_client(), get_async_llm_client()
+
+    first, again = asyncio.run(grab_twice())
+    assert first is again
+
+    second, _ = asyncio.run(grab_twice())
+    assert second is not first
+
+    print("✅ Async client pooled per event loop")
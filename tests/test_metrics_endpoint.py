@@ -0,0 +1,127 @@
+"""
+Test the Prometheus /metrics endpoint
+
+Checks the text exposition format, per-route request metrics from the
+middleware, LLM call/error/fallback counters, DB pool gauges and cache
+hit ratios - all without any network access.
+"""
+
+import sys
+sys.path.insert(0, '/home/voyager4/projects/claudBUD/src')
+
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from cache import LRUCache
+from extractors import get_cascade_stats
+from persona import PostgresDB
+from persona.models import Base
+from telemetry.metrics import (
+    LLM_CALLS,
+    LLM_ERRORS,
+    LLM_FALLBACKS,
+    MetricsRegistry,
+    record_llm_fallback,
+    track_llm_call,
+)
+
+
+def _metric_lines(text: str, name: str):
+    return [line for line in text.splitlines() if line.startswith(name)]
+
+
+def test_registry_renders_prometheus_text():
+    """Counters and histograms render HELP/TYPE, labels, buckets, sum and count"""
+    print("=" * 70)
+    print("Testing Prometheus text rendering")
+    print("=" * 70)
+
+    registry = MetricsRegistry()
+    counter = registry.counter("demo_total", "Demo counter", ("kind",))
+    histogram = registry.histogram("demo_seconds", "Demo latency", ("kind",), buckets=(10, 100))
+    counter.inc('a"b')
+    histogram.observe("x", value_ms=50)
+    registry.register_collector(lambda: [("demo_gauge", "gauge", "Demo gauge", [({}, 0.25)])])
+    registry.register_collector(lambda: [("demo_ratio", "gauge", "Non-finite values", [
+        ({"v": "inf"}, float("inf")), ({"v": "-inf"}, float("-inf")), ({"v": "nan"}, float("nan"))])])
+
+    text = registry.render()
+    assert "# TYPE demo_total counter" in text
+    assert 'demo_total{kind="a\\"b"} 1' in text
+    assert 'demo_seconds_bucket{kind="x",le="0.01"} 0' in text
+    assert 'demo_seconds_bucket{kind="x",le="0.1"} 1' in text
+    assert 'demo_seconds_bucket{kind="x",le="+Inf"} 1' in text
+    assert 'demo_seconds_sum{kind="x"} 0.05' in text
+    assert "demo_gauge 0.25" in text
+    assert 'demo_ratio{v="inf"} +Inf' in text and 'demo_ratio{v="-inf"} -Inf' in text
+    assert 'demo_ratio{v="nan"} NaN' in text
+    print("✅ Exposition format")
+
+
+def test_llm_call_tracking():
+    """Calls, errors and fallbacks are counted per stage and model"""
+    before = (LLM_CALLS.value("test_stage", "m"), LLM_ERRORS.value("test_stage", "m"))
+
+    with track_llm_call("test_stage", "m"):
+        pass
+    with pytest.raises(RuntimeError):
+        with track_llm_call("test_stage", "m"):
+            raise RuntimeError("upstream down")
+    record_llm_fallback("test_stage")
+
+    assert LLM_CALLS.value("test_stage", "m") == before[0] + 2
+    assert LLM_ERRORS.value("test_stage", "m") == before[1] + 1
+    assert LLM_FALLBACKS.value("test_stage") >= 1
+    print("✅ LLM call/error/fallback counters")
+
+
+def test_metrics_endpoint(monkeypatch, tmp_path):
+    """GET /metrics exposes route, DB pool and cache metrics"""
+    print("=" * 70)
+    print("Testing GET /metrics")
+    print("=" * 70)
+
+    PostgresDB.close()
+    PostgresDB.connect(f"sqlite:///{tmp_path / 'buddy.db'}")
+    Base.metadata.create_all(PostgresDB._engine)
+
+    cache = LRUCache(maxsize=4, name="test_metrics")
+    cache.set("k", 1)
+    cache.get("k")
+    cache.get("missing")
+
+    get_cascade_stats().record_tier("local", 0.2)
+    get_cascade_stats().record_tier("llm", 1500)
+
+    client = TestClient(main.app)
+    client.get("/health")
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    text = response.text
+
+    assert _metric_lines(text, 'buddy_http_requests_total{method="GET",route="/health",status="200"}')
+    assert _metric_lines(text, 'buddy_http_request_duration_seconds_count{method="GET",route="/health"}')
+    print("✅ Per-route request metrics")
+
+    assert _metric_lines(text, "buddy_db_pool_checked_out")
+    assert _metric_lines(text, "buddy_db_pool_overflow")
+    print("✅ DB pool gauges")
+
+    assert 'buddy_cache_hit_ratio{cache="test_metrics"} 0.5' in text
+    print("✅ Cache hit ratio")
+
+    assert _metric_lines(text, 'buddy_analysis_tier_latency_seconds_bucket{tier="local",le="0.00025"}')
+    assert _metric_lines(text, 'buddy_analysis_tier_latency_seconds_count{tier="llm"}')
+    assert _metric_lines(text, 'buddy_analysis_tier_latency_seconds_sum{tier="local"}')
+    print("✅ Analysis tier latency histogram")
+
+    PostgresDB.close()
+
+
+if __name__ == "__main__":
+    test_registry_renders_prometheus_text()
+    test_llm_call_tracking()
+    print("\nRun with pytest for the endpoint test (uses tmp_path)")
@@ -0,0 +1,69 @@
+"""
+Test the microbenchmark harness
+
+Checks regression classification against a baseline, baseline merging,
+the synthetic WhatsApp export generator and that the cheap benchmarks
+set up and run.
+"""
+
+import os
+import sys
+import json
+sys.path.insert(0, '/home/voyager4/projects/claudBUD/src')
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'benchmarks'))
+
+import microbench
+from whatsapp import parse_whatsapp_chat
+
+
+def test_compare_flags_regressions():
+    """Only slowdowns beyond the threshold count as regressions"""
+    print("=" * 70)
+    print("Testing baseline comparison")
+    print("=" * 70)
+
+    results = {name: {"median_us": us} for name, us in
+               {"a": 100.0, "b": 130.0, "c": 50.0, "d": 10.0}.items()}
+    baseline = {"a": 95.0, "b": 100.0, "c": 100.0}
+
+    status = {name: s for name, _, _, s in microbench.compare(results, baseline, threshold=0.25)}
+    assert status == {"a": "ok", "b": "REGRESSION", "c": "faster", "d": "new"}
+    print(f"✅ {status}")
+
+
+def test_save_baseline_merges(tmp_path):
+    """Saving keeps entries for benchmarks that were not re-run"""
+    path = tmp_path / "baselines.json"
+    microbench.save_baseline(path, {"a": {"median_us": 1.0}, "b": {"median_us": 2.0}})
+    microbench.save_baseline(path, {"b": {"median_us": 3.0}})
+
+    assert microbench.load_baseline(path) == {"a": 1.0, "b": 3.0}
+    assert "python" in json.loads(path.read_text())
+    print("✅ Baseline merged")
+
+
+def test_whatsapp_export_fixture():
+    """The synthetic export is deterministic, sized and parseable"""
+    export = microbench.make_whatsapp_export(20_000)
+    assert export == microbench.make_whatsapp_export(20_000)
+    assert 20_000 <= len(export) < 21_000
+
+    clean = parse_whatsapp_chat(export)
+    assert clean and "omitted" not in clean and "98765" not in clean
+    print(f"✅ {len(clean.splitlines())} messages parsed")
+
+
+def test_cheap_benchmarks_run():
+    """RAG and composer benchmarks set up and time without a model or DB"""
+    results = microbench.run_benchmarks(
+        ["rag.find_relevant_knowledge", "composer.build_messages"], min_time=0.01, repeat=2
+    )
+    assert set(results) == {"rag.find_relevant_knowledge", "composer.build_messages"}
+    assert all(r["median_us"] > 0 and r["loops"] >= 1 for r in results.values())
+    print("✅ Benchmarks ran")
+
+
+if __name__ == "__main__":
+    test_compare_flags_regressions()
+    test_whatsapp_export_fixture()
+    test_cheap_benchmarks_run()
@@ -0,0 +1,99 @@
+"""
+Test the character n-gram scenario index
+
+Checks normalization and spelling-variant robustness on a small corpus,
+that batched scoring matches one-at-a-time scoring, and the "ngram"
+engine over the real behavior library.
+"""
+
+import sys
+import time
+sys.path.insert(0, '/home/voyager4/projects/claudBUD/src')
+
+import numpy as np
+import pytest
+
+from rag import get_library, retrieve_scenarios, search_scenarios
+from rag.ngram import NgramIndex, normalize_words
+
+
+DOCS = [
+    ("upi fail", "upi payment fail ho gaya paisa cut gaya"),
+    ("upi fail", "transaction failed but amount debited"),
+    ("train late", "train phir late ho rahi hai platform pe"),
+    ("exam stress", "kal exam hai bahut pareshan hu"),
+]
+
+
+def test_normalize_words():
+    """Lowercase, URLs dropped, repeated characters collapsed"""
+    print("=" * 70)
+    print("Testing n-gram normalization")
+    print("=" * 70)
+
+    assert normalize_words("Bahuuut TENSION https://t.co/x 😭😭") == ["bahut", "tension", "😭", "😭"]
+    assert normalize_words("upp acchha") == ["up", "acha"]
+    assert normalize_words("") == []
+    print("✅ Words normalized")
+
+
+def test_spelling_variants_match():
+    """Misspelled queries still land on the right scenario; scores are cosines"""
+    index = NgramIndex(DOCS)
+    assert index.doc_count == 4
+    assert index.scenarios == ("upi fail", "train late", "exam stress")
+
+    assert index.search("upii paymnt failled", k=1)[0][0] == "upi fail"
+    assert index.search("tren late hora", k=1)[0][0] == "train late"
+    assert index.search("preshan exm", k=1)[0][0] == "exam stress"
+
+    scores = index.score_docs_many(["upi payment fail ho gaya paisa cut gaya"])
+    assert scores.shape == (1, 4)
+    assert np.all(scores <= 1 + 1e-6)
+    assert scores[0].argmax() == 0 and scores[0, 0] > 0.99  # Same text as doc 0
+
+    assert index.search("") == []
+    assert NgramIndex([]).search("anything") == []
+    with pytest.raises(ValueError):
+        NgramIndex(DOCS, n_features=1000)
+    print(f"✅ {index.search('upii paymnt failled', k=2)}")
+
+
+def test_batch_matches_single():
+    """search_many scores several messages at once with the same results"""
+    index = NgramIndex(DOCS)
+    queries = ["upi fail", "", "train late", "kal exam"]
+    batched = index.search_detailed_many(queries, k=2)
+    assert batched == [index.search_detailed(query, k=2) for query in queries]
+    assert batched[1] == []
+    for query, ranked in zip(queries, batched):
+        for name, _, best in ranked:
+            assert all(DOCS[doc_id][0] == name for doc_id, _ in best)
+
+
+def test_library_ngram_engine(monkeypatch):
+    """RAG_ENGINE=ngram ranks the real library; examples come from the same pass"""
+    library = get_library()
+    index = library.ngram
+    assert index.doc_count == library.bm25.doc_count
+
+    monkeypatch.setenv("RAG_ENGINE", "ngram")
+    assert search_scenarios("git merge conflict again", k=1)[0][0] == "git conflict"
+    assert search_scenarios("upp payment fail hora", k=1)[0][0] == "upi fail"
+
+    matches = retrieve_scenarios("bhai train late ho gayi", k=2)
+    assert matches[0].name == "train late"
+    assert set(matches[0].examples) <= set(matches[0].record.texts)
+
+    queries = ["kal exam hai bahut tension"] * 32
+    start = time.perf_counter()
+    index.search_many(queries, k=3)
+    per_query_ms = (time.perf_counter() - start) / len(queries) * 1000
+    assert per_query_ms < 10  # Typically ~0.2 ms; loose bound for slow CI
+    print(f"✅ {index.nnz} weights, {per_query_ms:.3f} ms/query batched")
+
+
+if __name__ == "__main__":
+    test_normalize_words()
+    test_spelling_variants_match()
+    test_batch_matches_single()
@@ -0,0 +1,164 @@
+"""
+Test LRU cache and policy decision memoization
+
+Checks LRU/TTL behaviour and counters, and that repeated policy signal
+combinations skip the LLM call while fallbacks are never cached.
+"""
+
+import sys
+import asyncio
+sys.path.insert(0, '/home/voyager4/projects/claudBUD/src')
+
+from cache import LRUCache
+from llm import get_prompt_registry
+from policy_engine import BehaviorPolicy, get_policy_cache, policy_cache_key
+from policy_engine import decider
+
+
+POLICY = BehaviorPolicy(
+    mode="venting_listener", tone="casual_supportive", humor_level=1,
+    message_length="short", initiative="low",
+    give_action_steps=False, ask_followup_question=True
+)
+
+
+def _context(message="test", intensity=6, emotion="frustration"):
+    return {
+        "user_message": message,
+        "emotion": emotion,
+        "relationship": "friend",
+        "conflict_risk": "low",
+        "user_need": "vent",
+        "intensity": intensity,
+    }
+
+
+def test_lru_cache_eviction_and_ttl():
+    """Least recently used entry is evicted; expired entries miss"""
+    print("=" * 70)
+    print("Testing LRUCache")
+    print("=" * 70)
+
+    now = [0.0]
+    cache = LRUCache(maxsize=2, ttl=10, name="test", clock=lambda: now[0])
+
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1          # a is now most recent
+    cache.set("c", 3)                   # evicts b
+    assert "b" not in cache
+    assert cache.get("b") is None
+    print("✅ LRU eviction")
+
+    now[0] = 11.0
+    assert cache.get("a") is None
+    print("✅ TTL expiry")
+
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.evictions, stats.expirations) == (1, 2, 1, 1)
+    assert stats.as_dict()["hit_ratio"] == round(1 / 3, 4)
+    print(f"✅ Counters: {stats.as_dict()}")
+
+    # Counters are exported as Prometheus counters: clear() never rewinds them
+    cache.clear()
+    assert len(cache) == 0 and cache.stats().hits == 1
+    cache.reset_stats()
+    assert cache.stats().hits == 0
+
+    try:
+        cache.get_or_set("boom", lambda: 1 / 0)
+    except ZeroDivisionError:
+        pass
+    assert "boom" not in cache
+    print("✅ Failed computations are not cached")
+
+    disabled = LRUCache(maxsize=0)
+    disabled.set("a", 1)
+    assert disabled.get("a") is None
+    print("✅ maxsize=0 disables the cache")
+
+
+def test_policy_cache_key_normalizes_signals():
+    """Message text and intensity within a bucket do not change the key"""
+    print("=" * 70)
+    print("Testing policy cache key")
+    print("=" * 70)
+
+    assert policy_cache_key(_context("boss yelled", 7)) == policy_cache_key(_context("train late", 8))
+    assert policy_cache_key(_context(intensity=6)) != policy_cache_key(_context(intensity=7))
+    assert policy_cache_key(_context(intensity=4)) != policy_cache_key(_context(intensity=5))
+    assert policy_cache_key(_context(emotion="Anxiety")) == policy_cache_key(_context(emotion="anxiety"))
+    version = get_prompt_registry().version("behavior_policy")
+    assert policy_cache_key(_context())[-1] == version
+    print("✅ Key = signals + intensity bucket + prompt version")
+
+
+def test_intensity_buckets_match_rule_thresholds():
+    """Every intensity in a bucket gets the same rule decision"""
+    from itertools import product
+    from policy_engine.cache import intensity_bucket
+    from policy_engine.rules import decide_policy_by_rules
+
+    emotions = ("boredom", "frustration", "sadness", "anxiety", "happy", "confusion")
+    needs = ("vent", "decision_help", "advice", "distraction", "validation")
+    for emotion, need, risk in product(emotions, needs, ("low", "high")):
+        decisions = {}
+        for intensity in range(1, 11):
+            context = dict(_context(emotion=emotion, intensity=intensity), user_need=need, conflict_risk=risk)
+            policy = decide_policy_by_rules(context).policy
+            assert decisions.setdefault(intensity_bucket(intensity), policy) == policy, (emotion, need, intensity)
+    print("✅ Buckets split at every rule threshold")
+
+
+def test_generate_behavior_policy_uses_cache(monkeypatch):
+    """Second call with the same signals is served without a request"""
+    print("=" * 70)
+    print("Testing policy memoization")
+    print("=" * 70)
+
+    monkeypatch.setenv("OPENROUTER_API_KEY", "test-key")
+    get_policy_cache().clear()
+    get_policy_cache().reset_stats()
+    calls = []
+
+    def fake_request(client, context):
+        calls.append(context)
+        return POLICY
+
+    async def fake_arequest(client, context):
+        calls.append(context)
+        return POLICY
+
+    monkeypatch.setattr(decider, "_request_behavior_policy", fake_request)
+    monkeypatch.setattr(decider, "_arequest_behavior_policy", fake_arequest)
+
+    first = decider.generate_behavior_policy(_context("boss yelled", 7))
+    second = decider.generate_behavior_policy(_context("train late", 8))
+    third = asyncio.run(decider.agenerate_behavior_policy(_context("again", 8)))
+
+    assert len(calls) == 1
+    assert first == second == third == POLICY
+    assert second is not first  # callers get their own copy
+    stats = get_policy_cache().stats()
+    assert stats.hits == 2 and stats.misses == 1
+    print(f"✅ One request for three calls: {stats.as_dict()}")
+
+    def failing_request(client, context):
+        calls.append(context)
+        raise RuntimeError("upstream down")
+
+    monkeypatch.setattr(decider, "_request_behavior_policy", failing_request)
+    fallback = decider.generate_behavior_policy(_context(emotion="boredom"))
+    assert fallback.mode == "chill_companion"
+    decider.generate_behavior_policy(_context(emotion="boredom"))
+    assert len(calls) == 3
+    print("✅ Fallback policies are not cached")
+
+    get_policy_cache().clear()
+    get_policy_cache().reset_stats()
+
+
+if __name__ == "__main__":
+    test_lru_cache_eviction_and_ttl()
+    test_policy_cache_key_normalizes_signals()
+    print("\nRun with pytest for the memoization test (uses monkeypatch)")
@@ -0,0 +1,157 @@
+"""
+Test the rule-based policy engine and policy mode selection
+
+Checks the table-driven rules against the behavior policy prompt's
+guidance, the ambiguity flag, and that each POLICY_MODE only calls the
+LLM when it should.
+"""
+
+import sys
+import asyncio
+sys.path.insert(0, '/home/voyager4/projects/claudBUD/src')
+
+from policy_engine import (
+    BehaviorPolicy,
+    decide_policy_by_rules,
+    select_behavior_policy,
+    aselect_behavior_policy,
+    get_policy_mode,
+)
+from policy_engine import decider
+
+
+def _context(emotion="neutral", user_need="advice", relationship="friend",
+             conflict_risk="low", intensity=5):
+    return {
+        "user_message": "test",
+        "emotion": emotion,
+        "user_need": user_need,
+        "relationship": relationship,
+        "conflict_risk": conflict_risk,
+        "intensity": intensity,
+    }
+
+
+LLM_POLICY = BehaviorPolicy(
+    mode="practical_helper", tone="casual_supportive", humor_level=1,
+    message_length="medium", initiative="high",
+    give_action_steps=True, ask_followup_question=False
+)
+
+
+def test_rules_follow_prompt_guidance():
+    """Each prompt rule maps to the expected mode and tone"""
+    print("=" * 70)
+    print("Testing rule-based policy decisions")
+    print("=" * 70)
+
+    cases = [
+        (_context("frustration", "vent", intensity=6), "venting_listener", "casual_supportive"),
+        (_context("frustration", "advice", "authority", "high", 7), "diplomatic_advisor", "respectful_formal"),
+        (_context("boredom", "distraction", "stranger", intensity=3), "chill_companion", "light_humor"),
+        (_context("confusion", "decision_help", intensity=5), "practical_helper", "casual_supportive"),
+        (_context("sadness", "reassurance", intensity=5), "motivational_push", "casual_supportive"),
+        (_context("sadness", "validation", intensity=9), "silent_support", "serious_care"),
+        (_context("anxiety", "vent", intensity=7), "venting_listener", "calm_reassuring"),
+    ]
+
+    for context, mode, tone in cases:
+        decision = decide_policy_by_rules(context)
+        assert decision.policy.mode == mode, (context, decision)
+        assert decision.policy.tone == tone, (context, decision)
+        assert not decision.ambiguous
+        print(f"✅ {context['emotion']}/{context['user_need']} -> {mode}, {tone}")
+
+    overload = decide_policy_by_rules(_context("anxiety", "vent", intensity=10)).policy
+    assert overload.humor_level == 0
+    assert overload.message_length == "short"
+    print("✅ Emotional overload gets no humor and short replies")
+
+
+def test_rules_flag_ambiguity():
+    """No matching rule, or equal-priority rules disagreeing, is ambiguous"""
+    print("=" * 70)
+    print("Testing ambiguity detection")
+    print("=" * 70)
+
+    # happy + reassurance: no mode rule fires
+    unmatched = decide_policy_by_rules(_context("happy", "reassurance"))
+    assert unmatched.ambiguous
+    assert unmatched.matched_rules == ()
+    print("✅ No matching rule is ambiguous")
+
+    # boredom + decision_help: chill_companion vs practical_helper at equal priority
+    tied = decide_policy_by_rules(_context("boredom", "decision_help"))
+    assert tied.ambiguous
+    print(f"✅ Tied rules are ambiguous: {tied.matched_rules}")
+
+    # vent outranks advice-style rules, so this is decided
+    decided = decide_policy_by_rules(_context("confusion", "vent"))
+    assert not decided.ambiguous
+    assert decided.policy.mode == "venting_listener"
+    print("✅ Higher-priority rule settles the decision")
+
+    # Analysis-style keys and junk intensity are accepted
+    loose = decide_policy_by_rules({"primary_emotion": "boredom", "intensity": "n/a"})
+    assert loose.policy.mode == "chill_companion"
+    print("✅ Analysis keys and bad intensity handled")
+
+
+def test_policy_modes(monkeypatch):
+    """Only llm and ambiguous rules_then_llm decisions reach the LLM"""
+    print("=" * 70)
+    print("Testing POLICY_MODE selection")
+    print("=" * 70)
+
+    calls = []
+
+    def fake_generate(context):
+        calls.append(context)
+        return LLM_POLICY
+
+    async def fake_agenerate(context):
+        calls.append(context)
+        return LLM_POLICY
+
+    monkeypatch.setattr(decider, "generate_behavior_policy", fake_generate)
+    monkeypatch.setattr(decider, "agenerate_behavior_policy", fake_agenerate)
+
+    clear = _context("frustration", "vent")
+    ambiguous = _context("happy", "reassurance")
+
+    monkeypatch.delenv("POLICY_MODE", raising=False)
+    assert get_policy_mode() == "llm"
+    assert select_behavior_policy(clear) is LLM_POLICY
+    assert len(calls) == 1
+    print("✅ Default mode is llm")
+
+    monkeypatch.setenv("POLICY_MODE", "rules")
+    assert select_behavior_policy(ambiguous).mode == "chill_companion"
+    assert len(calls) == 1
+    print("✅ rules mode never calls the LLM")
+
+    monkeypatch.setenv("POLICY_MODE", "rules_then_llm_on_ambiguity")
+    assert select_behavior_policy(clear).mode == "venting_listener"
+    assert len(calls) == 1
+    assert select_behavior_policy(ambiguous) is LLM_POLICY
+    assert len(calls) == 2
+    assert asyncio.run(aselect_behavior_policy(clear)).mode == "venting_listener"
+    assert asyncio.run(aselect_behavior_policy(ambiguous)) is LLM_POLICY
+    assert len(calls) == 3
+    print("✅ rules_then_llm_on_ambiguity escalates only ambiguous decisions")
+
+    monkeypatch.setenv("POLICY_MODE", "bogus")
+    assert get_policy_mode() == "llm"
+    print("✅ Unknown POLICY_MODE falls back to llm")
+
+    try:
+        select_behavior_policy(clear, mode="bogus")
+        assert False, "expected ValueError"
+    except ValueError:
+        print("✅ Unknown explicit mode raises ValueError")
+
+
+if __name__ == "__main__":
+    test_rules_follow_prompt_guidance()
+    test_rules_flag_ambiguity()
+    print("\nRun with pytest for the POLICY_MODE tests (uses monkeypatch)")
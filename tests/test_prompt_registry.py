@@ -0,0 +1,60 @@
+"""
+Test prompt registry
+
+Prompts are read once, served from memory, versioned by content hash,
+and optionally hot-reloaded when their file changes.
+"""
+
+import os
+import sys
+sys.path.insert(0, '/home/voyager4/projects/claudBUD/src')
+
+from llm import PromptRegistry, get_prompt_registry
+
+
+def test_builtin_prompts_registered():
+    """Importing the pipeline registers all three system prompts"""
+
+    import orchestrator  # noqa: F401
+
+    versions = get_prompt_registry().versions()
+    for name in ("social_analysis", "behavior_policy", "response"):
+        assert name in versions
+        assert len(versions[name]) == 12
+
+    print(f"✅ Prompt versions: {versions}")
+
+
+def test_served_from_memory(tmp_path):
+    """Without hot reload, edits on disk are not picked up"""
+
+    path = tmp_path / "prompt.txt"
+    path.write_text("v1")
+
+    registry = PromptRegistry(hot_reload=False)
+    registry.register("demo", path)
+    version = registry.version("demo")
+
+    path.write_text("v2 changed")
+    assert registry.get("demo") == "v1"
+    assert registry.version("demo") == version
+
+
+def test_hot_reload_on_mtime_change(tmp_path):
+    """With hot reload, a new mtime reloads the text and changes the version"""
+
+    path = tmp_path / "prompt.txt"
+    path.write_text("v1")
+
+    registry = PromptRegistry(hot_reload=True)
+    registry.register("demo", path)
+    old_version = registry.version("demo")
+
+    path.write_text("v2 changed")
+    stat = path.stat()
+    os.utime(path, (stat.st_atime, stat.st_mtime + 5))
+
+    assert registry.get("demo") == "v2 changed"
+    assert registry.version("demo") != old_version
+
+    print("✅ Hot reload picked up the edited prompt")
@@ -7,7 +7,7 @@ Tests the behavior knowledge retrieval system.
 import sys
 sys.path.insert(0, '/home/voyager4/projects/claudBUD/src')
 
-from rag import retrieve_behavior_knowledge, get_all_scenarios, find_relevant_knowledge
+from rag import retrieve_behavior_knowledge, get_all_scenarios, find_relevant_knowledge, get_library
 
 
 def test_basic_retrieval():
@@ -136,12 +136,34 @@ def test_fallback():
     print()
 
 
+def test_library_index_preloaded():
+    """Test the library is parsed once and results are safe to mutate"""
+
+    print("=" * 70)
+    print("Test 6: Preloaded Library Index")
+    print("=" * 70)
+    print()
+
+    library = get_library()
+    assert get_library() is library
+    assert len(library) == len(get_all_scenarios())
+
+    first = retrieve_behavior_knowledge("exam stress anxiety")
+    first['do'].append("mutated by caller")
+    second = retrieve_behavior_knowledge("exam stress anxiety")
+    assert "mutated by caller" not in second['do']
+
+    print(f"✅ {len(library)} scenarios / {library.entry_count} entries indexed once")
+    print()
+
+
 if __name__ == "__main__":
     test_basic_retrieval()
     test_exam_stress()
     test_list_scenarios()
     test_with_social_analysis()
     test_fallback()
+    test_library_index_preloaded()
 
     print("=" * 70)
     print("✅ All RAG tests complete!")
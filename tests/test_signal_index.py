@@ -0,0 +1,75 @@
+"""
+Test the structured signal index
+
+Checks that SocialAnalysis labels map onto the library's emotion words,
+that valence pre-filters and relationship/need boosts are applied
+before text scoring, and that they fix rankings the text alone gets
+wrong.
+"""
+
+import sys
+sys.path.insert(0, '/home/voyager4/projects/claudBUD/src')
+
+from rag import find_relevant_knowledge, get_library, retrieve_scenarios
+from rag.signals import NO_SIGNALS, SignalIndex
+
+
+SCENARIOS = [
+    ("exam stress", "exam_stress", ("stressed", "anxious", "worried")),
+    ("birthday", "birthday", ("happy", "excited", "joyful")),
+    ("breakup", "breakup", ("heartbroken", "sad", "angry")),
+    ("office stress", "office_stress", ("frustrated", "exhausted", "angry")),
+    ("upi fail", "upi_fail", ()),
+]
+
+
+def test_signal_lookups():
+    """anxiety -> anxious scenarios; sad messages skip all-positive scenarios"""
+    print("=" * 70)
+    print("Testing signal index")
+    print("=" * 70)
+
+    index = SignalIndex(SCENARIOS)
+    assert index.by_emotion["anxiety"] == {"exam stress"}
+    assert index.by_emotion["anger"] == {"breakup", "office stress"}
+    assert index.by_relationship["authority"] == {"exam stress", "office stress"}
+    assert index.by_need["vent"] == {"office stress"}
+
+    plan = index.plan({"primary_emotion": "sadness", "relationship": "romantic", "user_need": "validation"})
+    assert "birthday" not in plan.allowed
+    assert "upi fail" in plan.allowed  # No typical emotions: never filtered
+    assert plan.boosts["breakup"] > 1.2  # Emotion + relationship + need
+
+    happy = index.plan({"primary_emotion": "happy"})
+    assert happy.allowed == {"birthday", "upi fail"}  # All-negative scenarios dropped
+    assert index.plan({"primary_emotion": "neutral"}).allowed is None
+    assert index.plan(None) is NO_SIGNALS and index.plan({}) is NO_SIGNALS
+    assert index.plan({"primary_emotion": "sadness"}) is index.plan({"primary_emotion": "sadness"})
+
+    ranked = plan.apply([("upi fail", 10.0, "x"), ("breakup", 9.0, "y")])
+    assert ranked[0][0] == "breakup" and ranked[0][2] == "y"
+    print(f"✅ {dict(plan.boosts)}")
+
+
+def test_library_signals_rerank():
+    """Signals move the right scenario up and never surface filtered ones"""
+    library = get_library()
+    assert library.signals.by_emotion["anxiety"] >= {"exam stress", "deadline panic"}
+
+    message = "usne mujhe chhod diya"
+    analysis = {"primary_emotion": "sadness", "relationship": "romantic", "user_need": "reassurance"}
+    assert retrieve_scenarios(message, k=1)[0].name != "breakup"
+    assert retrieve_scenarios(message, k=1, analysis=analysis)[0].name == "breakup"
+    assert find_relevant_knowledge(message, analysis)["scenario"] == "breakup"
+
+    allowed = library.signals.plan(analysis).allowed
+    for engine in ("bm25", "keyword"):
+        matches = retrieve_scenarios("birthday party festival maza", k=5, engine=engine, analysis=analysis)
+        assert all(m.name in allowed for m in matches)
+        assert [m.score for m in matches] == sorted((m.score for m in matches), reverse=True)
+    print("✅ Signals applied")
+
+
+if __name__ == "__main__":
+    test_signal_lookups()
+    test_library_signals_rerank()
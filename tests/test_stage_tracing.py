@@ -0,0 +1,117 @@
+"""
+Test per-stage latency tracing
+
+Checks the rolling stage histograms, that StageTimer feeds them, and
+that POST /chat returns stage timings in the body and as a Server-Timing
+header.
+"""
+
+import sys
+sys.path.insert(0, '/home/voyager4/projects/claudBUD/src')
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from extractors import SocialAnalysis
+from policy_engine import BehaviorPolicy
+from orchestrator import buddy_agent
+from api.chat_router import router
+from telemetry import (
+    StageTimer,
+    LatencyHistogram,
+    HistogramRegistry,
+    get_stage_histograms,
+    format_server_timing,
+)
+
+
+def test_latency_histogram():
+    """Cumulative buckets since start, percentiles over the rolling window"""
+    print("=" * 70)
+    print("Testing LatencyHistogram")
+    print("=" * 70)
+
+    histogram = LatencyHistogram(buckets=(10, 100, 1000), window=100)
+    for ms in range(1, 201):          # 1..200 ms
+        histogram.observe(float(ms))
+
+    assert histogram.count == 200
+    assert histogram.cumulative_buckets() == [(10, 10), (100, 100), (1000, 200)]
+    print("✅ Cumulative bucket counts")
+
+    # Window holds the last 100 samples: 101..200
+    snapshot = histogram.snapshot()
+    assert snapshot["p50_ms"] == 150.0
+    assert snapshot["p99_ms"] == 199.0
+    assert snapshot["max_ms"] == 200.0
+    assert snapshot["mean_ms"] == 100.5
+    print(f"✅ Rolling percentiles: {snapshot}")
+
+
+def test_stage_timer_feeds_histograms():
+    """Each stage and the total land in the registry"""
+    registry = HistogramRegistry()
+    timer = StageTimer(histograms=registry)
+    with timer.stage("analysis"):
+        pass
+    timer.timed("policy", lambda: None)()
+    timings = timer.finish()
+
+    assert set(timings) == {"analysis", "policy", "total"}
+    assert set(registry.snapshot()) == {"analysis", "policy", "total"}
+    assert format_server_timing({"analysis": 1.5, "total": 2.0}) == "analysis;dur=1.5, total;dur=2.0"
+    print("✅ StageTimer records into histograms")
+
+
+async def fake_analyze(text):
+    return SocialAnalysis(
+        primary_emotion="frustration", intensity=7, user_need="vent",
+        relationship="friend", conflict_risk="low"
+    )
+
+
+async def fake_policy(context):
+    return BehaviorPolicy(
+        mode="venting_listener", tone="casual_supportive", humor_level=1,
+        message_length="short", initiative="low",
+        give_action_steps=False, ask_followup_question=True
+    )
+
+
+async def fake_reply(**kwargs):
+    return "Arre bhai, phir se late?"
+
+
+def test_chat_returns_server_timing(monkeypatch):
+    """POST /chat sends timings in the body and the Server-Timing header"""
+    print("=" * 70)
+    print("Testing Server-Timing on POST /chat")
+    print("=" * 70)
+
+    monkeypatch.delenv("DATABASE_URL", raising=False)
+    monkeypatch.setattr(buddy_agent, "aselect_social_analysis", fake_analyze)
+    monkeypatch.setattr(buddy_agent, "aselect_behavior_policy", fake_policy)
+    monkeypatch.setattr(buddy_agent, "agenerate_reply", fake_reply)
+
+    app = FastAPI()
+    app.include_router(router)
+    client = TestClient(app)
+
+    before = get_stage_histograms().get("compose").count
+    response = client.post("/chat", json={"user_id": "u1", "message": "bhai train late ho gayi"})
+    assert response.status_code == 200
+
+    timings = response.json()["timings"]
+    for stage in ("context_inference", "persona_load", "analysis", "policy", "rag", "compose", "total"):
+        assert stage in timings
+
+    header = response.headers["server-timing"]
+    assert "analysis;dur=" in header and "total;dur=" in header
+    assert get_stage_histograms().get("compose").count == before + 1
+    print(f"✅ Server-Timing: {header}")
+
+
+if __name__ == "__main__":
+    test_latency_histogram()
+    test_stage_timer_feeds_histograms()
+    print("\nRun with pytest for the endpoint test (uses monkeypatch)")
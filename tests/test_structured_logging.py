@@ -0,0 +1,185 @@
+"""
+Test structured logging
+
+Checks the JSON-lines output (request id, hashed user id, stage and
+traceback fields), per-level sampling, the hot-path switch, request id
+propagation into stage worker threads, and the X-Request-ID middleware.
+"""
+
+import io
+import sys
+import json
+sys.path.insert(0, '/home/voyager4/projects/claudBUD/src')
+
+from fastapi.testclient import TestClient
+
+import main
+from extractors import SocialAnalysis
+from policy_engine import BehaviorPolicy
+from orchestrator import buddy_agent
+from telemetry.logging import (
+    configure_logging,
+    get_logger,
+    get_request_id,
+    hash_user_id,
+    log_context,
+    set_hot_path_logging,
+    shutdown_logging,
+    warn_once,
+)
+
+
+def _capture():
+    stream = io.StringIO()
+    configure_logging(stream=stream, force=True)
+    return stream
+
+
+def _records(stream):
+    # Stopping the listener flushes everything still queued
+    shutdown_logging()
+    configure_logging(force=True)
+    return [json.loads(line) for line in stream.getvalue().splitlines()]
+
+
+def test_json_lines_carry_context():
+    """Each line is JSON with request id, user hash (not the raw id) and extras"""
+    print("=" * 70)
+    print("Testing JSON log lines")
+    print("=" * 70)
+
+    stream = _capture()
+    logger = get_logger("test.json")
+
+    with log_context(request_id="req-1", user_id="user_secret_42"):
+        logger.warning("database unavailable", extra={"stage": "persona_load"})
+    logger.warning("outside any request")
+
+    first, second = _records(stream)
+    assert first["level"] == "WARNING"
+    assert first["logger"] == "buddy.test.json"
+    assert first["msg"] == "database unavailable"
+    assert first["request_id"] == "req-1"
+    assert first["user"] == hash_user_id("user_secret_42")
+    assert first["stage"] == "persona_load"
+    assert "user_secret_42" not in json.dumps(first)
+    assert "request_id" not in second and "user" not in second
+    print(f"✅ {first}")
+
+
+def test_exception_traceback_is_a_field():
+    """logger.exception puts the traceback in "exc", still one line per record"""
+    stream = _capture()
+    logger = get_logger("test.exc")
+
+    try:
+        raise RuntimeError("boom")
+    except RuntimeError:
+        logger.exception("learning/logging failed")
+
+    (record,) = _records(stream)
+    assert record["level"] == "ERROR"
+    assert "RuntimeError: boom" in record["exc"]
+    print("✅ Traceback captured")
+
+
+def test_debug_sampling(monkeypatch):
+    """LOG_SAMPLE_DEBUG=0 drops debug lines but keeps warnings"""
+    monkeypatch.setenv("LOG_LEVEL", "DEBUG")
+    monkeypatch.setenv("LOG_SAMPLE_DEBUG", "0")
+    stream = _capture()
+    logger = get_logger("test.sampling")
+
+    for _ in range(20):
+        logger.debug("chatty")
+    logger.warning("important")
+
+    monkeypatch.delenv("LOG_LEVEL")
+    monkeypatch.delenv("LOG_SAMPLE_DEBUG")
+    assert [r["msg"] for r in _records(stream)] == ["important"]
+    print("✅ Debug sampled out")
+
+
+def test_hot_path_switch():
+    """set_hot_path_logging(False) silences buddy.hot.* only"""
+    stream = _capture()
+    hot = get_logger("test.hot", hot_path=True)
+    regular = get_logger("test.regular")
+
+    set_hot_path_logging(False)
+    hot.warning("per-request chatter")
+    regular.warning("kept")
+    set_hot_path_logging(True)
+    hot.warning("back on")
+
+    assert [r["msg"] for r in _records(stream)] == ["kept", "back on"]
+    print("✅ Hot path toggled")
+
+
+def test_bad_env_value_warns_once(monkeypatch):
+    """Per-request env settings log an invalid value once, not per message"""
+    from rag import get_rag_engine
+    from policy_engine import get_policy_mode
+
+    stream = _capture()
+    monkeypatch.setenv("RAG_ENGINE", "nonsense-engine")
+    monkeypatch.setenv("POLICY_MODE", "nonsense-mode")
+    for _ in range(5):
+        assert get_rag_engine() == "bm25"
+        assert get_policy_mode() == "llm"
+    warn_once(get_logger("test.once"), "key", "first")
+    warn_once(get_logger("test.once"), "key", "second")
+
+    records = _records(stream)
+    assert [r["stage"] for r in records if "RAG_ENGINE" in r["msg"]] == ["rag"]
+    assert len([r for r in records if "POLICY_MODE" in r["msg"]]) == 1
+    assert [r["msg"] for r in records if r["logger"] == "buddy.test.once"] == ["first"]
+    print("✅ Invalid env values warned once")
+
+
+def test_request_id_reaches_stage_threads(monkeypatch):
+    """Logs from the persona-load worker thread keep the request's context"""
+    monkeypatch.delenv("DATABASE_URL", raising=False)
+    monkeypatch.setattr(buddy_agent, "select_social_analysis", lambda text: SocialAnalysis(
+        primary_emotion="frustration", intensity=6, user_need="vent",
+        relationship="friend", conflict_risk="low"
+    ))
+    monkeypatch.setattr(buddy_agent, "select_behavior_policy", lambda context: BehaviorPolicy(
+        mode="venting_listener", tone="casual_supportive", humor_level=1,
+        message_length="short", initiative="low",
+        give_action_steps=False, ask_followup_question=True
+    ))
+    monkeypatch.setattr(buddy_agent, "generate_reply", lambda **kwargs: "Arre yaar")
+    monkeypatch.setattr(buddy_agent, "_load_memory", lambda user_id: (
+        get_logger("test.worker").warning("loading"), (None, False)
+    )[1])
+
+    stream = _capture()
+    with log_context(request_id="req-thread"):
+        result = buddy_agent.buddy_chat("user_7", "bhai train late")
+    assert result["error"] is None
+
+    (record,) = [r for r in _records(stream) if r["msg"] == "loading"]
+    assert record["request_id"] == "req-thread"
+    assert record["user"] == hash_user_id("user_7")
+    print("✅ Context propagated to worker thread")
+
+
+def test_request_id_header():
+    """The middleware echoes X-Request-ID, generating one when absent"""
+    client = TestClient(main.app)
+
+    response = client.get("/", headers={"X-Request-ID": "abc123"})
+    assert response.headers["X-Request-ID"] == "abc123"
+
+    generated = client.get("/").headers["X-Request-ID"]
+    assert generated and generated != "abc123"
+    assert get_request_id() is None
+    print("✅ X-Request-ID echoed")
+
+
+if __name__ == "__main__":
+    test_json_lines_carry_context()
+    test_exception_traceback_is_a_field()
+    test_hot_path_switch()
+    test_request_id_header()
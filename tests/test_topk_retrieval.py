@@ -0,0 +1,116 @@
+"""
+Test top-k scenario retrieval
+
+Checks that search_detailed() agrees with search(), that matched example
+entries really belong to their scenario (also after loading the compiled
+artifact), and that the blended do/dont/action block reaches the composer
+prompt.
+"""
+
+import sys
+import time
+sys.path.insert(0, '/home/voyager4/projects/claudBUD/src')
+
+from rag import BM25Index, blend_knowledge, find_relevant_knowledge, get_library, retrieve_scenarios
+from rag.library import BehaviorLibrary
+from composer.generator import _build_messages
+
+
+MULTI_INTENT = "office me boss ne daant diya aur upi bhi fail ho gaya"
+
+
+def test_search_detailed_matches_search():
+    """Same ranking as search(); best docs belong to their scenario"""
+    print("=" * 70)
+    print("Testing BM25 search_detailed")
+    print("=" * 70)
+
+    docs = [
+        ("exam stress", "kal exam hai bahut tension"),
+        ("exam stress", "!!!"),  # No tokens: keeps its doc id, no postings
+        ("exam stress", "exam ki tayyari nahi hui"),
+        ("train late", "train phir late ho gayi bhai"),
+    ]
+    index = BM25Index(docs)
+    assert index.doc_count == 4
+
+    detailed = index.search_detailed("exam tension bhai", k=2)
+    assert [(name, score) for name, score, _ in detailed] == index.search("exam tension bhai", k=2)
+    for name, _, best in detailed:
+        assert best and all(docs[doc_id][0] == name for doc_id, _ in best)
+        assert [s for _, s in best] == sorted((s for _, s in best), reverse=True)
+    assert detailed[0][2][0][0] == 0  # "kal exam hai bahut tension"
+    print(f"✅ {detailed}")
+
+
+def test_retrieve_scenarios_multi_intent():
+    """Several scenarios per message, each with examples from its own file, fast"""
+    library = get_library()
+    matches = retrieve_scenarios(MULTI_INTENT, k=3)
+    assert len(matches) == 3
+    assert [m.score for m in matches] == sorted((m.score for m in matches), reverse=True)
+    assert {"upi fail", "office politics"} <= {m.name for m in matches}
+    for match in matches:
+        assert match.record is library.get(match.name)
+        assert match.examples and set(match.examples) <= set(match.record.texts)
+        assert len(set(match.examples)) == len(match.examples)
+
+    keyword = retrieve_scenarios("office stress work", k=2, engine="keyword")
+    assert keyword[0].name == "office stress" and keyword[0].score == 4.0
+
+    start = time.perf_counter()
+    for _ in range(200):
+        retrieve_scenarios(MULTI_INTENT, k=5)
+    per_query_ms = (time.perf_counter() - start) / 200 * 1000
+    assert per_query_ms < 5  # Typically ~0.1 ms; loose bound for slow CI
+    print(f"✅ {[(m.name, round(m.score, 2)) for m in matches]} in {per_query_ms:.3f} ms")
+
+
+def test_blend_knowledge():
+    """Top match leads; lists interleaved and deduped; humor only if all allow it"""
+    matches = retrieve_scenarios(MULTI_INTENT, k=3)
+    knowledge = blend_knowledge(matches)
+    top = matches[0].record.metadata
+
+    assert knowledge["scenario"] == top["scenario"]
+    assert knowledge["tone"] == top["tone"]
+    assert knowledge["related_scenarios"]
+    assert knowledge["text"] == matches[0].examples[0]
+    for key in ("do", "dont", "action_suggestions"):
+        items = knowledge[key]
+        if top[key]:
+            assert items[0] == top[key][0]
+        assert len(items) <= 5
+        assert len({item.lower() for item in items}) == len(items)
+    blended = [m for m in matches if m.score >= matches[0].score * 0.5]
+    assert knowledge["humor_allowed"] == all(m.record.metadata["humor_allowed"] for m in blended)
+
+    assert blend_knowledge([]) == {}
+    assert find_relevant_knowledge(MULTI_INTENT)["scenario"] == knowledge["scenario"]
+    print(f"✅ {knowledge['scenario']} + {knowledge['related_scenarios']}")
+
+
+def test_composer_renders_blend():
+    """Related scenarios and action ideas reach the composer prompt"""
+    knowledge = find_relevant_knowledge(MULTI_INTENT)
+    context = _build_messages(MULTI_INTENT, None, None, knowledge, None, None, None)[1]["content"]
+    assert "Also Relevant:" in context
+    assert "ACTION IDEAS:" in context
+    assert knowledge["action_suggestions"][0] in context
+    print("✅ Blend rendered")
+
+
+def test_compiled_library_examples():
+    """doc_examples lines up with the BM25 doc ids after an artifact round trip"""
+    library = get_library()
+    restored = BehaviorLibrary.from_artifact(None, library.to_artifact([]))
+    assert restored.doc_examples == library.doc_examples
+    assert restored.bm25.search_detailed(MULTI_INTENT) == library.bm25.search_detailed(MULTI_INTENT)
+    print("✅ Artifact round trip")
+
+
+if __name__ == "__main__":
+    test_search_detailed_matches_search()
+    test_retrieve_scenarios_multi_intent()
+    test_blend_knowledge()
+    test_composer_renders_blend()